@@ -5,11 +5,78 @@ load_dotenv()
 
 API_KEY = os.getenv("JDY_API_KEY")
 APP_ID = os.getenv("JDY_APP_ID")
+# 接口地址，本地测试时可指向 scripts/mock_server.py 启动的模拟服务
+BASE_URL = os.getenv("JDY_BASE_URL", "https://api.jiandaoyun.com/api/v5")
 
 VOLUNTEER_ENTRY_ID = os.getenv("JDY_VOLUNTEER_ENTRY_ID")
 EVENT_ENTRY_ID = os.getenv("JDY_EVENT_ENTRY_ID")
 SCHEDULE_ENTRY_ID = os.getenv("JDY_SCHEDULE_ENTRY_ID")
 
-assert API_KEY and APP_ID, "请先配置 .env 文件中的 JDY_API_KEY 和 JDY_APP_ID"
-assert all([VOLUNTEER_ENTRY_ID, EVENT_ENTRY_ID, SCHEDULE_ENTRY_ID]), \
-    "请先配置 .env 文件中的三个表单 ENTRY_ID"
\ No newline at end of file
+# 连接池配置
+POOL_CONNECTIONS = int(os.getenv("JDY_POOL_CONNECTIONS", "10"))    # 缓存的主机连接池数量
+POOL_MAXSIZE = int(os.getenv("JDY_POOL_MAXSIZE", "20"))            # 每个主机的最大连接数
+POOL_BLOCK = os.getenv("JDY_POOL_BLOCK", "false").lower() == "true"  # 连接耗尽时是否等待
+KEEP_ALIVE = os.getenv("JDY_KEEP_ALIVE", "true").lower() == "true"
+REQUEST_TIMEOUT = float(os.getenv("JDY_REQUEST_TIMEOUT", "30"))
+
+# 异步客户端最大并发请求数
+ASYNC_CONCURRENCY = int(os.getenv("JDY_ASYNC_CONCURRENCY", "20"))
+
+# 客户端限流配置
+RATE_LIMIT_ENABLED = os.getenv("JDY_RATE_LIMIT_ENABLED", "true").lower() == "true"
+RATE_LIMIT_QPS = float(os.getenv("JDY_RATE_LIMIT_QPS", "50"))                # 应用级每秒请求上限
+RATE_LIMIT_MAX_RETRIES = int(os.getenv("JDY_RATE_LIMIT_MAX_RETRIES", "5"))   # 被限流后的最大重试次数
+
+# 失败重试配置（超时、连接错误、5xx）
+RETRY_MAX_ATTEMPTS = int(os.getenv("JDY_RETRY_MAX_ATTEMPTS", "4"))          # 含首次请求在内的最大尝试次数
+RETRY_BACKOFF_BASE = float(os.getenv("JDY_RETRY_BACKOFF_BASE", "0.5"))      # 指数退避基数（秒）
+RETRY_BACKOFF_MAX = float(os.getenv("JDY_RETRY_BACKOFF_MAX", "10"))         # 单次退避上限（秒）
+RETRY_DEADLINE = float(os.getenv("JDY_RETRY_DEADLINE", "120"))              # 单个请求含重试的总耗时预算（秒）
+
+# 批量接口配置
+BATCH_SIZE = int(os.getenv("JDY_BATCH_SIZE", "100"))                 # 每个批量请求的行数（接口上限 100）
+BATCH_CONCURRENCY = int(os.getenv("JDY_BATCH_CONCURRENCY", "4"))     # 同时提交的批量请求数
+
+# 本地 SQLite 镜像配置
+MIRROR_ENABLED = os.getenv("JDY_MIRROR_ENABLED", "false").lower() == "true"  # 模型查询是否优先读镜像
+MIRROR_DB_PATH = os.getenv("JDY_MIRROR_DB_PATH", "data/mirror.sqlite3")
+MIRROR_MAX_AGE = float(os.getenv("JDY_MIRROR_MAX_AGE", "60"))                # 超过该秒数未同步则先增量同步
+
+# 单条数据读缓存配置（get_data）
+CACHE_ENABLED = os.getenv("JDY_CACHE_ENABLED", "true").lower() == "true"
+CACHE_MAX_ENTRIES = int(os.getenv("JDY_CACHE_MAX_ENTRIES", "2048"))
+CACHE_TTL = float(os.getenv("JDY_CACHE_TTL", "300"))                         # 缓存有效期（秒）
+CACHE_MAX_BYTES = int(os.getenv("JDY_CACHE_MAX_BYTES", str(64 * 1024 * 1024)))  # 估算内存上限
+
+# 请求指标（按接口和 entry_id 统计，可导出为 Prometheus 文本格式）
+METRICS_ENABLED = os.getenv("JDY_METRICS_ENABLED", "true").lower() == "true"
+
+# 表单字段缓存（字段列表与版本哈希，供字段校验复用）
+SCHEMA_CACHE_PATH = os.getenv("JDY_SCHEMA_CACHE_PATH", "data/schema_cache.json")
+SCHEMA_CACHE_TTL = float(os.getenv("JDY_SCHEMA_CACHE_TTL", "86400"))        # 超过该秒数重新获取
+
+# 签到/签退写入队列（先写本地队列立即返回，由后台线程批量提交）
+WRITE_BEHIND_ENABLED = os.getenv("JDY_WRITE_BEHIND_ENABLED", "false").lower() == "true"
+WRITE_BEHIND_SPOOL_PATH = os.getenv("JDY_WRITE_BEHIND_SPOOL_PATH", "data/write_behind.sqlite3")
+WRITE_BEHIND_BATCH_SIZE = int(os.getenv("JDY_WRITE_BEHIND_BATCH_SIZE", "100"))          # 积累到该条数立即提交
+WRITE_BEHIND_FLUSH_INTERVAL = float(os.getenv("JDY_WRITE_BEHIND_FLUSH_INTERVAL", "2"))  # 最长等待秒数
+WRITE_BEHIND_MAX_ATTEMPTS = int(os.getenv("JDY_WRITE_BEHIND_MAX_ATTEMPTS", "5"))        # 失败该次数后移入失败表
+
+# 数据推送回调接收服务（简道云「数据推送」）
+WEBHOOK_SECRET = os.getenv("JDY_WEBHOOK_SECRET", "")                         # 推送设置中的签名密钥，为空时不校验签名
+WEBHOOK_HOST = os.getenv("JDY_WEBHOOK_HOST", "0.0.0.0")
+WEBHOOK_PORT = int(os.getenv("JDY_WEBHOOK_PORT", "8901"))
+WEBHOOK_DEDUP_TTL = float(os.getenv("JDY_WEBHOOK_DEDUP_TTL", "86400"))      # 重复推送的识别时长（秒）
+
+class SettingsError(RuntimeError):
+    """必需的配置项缺失"""
+
+def require(name: str) -> str:
+    """读取必需的配置项，缺失时报错
+    
+    导入本模块时不做检查：只用到义工表的脚本不会因为其他表单未配置而无法启动。
+    """
+    value = globals().get(name)
+    if not value:
+        raise SettingsError(f"请先配置 .env 文件中的 JDY_{name}")
+    return value
\ No newline at end of file
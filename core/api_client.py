@@ -1,18 +1,92 @@
-import requests
+from __future__ import annotations
+
+import copy
+import json
 import logging
+import threading
 import time
 import uuid
-from typing import Dict, Any, Optional, List
-from config.settings import API_KEY, APP_ID
+import weakref
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Dict, Any, Optional, List, Tuple, Iterator, Callable, Sequence
+from config.settings import (
+    API_KEY, APP_ID, BASE_URL,
+    POOL_CONNECTIONS, POOL_MAXSIZE, POOL_BLOCK, KEEP_ALIVE, REQUEST_TIMEOUT,
+    RATE_LIMIT_ENABLED, RATE_LIMIT_MAX_RETRIES, BATCH_SIZE, BATCH_CONCURRENCY,
+    CACHE_ENABLED, CACHE_MAX_ENTRIES, CACHE_TTL, CACHE_MAX_BYTES, METRICS_ENABLED,
+    SettingsError
+)
+from core.batch import BatchResult, chunked
+from core.cache import TTLCache
+from core.encoding import dumps, loads, get_encoder
+from core.exceptions import JDYAPIError, JDYRateLimitError
+from core.lazy import lazy_import
+from core.metrics import ClientMetrics, MetricsRegistry, REGISTRY
+from core.rate_limiter import RateLimiter, RATE_LIMIT_CODES, get_rate_limiter
+from core.retry import RetryPolicy
+
+# requests 的导入耗时约 0.1s，首次发请求时才加载
+requests = lazy_import("requests")
+
+# 数据查询接口单页最多返回 100 条
+MAX_PAGE_SIZE = 100
 
 class JDYClient:
-    """简道云API客户端 - v5版本"""
+    """简道云API客户端 - v5版本
     
-    def __init__(self):
-        self.base_url = "https://api.jiandaoyun.com/api/v5"
-        self.app_id = APP_ID
-        self.api_key = API_KEY
+    客户端持有一个线程安全的连接池：所有线程共享同一个 HTTPAdapter
+    （urllib3 连接池本身是线程安全的），每个线程使用各自的 Session，
+    从而复用 TCP/TLS 连接，避免每次请求重新握手。
+    """
+    
+    def __init__(self, app_id: Optional[str] = None, api_key: Optional[str] = None,
+                 base_url: Optional[str] = None, pool_connections: int = POOL_CONNECTIONS, pool_maxsize: int = POOL_MAXSIZE,
+                 pool_block: bool = POOL_BLOCK, keep_alive: bool = KEEP_ALIVE,
+                 timeout: float = REQUEST_TIMEOUT, rate_limiter: Optional[RateLimiter] = None,
+                 retry_policy: Optional[RetryPolicy] = None, cache: Optional[TTLCache] = None,
+                 metrics: Optional[MetricsRegistry] = None):
+        self.base_url = (base_url or BASE_URL).rstrip('/')
+        self.app_id = app_id or APP_ID
+        self.api_key = api_key or API_KEY
+        if not (self.app_id and self.api_key):
+            raise SettingsError("请先配置 .env 文件中的 JDY_API_KEY 和 JDY_APP_ID")
+        self.keep_alive = keep_alive
+        self.timeout = timeout
         self.logger = logging.getLogger("JDYClient")
+        
+        # 同一应用的客户端默认共享一个限流器，多线程下共用同一份QPS预算
+        if rate_limiter is None and RATE_LIMIT_ENABLED:
+            rate_limiter = get_rate_limiter(self.app_id)
+        self.rate_limiter = rate_limiter
+        self.retry_policy = retry_policy or RetryPolicy()
+        
+        # get_data 的读穿缓存，写接口按 (entry_id, data_id) 失效
+        if cache is None and CACHE_ENABLED:
+            cache = TTLCache(CACHE_MAX_ENTRIES, CACHE_TTL, CACHE_MAX_BYTES)
+        self.cache = cache
+        
+        # 按接口和 entry_id 记录请求数、延迟、报文大小、重试和限流次数
+        if metrics is None and METRICS_ENABLED:
+            metrics = REGISTRY
+        self.metrics = ClientMetrics(metrics) if metrics is not None else None
+        
+        # pool_connections: 缓存的主机连接池数量；pool_maxsize: 每个主机的最大连接数
+        # pool_block=True 时连接耗尽会等待空闲连接，而不是临时新建连接
+        self._adapter = requests.adapters.HTTPAdapter(
+            pool_connections=pool_connections,
+            pool_maxsize=pool_maxsize,
+            pool_block=pool_block
+        )
+        self._local = threading.local()
+        # 线程结束后其 Session 只剩这里的弱引用，随之回收（连接在共享的 adapter 中，不受影响）
+        self._sessions: "weakref.WeakSet[requests.Session]" = weakref.WeakSet()
+        self._sessions_lock = threading.Lock()
+    
+    def __enter__(self) -> "JDYClient":
+        return self
+    
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
     
     def _make_auth_headers(self) -> Dict[str, str]:
         """生成认证头部"""
@@ -21,38 +95,190 @@ class JDYClient:
             'Authorization': f'Bearer {self.api_key}'
         }
     
+    @property
+    def session(self) -> requests.Session:
+        """当前线程的 Session（共享同一个连接池）"""
+        session = getattr(self._local, 'session', None)
+        if session is None:
+            session = requests.Session()
+            session.mount('https://', self._adapter)
+            session.mount('http://', self._adapter)
+            session.headers.update(self._make_auth_headers())
+            session.headers['Connection'] = 'keep-alive' if self.keep_alive else 'close'
+            self._local.session = session
+            with self._sessions_lock:
+                self._sessions.add(session)
+        return session
+    
+    def _invalidate(self, entry_id: str, data_ids: Sequence[str]) -> None:
+        """使指定记录的缓存失效"""
+        if self.cache is not None:
+            for data_id in data_ids:
+                self.cache.invalidate((entry_id, data_id))
+    
+    def cache_stats(self) -> Dict[str, Any]:
+        """get_data 缓存的命中统计"""
+        return self.cache.stats() if self.cache is not None else {}
+    
+    def metrics_summary(self) -> List[Dict[str, Any]]:
+        """按 (接口, entry_id) 汇总的请求指标，按总耗时降序"""
+        return self.metrics.summary() if self.metrics is not None else []
+    
+    def close(self) -> None:
+        """关闭所有 Session 并释放连接池"""
+        with self._sessions_lock:
+            sessions, self._sessions = list(self._sessions), weakref.WeakSet()
+        for session in sessions:
+            session.close()
+        self._adapter.close()
+        self._local = threading.local()
+    
     @staticmethod
     def _generate_transaction_id() -> str:
         """生成事务ID"""
         return str(uuid.uuid4())
 
-    def request(self, method: str, endpoint: str, json_data: Optional[Dict] = None) -> Dict[str, Any]:
-        """发送HTTP请求"""
-        url = f"{self.base_url}{endpoint}"
-        headers = self._make_auth_headers()
+    @staticmethod
+    def _chunk_transaction_id(transaction_id: Optional[str], index: int) -> str:
+        """分块事务ID：指定了 transaction_id 时按分块序号确定性派生，重跑时与上次一致"""
+        if not transaction_id:
+            return JDYClient._generate_transaction_id()
+        return str(uuid.uuid5(uuid.NAMESPACE_OID, f"{transaction_id}:{index}"))
+
+    def _run_chunks(self, items: Sequence, chunk_size: int, concurrency: int,
+                    send: Callable[[int, Sequence], List[str]],
+                    chunks: Optional[List[Tuple[int, Sequence]]] = None) -> BatchResult:
+        """分块并发执行批量请求
+        
+        send(分块序号, 分块) 返回该分块各行的 _id；单个分块失败只记录到对应行，不影响其他分块。
+        chunks 为预先切好的 (起始下标, 分块) 列表，不传时按 chunk_size 等分 items。
+        """
+        result = BatchResult(len(items))
+        if chunks is None:
+            chunks = list(chunked(items, chunk_size))
+        
+        if len(chunks) <= 1 or concurrency <= 1:
+            for index, (start, chunk) in enumerate(chunks):
+                try:
+                    result.record(start, len(chunk), send(index, chunk))
+                except Exception as e:
+                    result.fail(start, len(chunk), e)
+            return result
+        
+        with ThreadPoolExecutor(max_workers=min(concurrency, len(chunks))) as executor:
+            futures = {
+                executor.submit(send, index, chunk): (start, len(chunk))
+                for index, (start, chunk) in enumerate(chunks)
+            }
+            for future in as_completed(futures):
+                start, size = futures[future]
+                try:
+                    result.record(start, size, future.result())
+                except Exception as e:
+                    result.fail(start, size, e)
+        return result
+
+    @staticmethod
+    def _retry_after(response: requests.Response) -> Optional[float]:
+        """读取 Retry-After 头（秒）"""
+        try:
+            return float(response.headers['Retry-After'])
+        except (KeyError, ValueError):
+            return None
+
+    def _raise_for_response(self, response: requests.Response) -> None:
+        """把错误响应转换为 JDYAPIError / JDYRateLimitError"""
+        error_msg = response.text
+        try:
+            code = response.json().get('code')
+        except (ValueError, AttributeError):
+            code = None
+        
+        if response.status_code == 429 or code in RATE_LIMIT_CODES:
+            self.logger.warning(f"API rate limited {response.status_code}: {error_msg[:200]}")
+            raise JDYRateLimitError(response.status_code, error_msg, code, self._retry_after(response))
         
+        self.logger.error(f"API error {response.status_code}: {error_msg}")
+        raise JDYAPIError(response.status_code, error_msg, code)
+
+    def _send(self, method: str, endpoint: str, json_data: Optional[Dict]) -> Dict[str, Any]:
+        """发送一次HTTP请求（不重试）"""
+        entry_id = (json_data or {}).get('entry_id', '')
+        if self.rate_limiter:
+            waited = self.rate_limiter.acquire(endpoint)
+            if waited and self.metrics:
+                self.metrics.throttle_seconds.inc((endpoint,), waited)
+        
+        body = dumps(json_data) if json_data is not None else None
+        started = time.perf_counter()
         try:
-            response = requests.request(
+            response = self.session.request(
                 method=method,
-                url=url,
-                headers=headers,
-                json=json_data,
-                timeout=30
+                url=f"{self.base_url}{endpoint}",
+                data=body,
+                timeout=self.timeout
             )
-            
-            self.logger.info(f"{method} {endpoint} -> {response.status_code}")
-            
-            if response.status_code >= 400:
-                error_msg = response.text
-                self.logger.error(f"API error {response.status_code}: {error_msg}")
-                raise Exception(f"HTTP {response.status_code}: {error_msg[:200]}")
-            
-            # 直接返回JSON
-            return response.json() if response.text else {}
-                    
         except Exception as e:
-            self.logger.error(f"请求失败: {str(e)}")
+            if self.metrics:
+                self.metrics.requests.inc((endpoint, entry_id, type(e).__name__))
+                self.metrics.latency.observe((endpoint, entry_id), time.perf_counter() - started)
             raise
+        
+        if self.metrics:
+            labels = (endpoint, entry_id)
+            self.metrics.requests.inc(labels + (response.status_code,))
+            self.metrics.latency.observe(labels, time.perf_counter() - started)
+            self.metrics.request_bytes.observe(labels, len(body) if body else 0)
+            self.metrics.response_bytes.observe(labels, len(response.content))
+        
+        self.logger.info(f"{method} {endpoint} -> {response.status_code}")
+        
+        if response.status_code >= 400:
+            self._raise_for_response(response)
+        
+        if self.rate_limiter:
+            self.rate_limiter.on_success(endpoint)
+        
+        # 直接返回JSON
+        return loads(response.content) if response.content else {}
+
+    def request(self, method: str, endpoint: str, json_data: Optional[Dict] = None,
+                retry_policy: Optional[RetryPolicy] = None) -> Dict[str, Any]:
+        """发送HTTP请求
+        
+        请求前经过限流器；被限流时由限流器退避后重试（不计入重试次数），
+        超时、连接错误和 5xx 按重试策略退避重试。重试时请求体保持不变，
+        写接口的 transaction_id 因此在各次尝试间一致，服务端据此去重。
+        """
+        policy = retry_policy or self.retry_policy
+        labels = (endpoint, (json_data or {}).get('entry_id', ''))
+        started = time.monotonic()
+        attempt = 0
+        limited_attempts = 0
+        
+        while True:
+            try:
+                return self._send(method, endpoint, json_data)
+            except JDYRateLimitError as e:
+                if self.metrics:
+                    self.metrics.rate_limited.inc(labels)
+                if self.rate_limiter and limited_attempts < RATE_LIMIT_MAX_RETRIES:
+                    limited_attempts += 1
+                    self.rate_limiter.on_rate_limited(endpoint, e.retry_after)
+                    continue
+                error = e
+            except Exception as e:
+                error = e
+            
+            attempt += 1
+            delay = policy.next_delay(error, attempt, started)
+            if delay is None:
+                self.logger.error(f"请求失败: {str(error)}")
+                raise error
+            if self.metrics:
+                self.metrics.retries.inc(labels)
+            self.logger.warning(f"{method} {endpoint} 第 {attempt} 次失败，{delay:.2f}s 后重试: {str(error)[:100]}")
+            time.sleep(delay)
 
     def get_form_widgets(self, entry_id: str) -> Dict[str, Any]:
         """获取表单字段信息"""
@@ -66,13 +292,7 @@ class JDYClient:
     def create_data(self, entry_id: str, data: Dict[str, Any], 
                    transaction_id: Optional[str] = None) -> str:
         """创建单条数据"""
-        # 包装数据格式
-        wrapped_data = {}
-        for key, value in data.items():
-            if isinstance(value, dict) and 'value' in value:
-                wrapped_data[key] = value
-            else:
-                wrapped_data[key] = {'value': value}
+        wrapped_data = get_encoder(entry_id).encode(data)
         
         endpoint = "/app/entry/data/create"
         payload = {
@@ -92,8 +312,8 @@ class JDYClient:
         return result.get('data', {}).get('_id', '')
 
     def query_data(self, entry_id: str, filters: Dict = None, limit: int = 100, 
-                  data_id: str = None) -> List[Dict]:
-        """查询数据"""
+                  data_id: str = None, fields: Optional[List[str]] = None) -> List[Dict]:
+        """查询数据（单页）"""
         endpoint = "/app/entry/data/list"
         payload = {
             "app_id": self.app_id,
@@ -104,29 +324,61 @@ class JDYClient:
             payload["data_id"] = data_id
         if filters:
             payload["filter"] = filters
+        if fields:
+            payload["fields"] = fields
         result = self.request('POST', endpoint, payload)
         return result.get('data', [])
 
-    def get_data(self, entry_id: str, data_id: str) -> Dict[str, Any]:
-        """获取单条数据"""
+    def iter_pages(self, entry_id: str, filters: Dict = None, page_size: int = 100,
+                   fields: Optional[List[str]] = None) -> Iterator[List[Dict]]:
+        """逐页查询数据，以上一页最后一条的 _id 作为游标
+        
+        page_size 超过接口上限时按 MAX_PAGE_SIZE 查询，否则会把满页误判为最后一页。
+        """
+        page_size = min(page_size, MAX_PAGE_SIZE)
+        data_id = None
+        while True:
+            page = self.query_data(entry_id, filters=filters, limit=page_size,
+                                   data_id=data_id, fields=fields)
+            if page:
+                yield page
+            if len(page) < page_size:
+                return
+            data_id = page[-1].get('_id')
+            if not data_id:
+                return
+
+    def iter_data(self, entry_id: str, filters: Dict = None, page_size: int = 100,
+                  fields: Optional[List[str]] = None) -> Iterator[Dict]:
+        """逐条遍历全部数据，内存中最多只保留一页"""
+        for page in self.iter_pages(entry_id, filters=filters, page_size=page_size, fields=fields):
+            yield from page
+
+    def get_data(self, entry_id: str, data_id: str, use_cache: bool = True) -> Dict[str, Any]:
+        """获取单条数据（优先读缓存）"""
+        key = (entry_id, data_id)
+        if use_cache and self.cache is not None:
+            cached = self.cache.get(key)
+            if cached is not None:
+                return copy.deepcopy(cached)
+        
+        # 请求期间该记录被写接口失效时，响应可能是旧数据，不写入缓存
+        version = self.cache.version(key) if self.cache is not None else None
         endpoint = "/app/entry/data/get"
         payload = {
             "app_id": self.app_id,
             "entry_id": entry_id,
             "data_id": data_id
         }
-        return self.request('POST', endpoint, payload)
+        result = self.request('POST', endpoint, payload)
+        if self.cache is not None:
+            self.cache.set(key, copy.deepcopy(result), version=version)
+        return result
 
     def update_data(self, entry_id: str, data_id: str, data: Dict[str, Any],
                    transaction_id: Optional[str] = None) -> bool:
         """更新单条数据"""
-        # 包装数据格式
-        wrapped_data = {}
-        for key, value in data.items():
-            if isinstance(value, dict) and 'value' in value:
-                wrapped_data[key] = value
-            else:
-                wrapped_data[key] = {'value': value}
+        wrapped_data = get_encoder(entry_id).encode(data)
         
         endpoint = "/app/entry/data/update"
         payload = {
@@ -141,7 +393,10 @@ class JDYClient:
             transaction_id = self._generate_transaction_id()
         payload["transaction_id"] = transaction_id
         
-        self.request('POST', endpoint, payload)
+        try:
+            self.request('POST', endpoint, payload)
+        finally:
+            self._invalidate(entry_id, [data_id])
         return True
 
     def delete_data(self, entry_id: str, data_id: str) -> bool:
@@ -152,75 +407,154 @@ class JDYClient:
             "entry_id": entry_id,
             "data_id": data_id
         }
-        self.request('POST', endpoint, payload)
+        try:
+            self.request('POST', endpoint, payload)
+        finally:
+            self._invalidate(entry_id, [data_id])
         return True
 
     def batch_create_data(self, entry_id: str, data_list: List[Dict],
-                         transaction_id: Optional[str] = None) -> List[str]:
-        """批量创建数据"""
-        wrapped_list = []
-        for data in data_list:
-            wrapped_data = {}
-            for key, value in data.items():
-                if isinstance(value, dict) and 'value' in value:
-                    wrapped_data[key] = value
-                else:
-                    wrapped_data[key] = {'value': value}
-            wrapped_list.append(wrapped_data)
+                         transaction_id: Optional[str] = None, chunk_size: int = BATCH_SIZE,
+                         concurrency: int = BATCH_CONCURRENCY) -> BatchResult:
+        """批量创建数据（自动分块、并发提交），返回逐行结果"""
+        wrapped_list = get_encoder(entry_id).encode_many(data_list)
         
         endpoint = "/app/entry/data/batch_create"
-        payload = {
-            "app_id": self.app_id,
-            "entry_id": entry_id,
-            "data_list": wrapped_list,
-            "is_start_trigger": False,
-            "is_start_workflow": False
-        }
         
-        if not transaction_id:
-            transaction_id = self._generate_transaction_id()
-        payload["transaction_id"] = transaction_id
+        def send(index: int, chunk: Sequence[Dict]) -> List[str]:
+            payload = {
+                "app_id": self.app_id,
+                "entry_id": entry_id,
+                "data_list": list(chunk),
+                "is_start_trigger": False,
+                "is_start_workflow": False,
+                "transaction_id": self._chunk_transaction_id(transaction_id, index)
+            }
+            result = self.request('POST', endpoint, payload)
+            # 响应格式: {"data": [{"_id": "xxx"}, ...]} 或 {"success_ids": [...]}
+            if 'success_ids' in result:
+                return result.get('success_ids', [])
+            # 如果响应是data列表，提取_id
+            data = result.get('data', [])
+            return [item.get('_id') for item in data if item.get('_id')]
         
-        result = self.request('POST', endpoint, payload)
-        # 响应格式: {"data": [{"_id": "xxx"}, ...]} 或 {"success_ids": [...]}
-        if 'success_ids' in result:
-            return result.get('success_ids', [])
-        # 如果响应是data列表，提取_id
-        data = result.get('data', [])
-        return [item.get('_id') for item in data if item.get('_id')]
+        return self._run_chunks(wrapped_list, chunk_size, concurrency, send)
 
     def batch_update_data(self, entry_id: str, data_ids: List[str], 
-                         data: Dict[str, Any], transaction_id: Optional[str] = None) -> bool:
-        """批量更新数据"""
-        wrapped_data = {}
-        for key, value in data.items():
-            if isinstance(value, dict) and 'value' in value:
-                wrapped_data[key] = value
-            else:
-                wrapped_data[key] = {'value': value}
+                         data: Dict[str, Any], transaction_id: Optional[str] = None,
+                         chunk_size: int = BATCH_SIZE, concurrency: int = BATCH_CONCURRENCY) -> BatchResult:
+        """批量更新数据（自动分块、并发提交），返回逐条结果"""
+        wrapped_data = get_encoder(entry_id).encode(data)
         
         endpoint = "/app/entry/data/batch_update"
-        payload = {
-            "app_id": self.app_id,
-            "entry_id": entry_id,
-            "data_ids": data_ids,
-            "data": wrapped_data
-        }
         
-        if not transaction_id:
-            transaction_id = self._generate_transaction_id()
-        payload["transaction_id"] = transaction_id
+        def send(index: int, chunk: Sequence[str]) -> List[str]:
+            payload = {
+                "app_id": self.app_id,
+                "entry_id": entry_id,
+                "data_ids": list(chunk),
+                "data": wrapped_data,
+                "transaction_id": self._chunk_transaction_id(transaction_id, index)
+            }
+            try:
+                self.request('POST', endpoint, payload)
+            finally:
+                self._invalidate(entry_id, chunk)
+            return list(chunk)
         
-        self.request('POST', endpoint, payload)
-        return True
+        return self._run_chunks(data_ids, chunk_size, concurrency, send)
+
+    def batch_update_rows(self, entry_id: str, updates: Dict[str, Dict[str, Any]],
+                          transaction_id: Optional[str] = None, chunk_size: int = BATCH_SIZE,
+                          concurrency: int = BATCH_CONCURRENCY) -> BatchResult:
+        """按记录分别批量更新（记录ID -> 字段值），返回按 updates 顺序逐条对应的结果
+        
+        字段值完全相同的记录合并为一组，每组按 chunk_size 分块；所有组的分块一起并发提交，
+        组很多（如各条记录的签到时间不同）时也不会退化为逐组串行请求。
+        """
+        record_ids = list(updates)
+        groups: Dict[str, List[int]] = {}
+        for index, record_id in enumerate(record_ids):
+            key = json.dumps(updates[record_id], sort_keys=True, ensure_ascii=False, default=str)
+            groups.setdefault(key, []).append(index)
+        
+        # 同组记录排在一起，分块不跨组
+        order = [index for positions in groups.values() for index in positions]
+        ordered_ids = [record_ids[index] for index in order]
+        chunks = []
+        start = 0
+        for positions in groups.values():
+            for offset, chunk in chunked(ordered_ids[start:start + len(positions)], chunk_size):
+                chunks.append((start + offset, chunk))
+            start += len(positions)
+        
+        encoder = get_encoder(entry_id)
+        endpoint = "/app/entry/data/batch_update"
+        
+        def send(index: int, chunk: Sequence[str]) -> List[str]:
+            payload = {
+                "app_id": self.app_id,
+                "entry_id": entry_id,
+                "data_ids": list(chunk),
+                "data": encoder.encode(updates[chunk[0]]),
+                "transaction_id": self._chunk_transaction_id(transaction_id, index)
+            }
+            try:
+                self.request('POST', endpoint, payload)
+            finally:
+                self._invalidate(entry_id, chunk)
+            return list(chunk)
+        
+        grouped = self._run_chunks(ordered_ids, chunk_size, concurrency, send, chunks=chunks)
+        result = BatchResult(len(record_ids))
+        for position, data_id in grouped.ids.items():
+            result.ids[order[position]] = data_id
+        for position, reason in grouped.errors.items():
+            result.errors[order[position]] = reason
+        result.orphan_ids.extend(grouped.orphan_ids)
+        return result
 
-    def batch_delete_data(self, entry_id: str, data_ids: List[str]) -> bool:
-        """批量删除数据"""
+    def batch_delete_data(self, entry_id: str, data_ids: List[str],
+                          chunk_size: int = BATCH_SIZE, concurrency: int = BATCH_CONCURRENCY) -> BatchResult:
+        """批量删除数据（自动分块、并发提交），返回逐条结果"""
         endpoint = "/app/entry/data/batch_delete"
-        payload = {
-            "app_id": self.app_id,
-            "entry_id": entry_id,
-            "data_ids": data_ids
-        }
-        self.request('POST', endpoint, payload)
-        return True
\ No newline at end of file
+        
+        def send(index: int, chunk: Sequence[str]) -> List[str]:
+            payload = {
+                "app_id": self.app_id,
+                "entry_id": entry_id,
+                "data_ids": list(chunk)
+            }
+            try:
+                self.request('POST', endpoint, payload)
+            finally:
+                self._invalidate(entry_id, chunk)
+            return list(chunk)
+        
+        return self._run_chunks(data_ids, chunk_size, concurrency, send)
+
+
+# 进程内共享的客户端注册表，按 (app_id, api_key, base_url) 区分
+_clients: Dict[Tuple[str, str, str], JDYClient] = {}
+_clients_lock = threading.Lock()
+
+def get_client(app_id: Optional[str] = None, api_key: Optional[str] = None,
+               base_url: Optional[str] = None) -> JDYClient:
+    """获取进程内共享的客户端实例（首次调用时创建）"""
+    key = (app_id or APP_ID, api_key or API_KEY, base_url or BASE_URL)
+    client = _clients.get(key)
+    if client is None:
+        with _clients_lock:
+            client = _clients.get(key)
+            if client is None:
+                client = JDYClient(app_id=key[0], api_key=key[1], base_url=key[2])
+                _clients[key] = client
+    return client
+
+def close_clients() -> None:
+    """关闭并清空所有共享客户端"""
+    with _clients_lock:
+        clients = list(_clients.values())
+        _clients.clear()
+    for client in clients:
+        client.close()
\ No newline at end of file
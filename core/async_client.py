@@ -0,0 +1,145 @@
+import asyncio
+import functools
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, Optional, List, AsyncIterator, Awaitable, Iterable
+from core.api_client import JDYClient, MAX_PAGE_SIZE, get_client
+from core.batch import BatchResult
+from config.settings import POOL_MAXSIZE, ASYNC_CONCURRENCY, BATCH_CONCURRENCY
+
+class AsyncJDYClient:
+    """简道云API异步客户端
+    
+    与 JDYClient 接口一致的协程版本。请求在专用线程池中通过共享连接池的
+    JDYClient 执行，并由信号量限制同时在途的请求数，避免超出接口限制。
+    批量接口会并发提交多个分块，每个并发分块各占一个名额（见 _call_batch）。
+    """
+    
+    def __init__(self, concurrency: int = ASYNC_CONCURRENCY, client: Optional[JDYClient] = None):
+        self.concurrency = concurrency
+        # 连接池大小不小于并发数，保证每个在途请求都能拿到可复用的连接；
+        # 与 get_client() 共用 get_data 缓存，经异步客户端的写入同样使模型读到的缓存失效
+        self.client = client or JDYClient(pool_maxsize=max(POOL_MAXSIZE, concurrency),
+                                          cache=get_client().cache)
+        self._owns_client = client is None
+        self._semaphore = asyncio.Semaphore(concurrency)
+        # 同一时间只有一个批量调用在凑多个名额，避免两个批量调用各占一部分名额而互相等待
+        self._batch_lock = asyncio.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=concurrency,
+                                            thread_name_prefix="AsyncJDYClient")
+        self.logger = logging.getLogger("AsyncJDYClient")
+    
+    async def __aenter__(self) -> "AsyncJDYClient":
+        return self
+    
+    async def __aexit__(self, exc_type, exc_val, exc_tb) -> None:
+        await self.aclose()
+    
+    async def aclose(self) -> None:
+        """关闭线程池（以及自建的同步客户端）"""
+        self._executor.shutdown(wait=True)
+        if self._owns_client:
+            self.client.close()
+    
+    async def _call(self, func, *args, **kwargs) -> Any:
+        """在信号量限制下于线程池中执行同步调用"""
+        async with self._semaphore:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._executor, functools.partial(func, *args, **kwargs))
+    
+    async def _call_batch(self, func, *args, concurrency: int = BATCH_CONCURRENCY, **kwargs) -> Any:
+        """执行批量调用：分块并发数不超过 concurrency 上限，并按并发数占用信号量名额"""
+        slots = max(1, min(concurrency, self.concurrency))
+        acquired = 0
+        try:
+            async with self._batch_lock:
+                while acquired < slots:
+                    await self._semaphore.acquire()
+                    acquired += 1
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(
+                self._executor, functools.partial(func, *args, concurrency=slots, **kwargs))
+        finally:
+            # 等待名额时被取消也要归还已占用的名额
+            for _ in range(acquired):
+                self._semaphore.release()
+    
+    @staticmethod
+    async def gather(aws: Iterable[Awaitable], return_exceptions: bool = True) -> List[Any]:
+        """并发等待一组协程，默认把异常作为结果返回而不是中断其余请求"""
+        return await asyncio.gather(*aws, return_exceptions=return_exceptions)
+    
+    async def request(self, method: str, endpoint: str, json_data: Optional[Dict] = None) -> Dict[str, Any]:
+        """发送HTTP请求"""
+        return await self._call(self.client.request, method, endpoint, json_data)
+    
+    async def get_form_widgets(self, entry_id: str) -> Dict[str, Any]:
+        """获取表单字段信息"""
+        return await self._call(self.client.get_form_widgets, entry_id)
+    
+    async def create_data(self, entry_id: str, data: Dict[str, Any],
+                          transaction_id: Optional[str] = None) -> str:
+        """创建单条数据"""
+        return await self._call(self.client.create_data, entry_id, data, transaction_id)
+    
+    async def query_data(self, entry_id: str, filters: Dict = None, limit: int = 100,
+                         data_id: str = None, fields: Optional[List[str]] = None) -> List[Dict]:
+        """查询数据（单页）"""
+        return await self._call(self.client.query_data, entry_id, filters=filters, limit=limit,
+                                data_id=data_id, fields=fields)
+    
+    async def iter_pages(self, entry_id: str, filters: Dict = None, page_size: int = 100,
+                         fields: Optional[List[str]] = None) -> AsyncIterator[List[Dict]]:
+        """逐页查询数据，以上一页最后一条的 _id 作为游标（page_size 不超过 MAX_PAGE_SIZE）"""
+        page_size = min(page_size, MAX_PAGE_SIZE)
+        data_id = None
+        while True:
+            page = await self.query_data(entry_id, filters=filters, limit=page_size,
+                                         data_id=data_id, fields=fields)
+            if page:
+                yield page
+            if len(page) < page_size:
+                return
+            data_id = page[-1].get('_id')
+            if not data_id:
+                return
+    
+    async def iter_data(self, entry_id: str, filters: Dict = None, page_size: int = 100,
+                        fields: Optional[List[str]] = None) -> AsyncIterator[Dict]:
+        """逐条遍历全部数据"""
+        async for page in self.iter_pages(entry_id, filters=filters, page_size=page_size, fields=fields):
+            for row in page:
+                yield row
+    
+    async def get_data(self, entry_id: str, data_id: str, use_cache: bool = True) -> Dict[str, Any]:
+        """获取单条数据（优先读缓存）"""
+        return await self._call(self.client.get_data, entry_id, data_id, use_cache)
+    
+    async def update_data(self, entry_id: str, data_id: str, data: Dict[str, Any],
+                          transaction_id: Optional[str] = None) -> bool:
+        """更新单条数据"""
+        return await self._call(self.client.update_data, entry_id, data_id, data, transaction_id)
+    
+    async def delete_data(self, entry_id: str, data_id: str) -> bool:
+        """删除单条数据"""
+        return await self._call(self.client.delete_data, entry_id, data_id)
+    
+    async def batch_create_data(self, entry_id: str, data_list: List[Dict],
+                                transaction_id: Optional[str] = None, **kwargs) -> BatchResult:
+        """批量创建数据（自动分块）"""
+        return await self._call_batch(self.client.batch_create_data, entry_id, data_list, transaction_id, **kwargs)
+    
+    async def batch_update_data(self, entry_id: str, data_ids: List[str],
+                                data: Dict[str, Any], transaction_id: Optional[str] = None,
+                                **kwargs) -> BatchResult:
+        """批量更新数据（自动分块）"""
+        return await self._call_batch(self.client.batch_update_data, entry_id, data_ids, data, transaction_id, **kwargs)
+    
+    async def batch_update_rows(self, entry_id: str, updates: Dict[str, Dict[str, Any]],
+                                transaction_id: Optional[str] = None, **kwargs) -> BatchResult:
+        """按记录分别批量更新（字段值相同的记录合并为一组）"""
+        return await self._call_batch(self.client.batch_update_rows, entry_id, updates, transaction_id, **kwargs)
+    
+    async def batch_delete_data(self, entry_id: str, data_ids: List[str], **kwargs) -> BatchResult:
+        """批量删除数据（自动分块）"""
+        return await self._call_batch(self.client.batch_delete_data, entry_id, data_ids, **kwargs)
@@ -0,0 +1,49 @@
+from typing import Dict, List, Sequence, Iterator, Tuple, Any
+
+def chunked(items: Sequence, size: int) -> Iterator[Tuple[int, Sequence]]:
+    """按固定大小切分，返回 (起始下标, 分块)"""
+    for start in range(0, len(items), size):
+        yield start, items[start:start + size]
+
+class BatchResult:
+    """批量操作结果：按输入行的下标记录成功的 _id 或失败原因"""
+    
+    def __init__(self, total: int):
+        self.total = total
+        self.ids: Dict[int, str] = {}
+        self.errors: Dict[int, str] = {}
+        # 服务端返回的 ID 数量与提交行数不一致时，无法对应到具体行的 ID
+        self.orphan_ids: List[str] = []
+    
+    def record(self, start: int, size: int, ids: List[str]) -> None:
+        """记录一个分块的成功结果"""
+        if len(ids) == size:
+            for offset, data_id in enumerate(ids):
+                self.ids[start + offset] = data_id
+        else:
+            self.orphan_ids.extend(ids)
+            self.fail(start, size, f"返回 {len(ids)} 个ID，与提交的 {size} 行不一致")
+    
+    def fail(self, start: int, size: int, reason: Any) -> None:
+        """记录一个分块的失败原因"""
+        for index in range(start, start + size):
+            self.errors[index] = str(reason)
+    
+    @property
+    def success_ids(self) -> List[str]:
+        """按输入顺序排列的成功ID"""
+        return [self.ids[index] for index in sorted(self.ids)]
+    
+    @property
+    def success_count(self) -> int:
+        return len(self.ids)
+    
+    @property
+    def failure_count(self) -> int:
+        return len(self.errors)
+    
+    def __bool__(self) -> bool:
+        return not self.errors
+    
+    def __repr__(self) -> str:
+        return f"BatchResult(total={self.total}, success={self.success_count}, failed={self.failure_count})"
@@ -0,0 +1,122 @@
+import sys
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Any, Optional, Tuple, Hashable
+
+_MISSING = object()
+
+def _estimate_size(value: Any) -> int:
+    """粗略估算对象占用的字节数（递归统计容器内容）"""
+    size = sys.getsizeof(value)
+    if isinstance(value, dict):
+        size += sum(_estimate_size(k) + _estimate_size(v) for k, v in value.items())
+    elif isinstance(value, (list, tuple, set)):
+        size += sum(_estimate_size(item) for item in value)
+    return size
+
+class TTLCache:
+    """线程安全的 LRU + TTL 缓存，同时限制条目数和估算内存
+    
+    每次 invalidate 都会递增该键的版本号。读穿缓存在发请求前取 version(key)，
+    写回时传给 set(..., version=)：请求期间该键被失效过则不写入，避免缓存旧数据。
+    版本号只保留最近 max_entries 个失效的键，更早的键统一按下限值比较（只会多放弃写入，不会写入旧值）。
+    """
+    
+    def __init__(self, max_entries: int = 1024, ttl: float = 300, max_bytes: Optional[int] = None):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self._data: "OrderedDict[Hashable, Tuple[Any, float, int]]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._versions: "OrderedDict[Hashable, int]" = OrderedDict()
+        self._version_seq = 0
+        self._version_floor = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+    
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            item = self._data.get(key, _MISSING)
+            if item is _MISSING:
+                self.misses += 1
+                return default
+            value, expires_at, size = item
+            if expires_at < time.monotonic():
+                self._remove(key)
+                self.misses += 1
+                return default
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+    
+    def version(self, key: Hashable) -> int:
+        """键的失效版本号（每次 invalidate 后变化）"""
+        with self._lock:
+            return self._versions.get(key, self._version_floor)
+    
+    def set(self, key: Hashable, value: Any, version: Optional[int] = None) -> bool:
+        """写入缓存；指定 version 且该键此后被失效过时不写入，返回是否写入"""
+        size = _estimate_size(value) if self.max_bytes else 0
+        if self.max_bytes and size > self.max_bytes:
+            return False
+        with self._lock:
+            if version is not None and self._versions.get(key, self._version_floor) != version:
+                return False
+            if key in self._data:
+                self._remove(key)
+            self._data[key] = (value, time.monotonic() + self.ttl, size)
+            self._bytes += size
+            while self._data and (len(self._data) > self.max_entries
+                                  or (self.max_bytes and self._bytes > self.max_bytes)):
+                oldest = next(iter(self._data))
+                self._remove(oldest)
+                self.evictions += 1
+        return True
+    
+    def _remove(self, key: Hashable) -> None:
+        _, _, size = self._data.pop(key)
+        self._bytes -= size
+    
+    def _bump(self, key: Hashable) -> None:
+        self._version_seq += 1
+        self._versions[key] = self._version_seq
+        self._versions.move_to_end(key)
+        while len(self._versions) > self.max_entries:
+            _, self._version_floor = self._versions.popitem(last=False)
+    
+    def invalidate(self, key: Hashable) -> bool:
+        """删除单个缓存项（并递增该键的版本号）"""
+        with self._lock:
+            self._bump(key)
+            if key in self._data:
+                self._remove(key)
+                return True
+            return False
+    
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+            self._bytes = 0
+            # 清空前开始的读取都不再写回
+            self._version_seq += 1
+            self._version_floor = self._version_seq
+            self._versions.clear()
+    
+    def __len__(self) -> int:
+        return len(self._data)
+    
+    def stats(self) -> Dict[str, Any]:
+        """命中率等统计信息"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._data),
+                "bytes": self._bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+            }
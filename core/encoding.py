@@ -0,0 +1,147 @@
+import json
+import threading
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Dict, Any, Callable, Optional
+
+def _default(value: Any) -> Any:
+    """标准库/orjson 都不能直接序列化的类型"""
+    if isinstance(value, datetime):
+        return value.strftime('%Y-%m-%d %H:%M:%S')
+    if isinstance(value, date):
+        return value.strftime('%Y-%m-%d')
+    if isinstance(value, Decimal):
+        return float(value)
+    if isinstance(value, (set, frozenset, tuple)):
+        return list(value)
+    if hasattr(value, 'item'):  # numpy / pandas 标量
+        return value.item()
+    raise TypeError(f"无法序列化 {type(value).__name__}")
+
+def _std_dumps(obj: Any) -> bytes:
+    return json.dumps(obj, ensure_ascii=False, separators=(',', ':'), default=_default).encode('utf-8')
+
+# (dumps, loads)，首次使用时选择：安装了 orjson 时用 orjson，否则用标准库
+_backend = None
+
+def _load_backend():
+    global _backend
+    try:
+        import orjson
+    except ImportError:
+        _backend = (_std_dumps, json.loads)
+    else:
+        options = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_PASSTHROUGH_DATETIME
+        _backend = (lambda obj: orjson.dumps(obj, default=_default, option=options), orjson.loads)
+    return _backend
+
+def dumps(obj: Any) -> bytes:
+    """序列化为 UTF-8 编码的 JSON"""
+    return (_backend or _load_backend())[0](obj)
+
+def loads(data) -> Any:
+    """解析 JSON（bytes 或 str）"""
+    return (_backend or _load_backend())[1](data)
+
+# ---- 字段值转换：按字段类型预先选好，编码时不再逐个判断类型 ----
+
+def _plain(value: Any) -> Any:
+    return value
+
+def _number(value: Any) -> Any:
+    if value is None or value == '':
+        return value
+    if isinstance(value, bool):
+        raise ValueError(f"不是数字: {value!r}")
+    if isinstance(value, (int, float)):
+        return value
+    if isinstance(value, Decimal):
+        return float(value)
+    if hasattr(value, 'item'):
+        return value.item()
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        raise ValueError(f"不是数字: {value!r}") from None
+
+def _date(value: Any) -> Any:
+    if isinstance(value, (date, datetime)):
+        return value.strftime('%Y-%m-%d')
+    return value
+
+def _datetime(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return value.strftime('%Y-%m-%d %H:%M:%S')
+    if isinstance(value, date):
+        return value.strftime('%Y-%m-%d')
+    return value
+
+def _list(value: Any) -> Any:
+    if value is None or value == '':
+        return []
+    if isinstance(value, list):
+        return value
+    if isinstance(value, (tuple, set, frozenset)):
+        return list(value)
+    return [value]
+
+CONVERTERS: Dict[str, Callable[[Any], Any]] = {
+    "text": _plain,
+    "category": _plain,
+    "number": _number,
+    "int": _number,
+    "date": _date,
+    "datetime": _datetime,
+    "list": _list,
+}
+
+class PayloadEncoder:
+    """单个表单的写入数据编码器
+
+    按 widget ID -> 字段类型预先生成每个字段的转换函数，编码一行时只做一次遍历：
+    校验/转换值（数字、日期、复选框）并包装为 {'value': ...}。
+    已经是 {'value': ...} 格式的值原样保留；未登记的 widget 只包装不转换。
+    """
+
+    def __init__(self, widget_types: Optional[Dict[str, str]] = None):
+        self.widget_types = dict(widget_types or {})
+        self._converters = {widget: CONVERTERS[kind] for widget, kind in self.widget_types.items()}
+
+    def encode(self, data: Dict[str, Any]) -> Dict[str, Dict[str, Any]]:
+        """把 widget ID -> 值 的一行数据编码为接口格式"""
+        converters = self._converters
+        wrapped = {}
+        for key, value in data.items():
+            if type(value) is dict and 'value' in value:
+                wrapped[key] = value
+                continue
+            convert = converters.get(key, _plain)
+            try:
+                wrapped[key] = {'value': convert(value)}
+            except ValueError as e:
+                raise ValueError(f"字段 {key}: {e}") from None
+        return wrapped
+
+    def encode_many(self, rows) -> list:
+        encode = self.encode
+        return [encode(row) for row in rows]
+
+# 没有登记字段类型的表单共用的编码器
+GENERIC_ENCODER = PayloadEncoder()
+
+_encoders: Dict[str, PayloadEncoder] = {}
+_encoders_lock = threading.Lock()
+
+def register_encoder(entry_id: str, widget_types: Dict[str, str]) -> PayloadEncoder:
+    """按 widget ID -> 字段类型为表单编译编码器（重复登记相同的类型时复用）"""
+    encoder = _encoders.get(entry_id)
+    if encoder is not None and encoder.widget_types == widget_types:
+        return encoder
+    with _encoders_lock:
+        encoder = PayloadEncoder(widget_types)
+        _encoders[entry_id] = encoder
+    return encoder
+
+def get_encoder(entry_id: str) -> PayloadEncoder:
+    """表单的编码器；未登记时返回通用编码器"""
+    return _encoders.get(entry_id, GENERIC_ENCODER)
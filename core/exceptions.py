@@ -0,0 +1,18 @@
+from typing import Optional
+
+class JDYAPIError(Exception):
+    """简道云接口返回错误（HTTP 状态码 >= 400）"""
+    
+    def __init__(self, status_code: int, message: str = "", code: Optional[int] = None):
+        self.status_code = status_code
+        self.code = code
+        self.message = message
+        super().__init__(f"HTTP {status_code}: {message[:200]}")
+
+class JDYRateLimitError(JDYAPIError):
+    """请求被限流（HTTP 429 或限流错误码）"""
+    
+    def __init__(self, status_code: int, message: str = "", code: Optional[int] = None,
+                 retry_after: Optional[float] = None):
+        super().__init__(status_code, message, code)
+        self.retry_after = retry_after
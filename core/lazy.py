@@ -0,0 +1,33 @@
+import importlib
+import threading
+from types import ModuleType
+from typing import Any, Optional
+
+class LazyModule(ModuleType):
+    """首次访问属性时才真正导入的模块代理
+
+    pandas、requests 等重量级依赖的导入耗时远超脚本本身，
+    用它包装后，只有真正用到时才付出导入开销。
+    """
+
+    def __init__(self, name: str):
+        super().__init__(name)
+        self._module: Optional[ModuleType] = None
+        self._lock = threading.Lock()
+
+    def _load(self) -> ModuleType:
+        if self._module is None:
+            with self._lock:
+                if self._module is None:
+                    self._module = importlib.import_module(self.__name__)
+        return self._module
+
+    def __getattr__(self, attr: str) -> Any:
+        return getattr(self._load(), attr)
+
+    def __dir__(self):
+        return dir(self._load())
+
+def lazy_import(name: str) -> LazyModule:
+    """返回按需导入的模块代理，用法与 import name 相同"""
+    return LazyModule(name)
@@ -0,0 +1,217 @@
+from __future__ import annotations
+
+import bisect
+import threading
+from typing import Dict, Any, List, Tuple, Sequence, Optional
+
+# 默认的延迟（秒）和字节数分桶
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+
+def _escape(value: str) -> str:
+    return str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    parts = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+def _format_number(value: float) -> str:
+    if value == float('inf'):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+class Counter:
+    """按标签累加的计数器"""
+    TYPE = "counter"
+    
+    def __init__(self, name: str, help_text: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.help = help_text
+        self.labelnames = tuple(labelnames)
+        self._values: Dict[Tuple[str, ...], float] = {}
+        self._lock = threading.Lock()
+    
+    def inc(self, labels: Sequence[str] = (), amount: float = 1.0) -> None:
+        key = tuple(str(v) for v in labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+    
+    def get(self, labels: Sequence[str] = ()) -> float:
+        return self._values.get(tuple(str(v) for v in labels), 0.0)
+    
+    def samples(self) -> List[Tuple[Tuple[str, ...], float]]:
+        with self._lock:
+            return list(self._values.items())
+    
+    def render(self) -> List[str]:
+        return [f"{self.name}{_format_labels(self.labelnames, labels)} {_format_number(value)}"
+                for labels, value in sorted(self.samples())]
+
+class Histogram:
+    """按标签统计分布的直方图（累计分桶 + 总和 + 次数）"""
+    TYPE = "histogram"
+    
+    def __init__(self, name: str, help_text: str, labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = LATENCY_BUCKETS):
+        self.name = name
+        self.help = help_text
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # 每组标签: [各分桶计数..., +Inf 计数], 总和
+        self._values: Dict[Tuple[str, ...], Tuple[List[int], List[float]]] = {}
+        self._lock = threading.Lock()
+    
+    def observe(self, labels: Sequence[str], value: float) -> None:
+        key = tuple(str(v) for v in labels)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            counts, total = self._values.setdefault(key, ([0] * (len(self.buckets) + 1), [0.0]))
+            counts[index] += 1
+            total[0] += value
+    
+    def stats(self, labels: Sequence[str]) -> Dict[str, float]:
+        """次数、总和、均值及按分桶估算的 p50/p95/p99"""
+        key = tuple(str(v) for v in labels)
+        with self._lock:
+            counts, total = self._values.get(key, ([0] * (len(self.buckets) + 1), [0.0]))
+            counts = list(counts)
+            total = total[0]
+        count = sum(counts)
+        result = {"count": count, "sum": total, "mean": total / count if count else 0.0}
+        for q in (50, 95, 99):
+            result[f"p{q}"] = self._quantile(counts, count, q / 100)
+        return result
+    
+    def _quantile(self, counts: List[int], count: int, q: float) -> float:
+        if not count:
+            return 0.0
+        rank = q * count
+        cumulative = 0
+        for index, n in enumerate(counts):
+            cumulative += n
+            if cumulative >= rank:
+                return self.buckets[index] if index < len(self.buckets) else float('inf')
+        return float('inf')
+    
+    def samples(self) -> List[Tuple[Tuple[str, ...], List[int], float]]:
+        with self._lock:
+            return [(labels, list(counts), total[0]) for labels, (counts, total) in self._values.items()]
+    
+    def render(self) -> List[str]:
+        lines = []
+        for labels, counts, total in sorted(self.samples()):
+            cumulative = 0
+            for bound, n in zip(self.buckets + (float('inf'),), counts):
+                cumulative += n
+                le = f'le="{_format_number(bound)}"'
+                lines.append(f"{self.name}_bucket{_format_labels(self.labelnames, labels, le)} {cumulative}")
+            lines.append(f"{self.name}_sum{_format_labels(self.labelnames, labels)} {_format_number(total)}")
+            lines.append(f"{self.name}_count{_format_labels(self.labelnames, labels)} {cumulative}")
+        return lines
+
+class MetricsRegistry:
+    """进程内指标注册表"""
+    
+    def __init__(self):
+        self._metrics: Dict[str, Any] = {}
+        self._lock = threading.Lock()
+    
+    def _get_or_create(self, cls, name: str, *args, **kwargs):
+        metric = self._metrics.get(name)
+        if metric is None:
+            with self._lock:
+                metric = self._metrics.setdefault(name, cls(name, *args, **kwargs))
+        return metric
+    
+    def counter(self, name: str, help_text: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self._get_or_create(Counter, name, help_text, labelnames)
+    
+    def histogram(self, name: str, help_text: str, labelnames: Sequence[str] = (),
+                  buckets: Sequence[float] = LATENCY_BUCKETS) -> Histogram:
+        return self._get_or_create(Histogram, name, help_text, labelnames, buckets)
+    
+    def get(self, name: str) -> Optional[Any]:
+        return self._metrics.get(name)
+    
+    def clear(self) -> None:
+        with self._lock:
+            self._metrics.clear()
+    
+    def render_prometheus(self) -> str:
+        """导出为 Prometheus 文本格式"""
+        lines = []
+        for name in sorted(self._metrics):
+            metric = self._metrics[name]
+            lines.append(f"# HELP {name} {metric.help}")
+            lines.append(f"# TYPE {name} {metric.TYPE}")
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+class ClientMetrics:
+    """JDYClient 使用的指标集合，按接口和 entry_id 打标签"""
+    
+    def __init__(self, registry: MetricsRegistry):
+        self.registry = registry
+        self.requests = registry.counter(
+            "jdy_requests_total", "HTTP 请求次数（每次尝试计一次）", ("endpoint", "entry_id", "status"))
+        self.latency = registry.histogram(
+            "jdy_request_duration_seconds", "HTTP 请求耗时（秒）", ("endpoint", "entry_id"))
+        self.request_bytes = registry.histogram(
+            "jdy_request_bytes", "请求体大小（字节）", ("endpoint", "entry_id"), SIZE_BUCKETS)
+        self.response_bytes = registry.histogram(
+            "jdy_response_bytes", "响应体大小（字节）", ("endpoint", "entry_id"), SIZE_BUCKETS)
+        self.retries = registry.counter(
+            "jdy_retries_total", "失败后重试次数", ("endpoint", "entry_id"))
+        self.rate_limited = registry.counter(
+            "jdy_rate_limited_total", "被服务端限流的次数", ("endpoint", "entry_id"))
+        self.throttle_seconds = registry.counter(
+            "jdy_throttle_wait_seconds_total", "客户端限流器累计等待时间（秒）", ("endpoint",))
+    
+    def summary(self) -> List[Dict[str, Any]]:
+        """按 (接口, entry_id) 汇总请求数、错误率和延迟，按总耗时降序"""
+        rows: Dict[Tuple[str, str], Dict[str, Any]] = {}
+        for (endpoint, entry_id, status), value in self.requests.samples():
+            row = rows.setdefault((endpoint, entry_id), {
+                "endpoint": endpoint, "entry_id": entry_id, "requests": 0, "errors": 0})
+            row["requests"] += int(value)
+            if not status.startswith('2'):
+                row["errors"] += int(value)
+        for (endpoint, entry_id), row in rows.items():
+            stats = self.latency.stats((endpoint, entry_id))
+            row["error_rate"] = row["errors"] / row["requests"] if row["requests"] else 0.0
+            row["total_seconds"] = stats["sum"]
+            row["mean_seconds"] = stats["mean"]
+            row["p95_seconds"] = stats["p95"]
+            row["retries"] = int(self.retries.get((endpoint, entry_id)))
+            row["rate_limited"] = int(self.rate_limited.get((endpoint, entry_id)))
+        return sorted(rows.values(), key=lambda r: r["total_seconds"], reverse=True)
+
+# 进程内默认注册表
+REGISTRY = MetricsRegistry()
+
+def start_metrics_server(port: int, host: str = "0.0.0.0",
+                         registry: MetricsRegistry = REGISTRY) -> ThreadingHTTPServer:
+    """在后台线程中启动 /metrics 导出服务（Prometheus 抓取用）"""
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+    
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.split('?')[0] != '/metrics':
+                self.send_error(404)
+                return
+            body = registry.render_prometheus().encode('utf-8')
+            self.send_response(200)
+            self.send_header('Content-Type', 'text/plain; version=0.0.4; charset=utf-8')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+        
+        def log_message(self, format, *args):
+            pass
+    
+    httpd = ThreadingHTTPServer((host, port), Handler)
+    httpd.daemon_threads = True
+    threading.Thread(target=httpd.serve_forever, daemon=True).start()
+    return httpd
@@ -0,0 +1,270 @@
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict, Any, Optional, List, Iterator, Iterable, Tuple
+from core.api_client import JDYClient, get_client
+from config.settings import MIRROR_DB_PATH
+
+def _column_value(value: Any) -> Any:
+    """把接口返回的字段值转换为可存入 SQLite 的标量"""
+    if isinstance(value, dict) and 'value' in value:
+        value = value['value']
+    if isinstance(value, (list, dict)):
+        return json.dumps(value, ensure_ascii=False)
+    if isinstance(value, bool):
+        return int(value)
+    return value
+
+class FormMirror:
+    """单个表单在本地 SQLite 中的镜像
+    
+    每个 ENTRY_ID 对应一张表：_id 为主键，FIELD_* 映射中的每个 widget 一列（便于过滤），
+    _raw 列保存完整的原始数据，读出时与接口返回格式一致。
+    增量同步以 updateTime 为水位线；删除只能通过全量同步（或推送回调）感知。
+    """
+    
+    def __init__(self, entry_id: str, fields: Dict[str, str], db_path: str = MIRROR_DB_PATH):
+        self.entry_id = entry_id
+        self.fields = dict(fields)
+        self.db_path = db_path
+        self.table = f"entry_{entry_id}"
+        self.logger = logging.getLogger("FormMirror")
+        self._lock = threading.RLock()
+        self._sync_lock = threading.Lock()
+        
+        directory = os.path.dirname(db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._ensure_schema()
+    
+    @property
+    def columns(self) -> List[str]:
+        """镜像表中的字段列（widget ID）"""
+        return list(self.fields.values())
+    
+    def _ensure_schema(self) -> None:
+        with self._lock, self._conn:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS _mirror_meta ("
+                "entry_id TEXT PRIMARY KEY, watermark TEXT, synced_at REAL)"
+            )
+            self._conn.execute(
+                f'CREATE TABLE IF NOT EXISTS "{self.table}" ('
+                '_id TEXT PRIMARY KEY, createTime TEXT, updateTime TEXT, _raw TEXT NOT NULL)'
+            )
+            existing = {row[1] for row in self._conn.execute(f'PRAGMA table_info("{self.table}")')}
+            # 模型新增字段时自动补列
+            for column in self.columns:
+                if column not in existing:
+                    self._conn.execute(f'ALTER TABLE "{self.table}" ADD COLUMN "{column}"')
+                    self._conn.execute(
+                        f'CREATE INDEX IF NOT EXISTS "idx_{self.table}_{column}" '
+                        f'ON "{self.table}" ("{column}")'
+                    )
+            self._conn.execute(
+                f'CREATE INDEX IF NOT EXISTS "idx_{self.table}_updateTime" ON "{self.table}" (updateTime)'
+            )
+    
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+    
+    def _meta(self) -> Tuple[Optional[str], Optional[float]]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT watermark, synced_at FROM _mirror_meta WHERE entry_id = ?", (self.entry_id,)
+            ).fetchone()
+        return (row[0], row[1]) if row else (None, None)
+    
+    @property
+    def watermark(self) -> Optional[str]:
+        """已同步数据中最大的 updateTime"""
+        return self._meta()[0]
+    
+    @property
+    def synced_at(self) -> Optional[float]:
+        """上次同步完成的时间戳"""
+        return self._meta()[1]
+    
+    def _set_meta(self, watermark: Optional[str]) -> None:
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT INTO _mirror_meta (entry_id, watermark, synced_at) VALUES (?, ?, ?) "
+                "ON CONFLICT(entry_id) DO UPDATE SET watermark = excluded.watermark, "
+                "synced_at = excluded.synced_at",
+                (self.entry_id, watermark, time.time())
+            )
+    
+    def upsert_rows(self, rows: Iterable[Dict[str, Any]], newer_only: bool = False) -> int:
+        """写入或覆盖一批原始数据，返回提交的条数
+        
+        newer_only 时只覆盖 updateTime 不早于本地的记录（乱序到达的推送不会用旧数据覆盖新数据）。
+        """
+        columns = ['_id', 'createTime', 'updateTime', '_raw'] + self.columns
+        placeholders = ', '.join('?' for _ in columns)
+        column_sql = ', '.join(f'"{c}"' for c in columns)
+        if newer_only:
+            assignments = ', '.join(f'"{c}" = excluded."{c}"' for c in columns[1:])
+            sql = (f'INSERT INTO "{self.table}" ({column_sql}) VALUES ({placeholders}) '
+                   f'ON CONFLICT(_id) DO UPDATE SET {assignments} '
+                   f'WHERE excluded.updateTime IS NULL OR "{self.table}".updateTime IS NULL '
+                   f'OR excluded.updateTime >= "{self.table}".updateTime')
+        else:
+            sql = f'INSERT OR REPLACE INTO "{self.table}" ({column_sql}) VALUES ({placeholders})'
+
+        values = []
+        for row in rows:
+            if not row.get('_id'):
+                continue
+            values.append(
+                [row['_id'], row.get('createTime'), row.get('updateTime'),
+                 json.dumps(row, ensure_ascii=False)]
+                + [_column_value(row.get(column)) for column in self.columns]
+            )
+        if not values:
+            return 0
+        with self._lock, self._conn:
+            self._conn.executemany(sql, values)
+        return len(values)
+    
+    def delete_ids(self, data_ids: Iterable[str]) -> int:
+        """删除指定记录，返回删除条数"""
+        ids = [(data_id,) for data_id in data_ids]
+        with self._lock, self._conn:
+            cursor = self._conn.executemany(f'DELETE FROM "{self.table}" WHERE _id = ?', ids)
+        return cursor.rowcount
+    
+    def sync(self, full: bool = False, client: Optional[JDYClient] = None) -> int:
+        """从接口同步数据，返回拉取的条数
+        
+        增量同步只拉取 updateTime 不早于水位线的数据；
+        全量同步拉取全部数据，并删除远端已不存在的记录。
+        """
+        with self._sync_lock:
+            return self._sync(full, client or get_client())
+
+    def _sync(self, full: bool, client: JDYClient) -> int:
+        watermark = None if full else self.watermark
+        filters = None
+        if watermark:
+            filters = {
+                "rel": "and",
+                "cond": [{
+                    "field": "updateTime",
+                    "type": "datetime",
+                    "method": "range",
+                    "value": [watermark, None]
+                }]
+            }
+        
+        started = time.monotonic()
+        fetched = 0
+        seen = set() if full else None
+        new_watermark = watermark
+        for page in client.iter_pages(self.entry_id, filters=filters):
+            self.upsert_rows(page)
+            fetched += len(page)
+            for row in page:
+                if seen is not None:
+                    seen.add(row.get('_id'))
+                update_time = row.get('updateTime')
+                if update_time and (new_watermark is None or update_time > new_watermark):
+                    new_watermark = update_time
+        
+        if seen is not None:
+            with self._lock:
+                stale = [row[0] for row in self._conn.execute(f'SELECT _id FROM "{self.table}"')
+                         if row[0] not in seen]
+            self.delete_ids(stale)
+        
+        self._set_meta(new_watermark)
+        self.logger.info(f"{self.entry_id} 同步 {fetched} 条 ({'全量' if full else '增量'}) "
+                         f"耗时 {time.monotonic() - started:.2f}s")
+        return fetched
+    
+    def mark_fresh(self) -> bool:
+        """把已同步过的镜像标记为刚同步（由推送回调保持最新时调用），水位线不变
+        
+        从未同步的镜像不标记，首次读取时仍会全量同步。
+        """
+        watermark, synced_at = self._meta()
+        if synced_at is None:
+            return False
+        self._set_meta(watermark)
+        return True
+    
+    def ensure_fresh(self, max_age: float) -> None:
+        """镜像从未同步时全量同步，超过 max_age 秒未同步时增量同步"""
+        synced_at = self.synced_at
+        if synced_at is None:
+            self.sync(full=True)
+        elif time.time() - synced_at > max_age:
+            self.sync()
+    
+    def _where(self, conditions: Optional[Dict[str, Any]]) -> Tuple[str, List[Any]]:
+        if not conditions:
+            return "", []
+        clauses, params = [], []
+        for column, value in conditions.items():
+            if column not in self.fields.values() and column not in ('_id', 'createTime', 'updateTime'):
+                raise KeyError(f"镜像中没有字段 {column}")
+            clauses.append(f'"{column}" = ?')
+            params.append(_column_value(value))
+        return " WHERE " + " AND ".join(clauses), params
+    
+    def rows(self, conditions: Optional[Dict[str, Any]] = None,
+             batch_size: int = 1000) -> Iterator[Dict[str, Any]]:
+        """按等值条件（widget ID -> 值）读取原始数据"""
+        where, params = self._where(conditions)
+        connector = " AND " if where else " WHERE "
+        last_id = ""
+        # 按 _id 键集分页，每批单独加锁读取，遍历期间不长期占用连接
+        while True:
+            with self._lock:
+                batch = self._conn.execute(
+                    f'SELECT _id, _raw FROM "{self.table}"{where}{connector}_id > ? ORDER BY _id LIMIT ?',
+                    params + [last_id, batch_size]
+                ).fetchall()
+            for _, raw in batch:
+                yield json.loads(raw)
+            if len(batch) < batch_size:
+                return
+            last_id = batch[-1][0]
+    
+    def count(self, conditions: Optional[Dict[str, Any]] = None) -> int:
+        """按等值条件计数"""
+        where, params = self._where(conditions)
+        with self._lock:
+            return self._conn.execute(f'SELECT COUNT(*) FROM "{self.table}"{where}', params).fetchone()[0]
+
+    def group_counts(self, column: str, conditions: Optional[Dict[str, Any]] = None) -> List[Tuple[Any, int]]:
+        """按某一列分组计数，返回 [(列值, 条数)]；复选框等列表值为 JSON 字符串"""
+        if column not in self.columns:
+            raise KeyError(f"镜像中没有字段 {column}")
+        where, params = self._where(conditions)
+        with self._lock:
+            return self._conn.execute(
+                f'SELECT "{column}", COUNT(*) FROM "{self.table}"{where} GROUP BY "{column}"', params
+            ).fetchall()
+
+# 进程内共享的镜像实例，按 (db_path, entry_id) 区分
+_mirrors: Dict[Tuple[str, str], FormMirror] = {}
+_mirrors_lock = threading.Lock()
+
+def get_mirror(entry_id: str, fields: Dict[str, str], db_path: str = MIRROR_DB_PATH) -> FormMirror:
+    """获取指定表单共享的镜像实例"""
+    key = (db_path, entry_id)
+    mirror = _mirrors.get(key)
+    if mirror is None:
+        with _mirrors_lock:
+            mirror = _mirrors.get(key)
+            if mirror is None:
+                mirror = FormMirror(entry_id, fields, db_path)
+                _mirrors[key] = mirror
+    return mirror
@@ -0,0 +1,143 @@
+import logging
+import threading
+import time
+from typing import Dict, Optional
+from config.settings import RATE_LIMIT_QPS
+
+# 简道云各接口的默认频率上限（次/秒），未列出的接口只受应用级预算约束
+ENDPOINT_QPS = {
+    "/app/entry/widget/list": 30,
+    "/app/entry/data/list": 30,
+    "/app/entry/data/get": 30,
+    "/app/entry/data/create": 20,
+    "/app/entry/data/update": 20,
+    "/app/entry/data/delete": 20,
+    "/app/entry/data/batch_create": 10,
+    "/app/entry/data/batch_update": 10,
+    "/app/entry/data/batch_delete": 10,
+}
+
+# 表示“请求过于频繁”的业务错误码
+RATE_LIMIT_CODES = {8303}
+
+class TokenBucket:
+    """自适应令牌桶
+    
+    速率从 max_rate * initial_ratio 开始，每次成功请求线性提升，直到 max_rate；
+    遇到限流时速率减半，并在退避期内暂停发放令牌（AIMD）。
+    """
+    
+    def __init__(self, max_rate: float, initial_ratio: float = 0.5, min_rate: float = 1.0,
+                 ramp_requests: int = 20, backoff_base: float = 1.0, backoff_max: float = 30.0):
+        self.max_rate = float(max_rate)
+        self.min_rate = min(float(min_rate), self.max_rate)
+        self.rate = max(self.min_rate, self.max_rate * initial_ratio)
+        self.step = self.max_rate / max(1, ramp_requests)
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.tokens = 1.0
+        self.blocked_until = 0.0
+        self.consecutive_limited = 0
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+    
+    def _refill(self, now: float) -> None:
+        elapsed = now - self._updated
+        self._updated = now
+        # 令牌桶容量随当前速率变化，避免降速后仍有大量积压令牌
+        self.tokens = min(max(1.0, self.rate), self.tokens + elapsed * self.rate)
+    
+    def acquire(self) -> float:
+        """获取一个令牌，必要时阻塞等待；返回等待的秒数"""
+        waited = 0.0
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                if now < self.blocked_until:
+                    wait = self.blocked_until - now
+                else:
+                    self._refill(now)
+                    if self.tokens >= 1.0:
+                        self.tokens -= 1.0
+                        return waited
+                    wait = (1.0 - self.tokens) / self.rate
+            time.sleep(wait)
+            waited += wait
+    
+    def on_success(self) -> None:
+        """请求成功：逐步提升速率"""
+        with self._lock:
+            self.consecutive_limited = 0
+            if self.rate < self.max_rate:
+                self.rate = min(self.max_rate, self.rate + self.step)
+    
+    def on_rate_limited(self, retry_after: Optional[float] = None) -> float:
+        """被限流：速率减半并暂停发放令牌；返回退避秒数"""
+        with self._lock:
+            self.consecutive_limited += 1
+            self.rate = max(self.min_rate, self.rate / 2)
+            if retry_after is None:
+                retry_after = min(self.backoff_max,
+                                  self.backoff_base * 2 ** (self.consecutive_limited - 1))
+            now = time.monotonic()
+            self.blocked_until = max(self.blocked_until, now + retry_after)
+            self.tokens = 0.0
+            self._updated = now
+            return retry_after
+
+class RateLimiter:
+    """应用级 + 接口级两层令牌桶，可在多线程间共享"""
+    
+    def __init__(self, app_qps: float = RATE_LIMIT_QPS, endpoint_qps: Optional[Dict[str, float]] = None):
+        self.app_bucket = TokenBucket(app_qps)
+        self.endpoint_qps = dict(ENDPOINT_QPS if endpoint_qps is None else endpoint_qps)
+        self._buckets: Dict[str, TokenBucket] = {}
+        self._lock = threading.Lock()
+        self.logger = logging.getLogger("RateLimiter")
+    
+    def _endpoint_bucket(self, endpoint: str) -> Optional[TokenBucket]:
+        qps = self.endpoint_qps.get(endpoint)
+        if qps is None:
+            return None
+        bucket = self._buckets.get(endpoint)
+        if bucket is None:
+            with self._lock:
+                bucket = self._buckets.setdefault(endpoint, TokenBucket(qps))
+        return bucket
+    
+    def acquire(self, endpoint: str) -> float:
+        """请求前调用，按接口预算和应用预算依次获取令牌"""
+        waited = 0.0
+        bucket = self._endpoint_bucket(endpoint)
+        if bucket is not None:
+            waited += bucket.acquire()
+        waited += self.app_bucket.acquire()
+        return waited
+    
+    def on_success(self, endpoint: str) -> None:
+        bucket = self._endpoint_bucket(endpoint)
+        if bucket is not None:
+            bucket.on_success()
+        self.app_bucket.on_success()
+    
+    def on_rate_limited(self, endpoint: str, retry_after: Optional[float] = None) -> float:
+        """收到 429 或限流错误码时调用；返回退避秒数"""
+        bucket = self._endpoint_bucket(endpoint) or self.app_bucket
+        delay = bucket.on_rate_limited(retry_after)
+        self.logger.warning(f"{endpoint} 触发限流，退避 {delay:.2f}s，当前速率 {bucket.rate:.1f}/s")
+        return delay
+
+# 进程内共享的限流器，按 app_id 区分（同一应用的所有客户端共用预算）
+_limiters: Dict[str, RateLimiter] = {}
+_limiters_lock = threading.Lock()
+
+def get_rate_limiter(app_id: str, app_qps: float = RATE_LIMIT_QPS) -> RateLimiter:
+    """获取指定应用共享的限流器"""
+    limiter = _limiters.get(app_id)
+    if limiter is None:
+        with _limiters_lock:
+            limiter = _limiters.get(app_id)
+            if limiter is None:
+                limiter = RateLimiter(app_qps)
+                _limiters[app_id] = limiter
+    return limiter
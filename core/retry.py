@@ -0,0 +1,53 @@
+import random
+import time
+from typing import Iterable, Optional
+from config.settings import RETRY_MAX_ATTEMPTS, RETRY_BACKOFF_BASE, RETRY_BACKOFF_MAX, RETRY_DEADLINE
+from core.exceptions import JDYAPIError, JDYRateLimitError
+from core.lazy import lazy_import
+
+requests = lazy_import("requests")
+
+# 视为临时故障、可以重试的 HTTP 状态码
+RETRYABLE_STATUSES = {408, 429, 500, 502, 503, 504}
+
+class RetryPolicy:
+    """重试策略：带随机抖动的指数退避 + 最大次数 + 总耗时预算
+    
+    重试时原样重发同一个请求体，写接口的 transaction_id 保持不变，
+    由服务端按 transaction_id 去重，不会产生重复数据。
+    """
+    
+    def __init__(self, max_attempts: int = RETRY_MAX_ATTEMPTS, backoff_base: float = RETRY_BACKOFF_BASE,
+                 backoff_max: float = RETRY_BACKOFF_MAX, deadline: Optional[float] = RETRY_DEADLINE,
+                 retryable_statuses: Iterable[int] = RETRYABLE_STATUSES):
+        self.max_attempts = max(1, max_attempts)
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.deadline = deadline
+        self.retryable_statuses = set(retryable_statuses)
+    
+    def is_retryable(self, error: Exception) -> bool:
+        """判断异常是否为临时故障"""
+        if isinstance(error, JDYRateLimitError):
+            return True
+        if isinstance(error, JDYAPIError):
+            return error.status_code in self.retryable_statuses
+        return isinstance(error, (requests.ConnectionError, requests.Timeout))
+    
+    def backoff(self, attempt: int) -> float:
+        """第 attempt 次失败后的等待秒数（full jitter）"""
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * 2 ** (attempt - 1)))
+    
+    def next_delay(self, error: Exception, attempt: int, started: float) -> Optional[float]:
+        """返回下一次重试前的等待秒数；不应再重试时返回 None"""
+        if attempt >= self.max_attempts or not self.is_retryable(error):
+            return None
+        delay = self.backoff(attempt)
+        if isinstance(error, JDYRateLimitError) and error.retry_after is not None:
+            delay = max(delay, error.retry_after)
+        if self.deadline is not None and time.monotonic() - started + delay > self.deadline:
+            return None
+        return delay
+
+# 不重试的策略，用于需要调用方自行处理失败的场景
+NO_RETRY = RetryPolicy(max_attempts=1)
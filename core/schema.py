@@ -0,0 +1,200 @@
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, Optional, List, Iterable
+from core.api_client import JDYClient, get_client
+from config.settings import SCHEMA_CACHE_PATH, SCHEMA_CACHE_TTL
+
+# 模型字段类型 -> 兼容的简道云控件类型
+COMPATIBLE_WIDGET_TYPES = {
+    "number": {"number"},
+    "int": {"number"},
+    "date": {"datetime"},
+    "datetime": {"datetime"},
+    "list": {"checkboxgroup", "combocheck"},
+}
+
+def schema_hash(widgets: List[Dict[str, Any]]) -> str:
+    """字段列表的版本哈希（只看 widget ID、名称和类型，与顺序无关）"""
+    canonical = sorted((w.get('name', ''), w.get('label', ''), w.get('type', '')) for w in widgets)
+    return hashlib.sha256(json.dumps(canonical, ensure_ascii=False).encode('utf-8')).hexdigest()[:16]
+
+class FormSchema:
+    """一个表单的字段列表"""
+
+    def __init__(self, entry_id: str, widgets: List[Dict[str, Any]],
+                 fetched_at: Optional[float] = None, version: Optional[str] = None):
+        self.entry_id = entry_id
+        self.widgets = widgets
+        self.fetched_at = fetched_at or time.time()
+        self.version = version or schema_hash(widgets)
+        self.by_id = {w.get('name'): w for w in widgets}
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"widgets": self.widgets, "fetched_at": self.fetched_at, "version": self.version}
+
+class SchemaDrift:
+    """模型 FIELD_* 映射与表单实际字段的差异"""
+
+    def __init__(self, form_name: str, entry_id: str, version: str,
+                 previous_version: Optional[str] = None):
+        self.form_name = form_name
+        self.entry_id = entry_id
+        self.version = version
+        self.previous_version = previous_version
+        self.widget_count = 0
+        self.missing: Dict[str, str] = {}          # 模型中有、表单中没有：字段名 -> widget ID
+        self.unmapped: Dict[str, str] = {}         # 表单中有、模型中没有：widget ID -> 标题
+        self.type_mismatch: Dict[str, tuple] = {}  # 字段名 -> (模型类型, 控件类型)
+        self.error: Optional[str] = None
+
+    @property
+    def changed(self) -> bool:
+        """与上次缓存的版本相比表单字段是否有变化"""
+        return self.previous_version is not None and self.previous_version != self.version
+
+    def __bool__(self) -> bool:
+        """存在会导致读写出错的差异（缺失字段、类型不符或无法获取）时为 True"""
+        return bool(self.missing or self.type_mismatch or self.error)
+
+    def __repr__(self) -> str:
+        return (f"SchemaDrift({self.form_name}, missing={len(self.missing)}, "
+                f"unmapped={len(self.unmapped)}, type_mismatch={len(self.type_mismatch)})")
+
+class SchemaRegistry:
+    """表单字段注册表
+
+    字段列表只在缓存缺失或超过 max_age 秒时请求接口，结果连同版本哈希写入磁盘，
+    跨进程复用；多个表单并行获取。
+    """
+
+    def __init__(self, path: str = SCHEMA_CACHE_PATH, max_age: float = SCHEMA_CACHE_TTL,
+                 client: Optional[JDYClient] = None):
+        self.path = path
+        self.max_age = max_age
+        self.client = client
+        self.logger = logging.getLogger("SchemaRegistry")
+        self._lock = threading.Lock()
+        self._schemas: Dict[str, FormSchema] = {}
+        # 载入时磁盘上的版本，用于判断表单是否变化
+        self._disk_versions: Dict[str, str] = {}
+        self._load()
+
+    def _load(self) -> None:
+        try:
+            with open(self.path, encoding='utf-8') as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return
+        except (OSError, ValueError) as e:
+            self.logger.warning(f"字段缓存 {self.path} 无法读取，将重新获取: {e}")
+            return
+        for entry_id, item in data.items():
+            schema = FormSchema(entry_id, item['widgets'], item.get('fetched_at'), item.get('version'))
+            self._schemas[entry_id] = schema
+            self._disk_versions[entry_id] = schema.version
+
+    def _save(self) -> None:
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with self._lock:
+            data = {entry_id: schema.to_dict() for entry_id, schema in self._schemas.items()}
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, self.path)
+
+    def _fresh(self, schema: Optional[FormSchema]) -> bool:
+        return schema is not None and time.time() - schema.fetched_at <= self.max_age
+
+    def _fetch(self, entry_id: str) -> FormSchema:
+        client = self.client or get_client()
+        widgets = client.get_form_widgets(entry_id).get('widgets', [])
+        schema = FormSchema(entry_id, widgets)
+        with self._lock:
+            old = self._schemas.get(entry_id)
+            self._schemas[entry_id] = schema
+        if old is not None and old.version != schema.version:
+            self.logger.warning(f"表单 {entry_id} 的字段已变化: {old.version} -> {schema.version}")
+        return schema
+
+    def get(self, entry_id: str, refresh: bool = False) -> FormSchema:
+        """获取单个表单的字段（优先读缓存）"""
+        return self.get_many([entry_id], refresh=refresh)[entry_id]
+
+    def get_many(self, entry_ids: Iterable[str], refresh: bool = False,
+                 concurrency: int = 4) -> Dict[str, FormSchema]:
+        """获取多个表单的字段；需要请求的表单并行获取，完成后统一写一次磁盘缓存"""
+        entry_ids = list(dict.fromkeys(entry_ids))
+        stale = [e for e in entry_ids if refresh or not self._fresh(self._schemas.get(e))]
+        if stale:
+            with ThreadPoolExecutor(max_workers=min(concurrency, len(stale))) as executor:
+                list(executor.map(self._fetch, stale))
+            self._save()
+        return {entry_id: self._schemas[entry_id] for entry_id in entry_ids}
+
+    def previous_version(self, entry_id: str) -> Optional[str]:
+        """载入时磁盘缓存中的版本"""
+        return self._disk_versions.get(entry_id)
+
+    def check_models(self, models: Iterable[Any], refresh: bool = False) -> List[SchemaDrift]:
+        """一次（并行）获取所有模型的表单字段，逐个比对 FIELD_* 映射和 FIELD_TYPES"""
+        models = list(models)
+        reports = []
+        try:
+            schemas = self.get_many([m.ENTRY_ID for m in models], refresh=refresh)
+        except Exception:
+            # 批量获取失败时逐个获取，定位出错的表单
+            schemas = {}
+            for model in models:
+                try:
+                    schemas[model.ENTRY_ID] = self.get(model.ENTRY_ID, refresh=refresh)
+                except Exception as single_error:
+                    self.logger.error(f"{model.FORM_NAME} 字段获取失败: {single_error}")
+
+        for model in models:
+            schema = schemas.get(model.ENTRY_ID)
+            if schema is None:
+                report = SchemaDrift(model.FORM_NAME, model.ENTRY_ID, "")
+                report.error = "无法获取表单字段"
+                reports.append(report)
+                continue
+            reports.append(self._compare(model, schema))
+        return reports
+
+    def _compare(self, model: Any, schema: FormSchema) -> SchemaDrift:
+        report = SchemaDrift(model.FORM_NAME, model.ENTRY_ID, schema.version,
+                             self.previous_version(model.ENTRY_ID))
+        report.widget_count = len(schema.widgets)
+        field_map = model.field_map()
+        field_types = getattr(model, 'FIELD_TYPES', {})
+        for name, widget_id in field_map.items():
+            widget = schema.by_id.get(widget_id)
+            if widget is None:
+                report.missing[name] = widget_id
+                continue
+            compatible = COMPATIBLE_WIDGET_TYPES.get(field_types.get(name))
+            if compatible and widget.get('type') not in compatible:
+                report.type_mismatch[name] = (field_types[name], widget.get('type'))
+        mapped = set(field_map.values())
+        for widget_id, widget in schema.by_id.items():
+            if widget_id not in mapped:
+                report.unmapped[widget_id] = widget.get('label', '')
+        return report
+
+_registry: Optional[SchemaRegistry] = None
+_registry_lock = threading.Lock()
+
+def get_schema_registry() -> SchemaRegistry:
+    """进程内共享的字段注册表"""
+    global _registry
+    if _registry is None:
+        with _registry_lock:
+            if _registry is None:
+                _registry = SchemaRegistry()
+    return _registry
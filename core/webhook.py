@@ -0,0 +1,187 @@
+import hashlib
+import hmac
+import json
+import logging
+import threading
+from collections import Counter, defaultdict
+from typing import Dict, Any, Optional, List, Iterable, Mapping, Tuple
+from urllib.parse import urlsplit, parse_qsl
+from core.cache import TTLCache
+from core.encoding import loads
+from config.settings import WEBHOOK_SECRET, WEBHOOK_HOST, WEBHOOK_PORT, WEBHOOK_DEDUP_TTL
+
+# 推送类型：写入/覆盖本地数据 与 删除本地数据
+UPSERT_OPS = {"data_create", "data_update", "data_recover"}
+REMOVE_OPS = {"data_remove", "data_batch_remove"}
+
+def sign(body: bytes, nonce: str, timestamp: str, secret: str) -> str:
+    """简道云推送签名：sha1("{nonce}:{body}:{secret}:{timestamp}") 的十六进制"""
+    content = f"{nonce}:{body.decode('utf-8')}:{secret}:{timestamp}"
+    return hashlib.sha1(content.encode('utf-8')).hexdigest()
+
+def verify_signature(body: bytes, nonce: str, timestamp: str, signature: str, secret: str) -> bool:
+    """校验推送签名（常量时间比较）"""
+    if not (nonce and timestamp and signature):
+        return False
+    return hmac.compare_digest(sign(body, nonce, timestamp, secret), signature)
+
+class WebhookHandler:
+    """把数据推送事件应用到本地缓存和镜像
+
+    - 配置了密钥时校验签名，不通过返回 401；
+    - 按 X-JDY-DeliverId（没有时按报文哈希）去重，重复推送直接返回成功；
+    - 新增/修改：写入镜像（只覆盖更新时间不早于本地的记录）并刷新 get_data 缓存；
+      删除：从镜像和缓存中删除；
+    - 处理失败返回 500，简道云会重新推送。
+
+    应用推送后镜像会被标记为刚同步，模型查询读镜像时不再发起增量同步。
+    """
+
+    def __init__(self, models: Iterable[Any], secret: str = WEBHOOK_SECRET, client=None,
+                 use_mirror: Optional[bool] = None, dedup_ttl: float = WEBHOOK_DEDUP_TTL,
+                 dedup_max_entries: int = 100000):
+        self.models = {model.ENTRY_ID: model for model in models}
+        self.secret = secret
+        self.client = client
+        self.use_mirror = use_mirror
+        self.seen = TTLCache(dedup_max_entries, dedup_ttl)
+        self.stats: Counter = Counter()
+        self.logger = logging.getLogger("WebhookHandler")
+        self._lock = threading.Lock()
+
+    def _client(self, model):
+        return self.client or model._client()
+
+    def handle(self, body: bytes, headers: Mapping[str, str],
+               query: Optional[Mapping[str, str]] = None) -> Tuple[int, str]:
+        """处理一次推送，返回 (HTTP 状态码, 说明)"""
+        headers = {k.lower(): v for k, v in headers.items()}
+        query = query or {}
+        if self.secret and not verify_signature(body, query.get('nonce', ''), query.get('timestamp', ''),
+                                                headers.get('x-jdy-signature', ''), self.secret):
+            self.stats['rejected'] += 1
+            return 401, "签名错误"
+        try:
+            event = loads(body)
+        except ValueError:
+            self.stats['invalid'] += 1
+            return 400, "报文不是 JSON"
+
+        delivery_id = headers.get('x-jdy-deliverid') or hashlib.sha1(body).hexdigest()
+        with self._lock:
+            if self.seen.get(delivery_id):
+                self.stats['duplicate'] += 1
+                return 200, "重复推送"
+            self.seen.set(delivery_id, True)
+
+        try:
+            applied = self.apply(event)
+        except Exception as e:
+            # 允许简道云重新推送
+            self.seen.invalidate(delivery_id)
+            self.stats['failed'] += 1
+            self.logger.error(f"推送 {delivery_id} 处理失败: {e}")
+            return 500, "处理失败"
+        self.stats['applied' if applied else 'ignored'] += 1
+        return 200, "ok"
+
+    def apply(self, event: Dict[str, Any]) -> int:
+        """应用一个推送事件，返回处理的记录数（非数据推送或未登记的表单返回 0）"""
+        op = event.get('op')
+        if op not in UPSERT_OPS and op not in REMOVE_OPS:
+            return 0
+        data = event.get('data')
+        rows = data if isinstance(data, list) else [data]
+
+        by_entry: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
+        for row in rows:
+            if isinstance(row, dict) and row.get('_id'):
+                by_entry[row.get('entryId') or event.get('entryId')].append(row)
+
+        applied = 0
+        for entry_id, entry_rows in by_entry.items():
+            model = self.models.get(entry_id)
+            if model is None:
+                continue
+            if op in REMOVE_OPS:
+                self._remove(model, entry_rows)
+            else:
+                self._upsert(model, entry_rows)
+            applied += len(entry_rows)
+        return applied
+
+    def _mirror(self, model):
+        enabled = model.USE_MIRROR if self.use_mirror is None else self.use_mirror
+        return model.mirror() if enabled else None
+
+    def _upsert(self, model, rows: List[Dict[str, Any]]) -> None:
+        mirror = self._mirror(model)
+        if mirror is not None:
+            mirror.upsert_rows(rows, newer_only=True)
+            mirror.mark_fresh()
+        cache = self._client(model).cache
+        if cache is None:
+            return
+        for row in rows:
+            key = (model.ENTRY_ID, row['_id'])
+            cached = cache.get(key)
+            cached_time = (cached or {}).get('data', {}).get('updateTime') or ''
+            if cached_time and (row.get('updateTime') or '') < cached_time:
+                continue
+            cache.set(key, {"data": row})
+
+    def _remove(self, model, rows: List[Dict[str, Any]]) -> None:
+        data_ids = [row['_id'] for row in rows]
+        mirror = self._mirror(model)
+        if mirror is not None:
+            mirror.delete_ids(data_ids)
+            mirror.mark_fresh()
+        self._client(model)._invalidate(model.ENTRY_ID, data_ids)
+
+def start_webhook_server(handler: WebhookHandler, port: int = WEBHOOK_PORT, host: str = WEBHOOK_HOST,
+                         path: str = "/webhook", record_path: Optional[str] = None):
+    """在后台线程中启动推送接收服务
+
+    POST {path} 接收推送；GET {path} 返回处理统计。
+    record_path 不为空时把每次收到的推送（报文、请求头、查询参数）追加到该 JSONL 文件，可用于回放。
+    """
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+    record_lock = threading.Lock()
+
+    class Handler(BaseHTTPRequestHandler):
+        def _reply(self, status: int, body: Dict[str, Any]) -> None:
+            data = json.dumps(body, ensure_ascii=False).encode('utf-8')
+            self.send_response(status)
+            self.send_header('Content-Type', 'application/json; charset=utf-8')
+            self.send_header('Content-Length', str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def do_GET(self):
+            if urlsplit(self.path).path != path:
+                self.send_error(404)
+                return
+            self._reply(200, dict(handler.stats))
+
+        def do_POST(self):
+            url = urlsplit(self.path)
+            if url.path != path:
+                self.send_error(404)
+                return
+            body = self.rfile.read(int(self.headers.get('Content-Length') or 0))
+            query = dict(parse_qsl(url.query))
+            headers = dict(self.headers.items())
+            if record_path:
+                record = {"body": body.decode('utf-8', 'replace'), "headers": headers, "query": query}
+                with record_lock, open(record_path, 'a', encoding='utf-8') as f:
+                    f.write(json.dumps(record, ensure_ascii=False) + '\n')
+            status, message = handler.handle(body, headers, query)
+            self._reply(status, {"message": message})
+
+        def log_message(self, format, *args):
+            pass
+
+    httpd = ThreadingHTTPServer((host, port), Handler)
+    httpd.daemon_threads = True
+    threading.Thread(target=httpd.serve_forever, daemon=True).start()
+    return httpd
@@ -0,0 +1,228 @@
+import atexit
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict, Any, Optional, List, Callable, Tuple
+from core.batch import BatchResult
+from config.settings import (
+    WRITE_BEHIND_SPOOL_PATH, WRITE_BEHIND_BATCH_SIZE,
+    WRITE_BEHIND_FLUSH_INTERVAL, WRITE_BEHIND_MAX_ATTEMPTS
+)
+
+class WriteBehindQueue:
+    """单个表单的写入队列（write-behind）
+
+    put() 把 widget ID -> 值 的更新写入本地 SQLite 队列后立即返回；同一条记录尚未提交的
+    多次更新合并为一条（后写的字段覆盖先写的）。后台线程在积累到 batch_size 条或
+    距上次提交超过 flush_interval 秒时，调用 send（记录ID -> 字段值，返回 BatchResult）批量提交。
+
+    队列落盘（WAL），进程在提交前退出也不会丢失，下次启动时继续提交。
+    提交失败的记录留在队列中重试，失败 max_attempts 次后移入失败表，可用 failed() 查看。
+    """
+
+    def __init__(self, entry_id: str, send: Callable[[Dict[str, Dict[str, Any]]], BatchResult],
+                 spool_path: str = WRITE_BEHIND_SPOOL_PATH, batch_size: int = WRITE_BEHIND_BATCH_SIZE,
+                 flush_interval: float = WRITE_BEHIND_FLUSH_INTERVAL,
+                 max_attempts: int = WRITE_BEHIND_MAX_ATTEMPTS):
+        self.entry_id = entry_id
+        self.send = send
+        self.spool_path = spool_path
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_attempts = max_attempts
+        self.logger = logging.getLogger("WriteBehindQueue")
+        self._lock = threading.RLock()
+        self._flush_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._worker: Optional[threading.Thread] = None
+        self._queued = 0
+
+        directory = os.path.dirname(spool_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._conn = sqlite3.connect(spool_path, check_same_thread=False, timeout=30)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        with self._conn:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS pending ("
+                "entry_id TEXT, data_id TEXT, data TEXT NOT NULL, version INTEGER NOT NULL, "
+                "attempts INTEGER NOT NULL DEFAULT 0, last_error TEXT, queued_at REAL, "
+                "PRIMARY KEY (entry_id, data_id))"
+            )
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS failed ("
+                "entry_id TEXT, data_id TEXT, data TEXT NOT NULL, attempts INTEGER, "
+                "last_error TEXT, failed_at REAL)"
+            )
+
+    def put(self, data_id: str, data: Dict[str, Any]) -> None:
+        """把一条记录的更新写入队列（与队列中尚未提交的更新合并）"""
+        with self._lock, self._conn:
+            row = self._conn.execute(
+                "SELECT data, version FROM pending WHERE entry_id = ? AND data_id = ?",
+                (self.entry_id, data_id)
+            ).fetchone()
+            if row:
+                merged = dict(json.loads(row[0]), **data)
+                self._conn.execute(
+                    "UPDATE pending SET data = ?, version = ? WHERE entry_id = ? AND data_id = ?",
+                    (json.dumps(merged, ensure_ascii=False), row[1] + 1, self.entry_id, data_id)
+                )
+            else:
+                self._conn.execute(
+                    "INSERT INTO pending (entry_id, data_id, data, version, queued_at) VALUES (?, ?, ?, 1, ?)",
+                    (self.entry_id, data_id, json.dumps(data, ensure_ascii=False), time.time())
+                )
+                self._queued += 1
+        if self._queued >= self.batch_size:
+            self._wake.set()
+
+    def pending(self, data_id: str) -> Optional[Dict[str, Any]]:
+        """某条记录尚未提交的字段值（没有时返回 None）"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT data FROM pending WHERE entry_id = ? AND data_id = ?", (self.entry_id, data_id)
+            ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute(
+                "SELECT COUNT(*) FROM pending WHERE entry_id = ?", (self.entry_id,)
+            ).fetchone()[0]
+
+    def failed(self) -> List[Dict[str, Any]]:
+        """多次提交失败、已移出队列的更新"""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT data_id, data, attempts, last_error, failed_at FROM failed WHERE entry_id = ?",
+                (self.entry_id,)
+            ).fetchall()
+        return [{"data_id": r[0], "data": json.loads(r[1]), "attempts": r[2],
+                 "last_error": r[3], "failed_at": r[4]} for r in rows]
+
+    def _take(self, limit: int) -> List[Tuple[str, Dict[str, Any], int, int]]:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT data_id, data, version, attempts FROM pending WHERE entry_id = ? "
+                "ORDER BY queued_at LIMIT ?", (self.entry_id, limit)
+            ).fetchall()
+        return [(r[0], json.loads(r[1]), r[2], r[3]) for r in rows]
+
+    def _send(self, batch: List[Tuple[str, Dict[str, Any], int, int]]) -> Dict[int, str]:
+        """提交一批更新，返回 下标 -> 失败原因
+        
+        批量接口中一条记录出错会导致整块失败，因此失败过的记录逐条单独重试，
+        避免一条无效记录连累同一块中的其他记录。
+        """
+        errors: Dict[int, str] = {}
+        fresh = [i for i, item in enumerate(batch) if item[3] == 0]
+        if fresh:
+            result = self.send({batch[i][0]: batch[i][1] for i in fresh})
+            for index, reason in result.errors.items():
+                errors[fresh[index]] = reason
+        for i, (data_id, data, _, attempts) in enumerate(batch):
+            if attempts:
+                result = self.send({data_id: data})
+                if result.errors:
+                    errors[i] = result.errors[0]
+        return errors
+    
+    def flush(self) -> Dict[str, int]:
+        """立即提交队列中的全部更新，返回 {"sent", "failed", "dropped"}"""
+        stats = {"sent": 0, "failed": 0, "dropped": 0}
+        with self._flush_lock:
+            self._queued = 0
+            # 本轮已失败的记录不再重复提交，留待下一次定时提交重试
+            skip = set()
+            while True:
+                batch = [item for item in self._take(self.batch_size * 10 + len(skip)) if item[0] not in skip]
+                if not batch:
+                    return stats
+                errors = self._send(batch)
+                with self._lock, self._conn:
+                    for index, (data_id, data, version, attempts) in enumerate(batch):
+                        key = (self.entry_id, data_id, version)
+                        if index not in errors:
+                            # 提交期间又有新的更新时 version 已变化，保留等下一次提交
+                            self._conn.execute(
+                                "DELETE FROM pending WHERE entry_id = ? AND data_id = ? AND version = ?", key)
+                            stats["sent"] += 1
+                            continue
+                        reason = errors[index]
+                        skip.add(data_id)
+                        stats["failed"] += 1
+                        if attempts + 1 >= self.max_attempts:
+                            self._conn.execute(
+                                "INSERT INTO failed (entry_id, data_id, data, attempts, last_error, failed_at) "
+                                "VALUES (?, ?, ?, ?, ?, ?)",
+                                (self.entry_id, data_id, json.dumps(data, ensure_ascii=False),
+                                 attempts + 1, reason, time.time())
+                            )
+                            self._conn.execute(
+                                "DELETE FROM pending WHERE entry_id = ? AND data_id = ? AND version = ?", key)
+                            stats["dropped"] += 1
+                            self.logger.error(f"{self.entry_id}/{data_id} 提交失败 {attempts + 1} 次，已移入失败表: {reason}")
+                        else:
+                            self._conn.execute(
+                                "UPDATE pending SET attempts = attempts + 1, last_error = ? "
+                                "WHERE entry_id = ? AND data_id = ?", (reason, self.entry_id, data_id))
+
+    def start(self) -> "WriteBehindQueue":
+        """启动后台提交线程（进程退出时自动提交剩余更新）"""
+        with self._lock:
+            if self._worker is None:
+                self._stop.clear()
+                self._worker = threading.Thread(target=self._run, name=f"write-behind-{self.entry_id}",
+                                                daemon=True)
+                self._worker.start()
+                atexit.register(self.stop)
+        return self
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            if self._stop.is_set():
+                break
+            try:
+                self.flush()
+            except Exception as e:
+                self.logger.error(f"{self.entry_id} 提交队列失败，稍后重试: {e}")
+
+    def stop(self, flush: bool = True) -> None:
+        """停止后台线程；flush 时先提交剩余更新"""
+        with self._lock:
+            worker, self._worker = self._worker, None
+        if worker is not None:
+            self._stop.set()
+            self._wake.set()
+            worker.join()
+            atexit.unregister(self.stop)
+        if flush:
+            try:
+                self.flush()
+            except Exception as e:
+                self.logger.error(f"{self.entry_id} 退出前提交失败，剩余更新保留在 {self.spool_path}: {e}")
+
+# 进程内共享的队列，按 (spool_path, entry_id) 区分
+_queues: Dict[Tuple[str, str], WriteBehindQueue] = {}
+_queues_lock = threading.Lock()
+
+def get_write_behind(entry_id: str, send: Callable[[Dict[str, Dict[str, Any]]], BatchResult],
+                     spool_path: str = WRITE_BEHIND_SPOOL_PATH) -> WriteBehindQueue:
+    """获取指定表单共享的写入队列（首次获取时启动后台线程）"""
+    key = (spool_path, entry_id)
+    queue = _queues.get(key)
+    if queue is None:
+        with _queues_lock:
+            queue = _queues.get(key)
+            if queue is None:
+                queue = WriteBehindQueue(entry_id, send, spool_path).start()
+                _queues[key] = queue
+    return queue
@@ -0,0 +1,221 @@
+import heapq
+import logging
+from datetime import date, datetime
+from typing import Dict, Any, Optional, List, Iterable, Tuple
+
+# 可服务时段 -> 时间范围（小时，左闭右开），与义工表「可服务时段」选项一致
+TIME_SLOTS = {
+    "上午": (8.0, 12.0),
+    "下午": (12.0, 16.5),
+    "晚上": (19.0, 21.0),
+}
+
+# 活动没有填写起止时间时按 09:00-17:00 处理
+DEFAULT_EVENT_HOURS = (9.0, 17.0)
+
+# 可以参与排班的义工状态（未填写状态的义工也视为可排班）
+ACTIVE_STATUSES = ("活跃",)
+
+# 不再需要排班的活动状态
+CLOSED_EVENT_STATUSES = ("已完成", "已取消")
+
+def _hour(value: datetime) -> float:
+    return value.hour + value.minute / 60
+
+def event_slots(event) -> List[str]:
+    """活动占用的时段（与活动起止时间有重叠的时段）"""
+    if event.start_time and event.end_time:
+        start, end = _hour(event.start_time), _hour(event.end_time)
+    else:
+        start, end = DEFAULT_EVENT_HOURS
+    return [slot for slot, (low, high) in TIME_SLOTS.items() if start < high and end > low]
+
+def event_day(event) -> Optional[date]:
+    if event.event_date:
+        return event.event_date.date() if isinstance(event.event_date, datetime) else event.event_date
+    if event.start_time:
+        return event.start_time.date()
+    return None
+
+def upcoming_events(events: Iterable[Any], today: Optional[date] = None) -> List[Any]:
+    """今天及以后、未结束/未取消的活动"""
+    today = today or date.today()
+    result = []
+    for event in events:
+        day = event_day(event)
+        if event.status in CLOSED_EVENT_STATUSES or (day is not None and day < today):
+            continue
+        result.append(event)
+    return result
+
+def _bits(mask: int) -> Iterable[int]:
+    """位图中为 1 的下标"""
+    while mask:
+        low = mask & -mask
+        yield low.bit_length() - 1
+        mask ^= low
+
+class Assignment:
+    """一条排班：义工 + 活动"""
+    __slots__ = ("volunteer", "event")
+
+    def __init__(self, volunteer, event):
+        self.volunteer = volunteer
+        self.event = event
+
+    def __repr__(self) -> str:
+        return f"Assignment({self.volunteer.name} -> {self.event.event_name})"
+
+class AssignmentEngine:
+    """按技能、可服务时段和常住区域为活动分配义工
+
+    义工按下标编号，技能、时段、状态各建一张倒排索引（取值 -> 位图，Python int 的每一位对应一名义工），
+    一个活动的候选人即若干位图的与/或运算，再去掉同一天同一时段已有排班、已达排班上限的义工。
+
+    分配时一次处理全部活动：先排候选人最紧张的活动（候选人数 / 需要人数 最小），
+    每个活动从候选人中优先选已排班次数少、区域匹配、技能匹配多的义工；
+    人数不足的活动再尝试一步调换（把已排到别的活动的合适义工换过来，由其他候选人顶替原活动）。
+
+    - 技能：活动「所需技能」非空时，义工至少具备其中一项（require_skills=False 时只作为优先条件）；
+    - 时段：义工「可服务时段」须覆盖活动占用的全部时段；未填写可服务时段的义工不参与排班；
+    - 区域：活动地点在 location_areas 中对应到区域时，同区域义工优先（不作为硬性条件）。
+    """
+
+    def __init__(self, volunteers: Iterable[Any], max_per_volunteer: int = 3,
+                 require_skills: bool = True, location_areas: Optional[Dict[str, str]] = None):
+        self.volunteers = [v for v in volunteers
+                           if v.name and v.phone and (v.status is None or v.status in ACTIVE_STATUSES)]
+        self.max_per_volunteer = max_per_volunteer
+        self.require_skills = require_skills
+        self.location_areas = dict(location_areas or {})
+        self.logger = logging.getLogger("AssignmentEngine")
+
+        # 倒排索引：取值 -> 义工位图
+        self.skill_index: Dict[str, int] = {}
+        self.slot_index: Dict[str, int] = {}
+        self.area_index: Dict[str, int] = {}
+        for i, volunteer in enumerate(self.volunteers):
+            bit = 1 << i
+            for skill in volunteer.skills or ():
+                self.skill_index[skill] = self.skill_index.get(skill, 0) | bit
+            for slot in volunteer.available_time or ():
+                self.slot_index[slot] = self.slot_index.get(slot, 0) | bit
+            if volunteer.area:
+                self.area_index[volunteer.area] = self.area_index.get(volunteer.area, 0) | bit
+        self.all_mask = (1 << len(self.volunteers)) - 1
+
+    def eligible(self, event) -> int:
+        """满足技能和时段要求的义工位图（不考虑已有排班）"""
+        mask = self.all_mask
+        for slot in event_slots(event):
+            mask &= self.slot_index.get(slot, 0)
+        if self.require_skills and event.required_skills:
+            skilled = 0
+            for skill in event.required_skills:
+                skilled |= self.skill_index.get(skill, 0)
+            mask &= skilled
+        return mask
+
+    def assign(self, events: Iterable[Any]) -> Tuple[List[Assignment], List[Tuple[Any, int]]]:
+        """为全部活动分配义工，返回 (排班列表, [(人数不足的活动, 缺少人数)])"""
+        events = [e for e in events if (e.required_volunteers or 0) > 0]
+        volunteers = self.volunteers
+        keys = [(event_day(e), tuple(event_slots(e))) for e in events]
+        eligible = [self.eligible(e) for e in events]
+        need = [e.required_volunteers for e in events]
+
+        busy: Dict[Tuple[Optional[date], str], int] = {}   # (日期, 时段) -> 已排班义工位图
+        full = 0                                           # 已达排班上限的义工位图
+        load = [0] * len(volunteers)                       # 每名义工已排班次数
+        members: List[int] = [0] * len(events)             # 每个活动已排的义工位图
+
+        area_masks = []
+        skill_masks = []
+        for event in events:
+            area = self.location_areas.get(event.location)
+            area_masks.append(self.area_index.get(area, 0) if area else 0)
+            skill_masks.append([self.skill_index.get(s, 0) for s in event.required_skills or ()])
+
+        def free(index: int) -> int:
+            day, slots = keys[index]
+            mask = eligible[index] & ~full & ~members[index]
+            for slot in slots:
+                mask &= ~busy.get((day, slot), 0)
+            return mask
+
+        def place(v: int, index: int) -> None:
+            nonlocal full
+            day, slots = keys[index]
+            bit = 1 << v
+            for slot in slots:
+                busy[(day, slot)] = busy.get((day, slot), 0) | bit
+            members[index] |= bit
+            load[v] += 1
+            if load[v] >= self.max_per_volunteer:
+                full |= bit
+
+        def unplace(v: int, index: int) -> None:
+            nonlocal full
+            day, slots = keys[index]
+            bit = 1 << v
+            for slot in slots:
+                busy[(day, slot)] &= ~bit
+            members[index] &= ~bit
+            load[v] -= 1
+            full &= ~bit
+
+        def score(v: int, index: int) -> Tuple[int, int, int]:
+            bit = 1 << v
+            skills = sum(1 for mask in skill_masks[index] if mask & bit)
+            return (load[v], 0 if area_masks[index] & bit else 1, -skills)
+
+        # 候选人越紧张的活动越先排
+        order = sorted(range(len(events)),
+                       key=lambda i: bin(eligible[i]).count('1') / need[i])
+        for index in order:
+            picks = heapq.nsmallest(need[index], _bits(free(index)), key=lambda v: score(v, index))
+            for v in picks:
+                place(v, index)
+
+        # 人数不足的活动：把别处的合适义工换过来，由其他候选人顶替原活动
+        events_of: Dict[int, List[int]] = {}
+        for index in range(len(events)):
+            for v in _bits(members[index]):
+                events_of.setdefault(v, []).append(index)
+        for index in order:
+            short = need[index] - bin(members[index]).count('1')
+            if short <= 0:
+                continue
+            day, slots = keys[index]
+            for v in _bits(eligible[index] & ~members[index]):
+                if short <= 0:
+                    break
+                bit = 1 << v
+                clashes = [other for other in events_of.get(v, ())
+                           if (keys[other][0] == day and set(keys[other][1]) & set(slots))
+                           or load[v] >= self.max_per_volunteer]
+                if len(clashes) != 1:
+                    continue
+                other = clashes[0]
+                unplace(v, other)
+                substitutes = free(other) & ~bit
+                if not substitutes or not free(index) & bit:
+                    place(v, other)
+                    continue
+                w = min(_bits(substitutes), key=lambda u: score(u, other))
+                place(w, other)
+                place(v, index)
+                events_of[v].remove(other)
+                events_of[v].append(index)
+                events_of.setdefault(w, []).append(other)
+                short -= 1
+
+        assignments = []
+        shortfall = []
+        for index, event in enumerate(events):
+            for v in _bits(members[index]):
+                assignments.append(Assignment(volunteers[v], event))
+            missing = need[index] - bin(members[index]).count('1')
+            if missing > 0:
+                shortfall.append((event, missing))
+        return assignments, shortfall
@@ -0,0 +1,286 @@
+from __future__ import annotations
+
+from core.api_client import get_client
+from core.batch import BatchResult
+from core.encoding import register_encoder
+from core.lazy import lazy_import
+from core.mirror import FormMirror, get_mirror
+from config import settings
+from config.settings import MIRROR_ENABLED, MIRROR_MAX_AGE, WRITE_BEHIND_ENABLED
+from models.decoding import unwrap_value, decode_frame, concat_frames
+import json
+from collections import Counter
+from typing import Dict, Any, Optional, List, Iterator
+
+# pandas 只在返回 DataFrame 的方法中用到，首次调用时才导入
+pd = lazy_import("pandas")
+
+class EntrySetting:
+    """在首次访问时才从配置读取的 ENTRY_ID
+
+    未配置的表单只有真正被用到时才报错，不影响只用到其他表单的脚本。
+    """
+    
+    def __init__(self, name: str):
+        self.name = name
+    
+    def __get__(self, instance, owner) -> str:
+        return settings.require(self.name)
+
+class BaseModel:
+    """表单模型公共逻辑"""
+    FORM_NAME = ""
+    ENTRY_ID = None
+    RECORD_NAME = "Record"   # 生成的记录类名
+    
+    # 字段名 -> 类型（text/category/number/int/date/datetime/list），未列出的按文本处理
+    # category 用于取值个数很少的字段，DataFrame 中为 category 列
+    FIELD_TYPES: Dict[str, str] = {}
+    
+    PAGE_SIZE = 100       # 每次请求的条数（简道云单页上限为 100）
+    CHUNK_ROWS = 5000     # 拼装 DataFrame 时每块的行数
+    
+    USE_MIRROR = MIRROR_ENABLED      # 查询是否优先从本地镜像读取
+    MIRROR_MAX_AGE = MIRROR_MAX_AGE  # 镜像超过该秒数未同步时先增量同步
+    
+    USE_WRITE_BEHIND = WRITE_BEHIND_ENABLED  # update_deferred 是否先写本地队列再批量提交
+    
+    @classmethod
+    def field_map(cls) -> Dict[str, str]:
+        """字段名 -> widget ID（由 FIELD_* 常量生成，如 FIELD_NAME -> name）"""
+        return {
+            name[len('FIELD_'):].lower(): value
+            for name, value in vars(cls).items()
+            if name.startswith('FIELD_') and isinstance(value, str)
+        }
+    
+    @classmethod
+    def _client(cls):
+        """共享客户端；首次调用时按 FIELD_* 和 FIELD_TYPES 为本表单登记写入编码器"""
+        if not cls.__dict__.get('_encoder_registered'):
+            field_types = cls.FIELD_TYPES
+            register_encoder(cls.ENTRY_ID, {
+                widget: field_types.get(name, "text") for name, widget in cls.field_map().items()
+            })
+            cls._encoder_registered = True
+        return get_client()
+    
+    @classmethod
+    def record_class(cls) -> type:
+        """按 FIELD_* 和 FIELD_TYPES 生成的带 __slots__ 的记录类（首次调用时生成）"""
+        record_cls = cls.__dict__.get('_record_class')
+        if record_cls is None:
+            from models.records import make_record_class
+            record_cls = make_record_class(cls.RECORD_NAME, cls.field_map(), cls.FIELD_TYPES)
+            cls._record_class = record_cls
+        return record_cls
+    
+    @classmethod
+    def iter_records(cls, filters: Dict = None, use_mirror: Optional[bool] = None) -> Iterator[Any]:
+        """逐条返回解码后的记录对象，比 DataFrame 更省内存，适合逐条处理和小范围查找"""
+        from_row = cls.record_class().from_row
+        return (from_row(row) for row in cls.iter_rows(filters=filters, use_mirror=use_mirror))
+    
+    @classmethod
+    def get_record(cls, record_id: str) -> Optional[Any]:
+        """按ID获取单条记录对象"""
+        data = cls._client().get_data(cls.ENTRY_ID, record_id).get('data')
+        return cls.record_class().from_row(data) if data else None
+    
+    @classmethod
+    def check_schema(cls, refresh: bool = False):
+        """比对 FIELD_* 映射与表单实际字段，返回 SchemaDrift（无差异时为假值）"""
+        from core.schema import get_schema_registry
+        return get_schema_registry().check_models([cls], refresh=refresh)[0]
+    
+    @classmethod
+    def mirror(cls) -> FormMirror:
+        """本表单的本地 SQLite 镜像"""
+        return get_mirror(cls.ENTRY_ID, cls.field_map())
+    
+    @classmethod
+    def sync_mirror(cls, full: bool = False) -> int:
+        """同步本地镜像，返回拉取的条数"""
+        return cls.mirror().sync(full=full)
+    
+    @classmethod
+    def _mirror_conditions(cls, filters: Dict = None) -> Optional[Dict[str, Any]]:
+        """把简道云过滤条件转换为镜像的等值条件；无法转换时返回 None"""
+        if not filters:
+            return {}
+        if filters.get('rel', 'and') != 'and':
+            return None
+        columns = set(cls.field_map().values())
+        conditions = {}
+        for cond in filters.get('cond', []):
+            value = cond.get('value')
+            if (cond.get('method') != 'eq' or cond.get('field') not in columns
+                    or not isinstance(value, list) or len(value) != 1):
+                return None
+            conditions[cond['field']] = value[0]
+        return conditions
+    
+    @classmethod
+    def iter_rows(cls, filters: Dict = None, page_size: int = None,
+                  fields: Optional[List[str]] = None,
+                  use_mirror: Optional[bool] = None) -> Iterator[Dict[str, Any]]:
+        """逐条遍历表单数据
+        
+        启用镜像且过滤条件可在本地执行时从 SQLite 读取，否则按游标分页请求接口。
+        """
+        conditions = cls._use_mirror(filters, use_mirror)
+        if conditions is not None:
+            rows = cls.mirror().rows(conditions)
+            if fields:
+                keep = set(fields) | {'_id'}
+                rows = ({k: v for k, v in row.items() if k in keep} for row in rows)
+            return rows
+        
+        client = cls._client()
+        return client.iter_data(cls.ENTRY_ID, filters=filters,
+                                page_size=page_size or cls.PAGE_SIZE, fields=fields)
+    
+    @classmethod
+    def iter_frames(cls, filters: Dict = None, chunk_rows: int = None,
+                    fields: Optional[List[str]] = None) -> Iterator[pd.DataFrame]:
+        """按块生成 DataFrame，每块最多 chunk_rows 行"""
+        chunk_rows = chunk_rows or cls.CHUNK_ROWS
+        buffer = []
+        for row in cls.iter_rows(filters=filters, fields=fields):
+            buffer.append(row)
+            if len(buffer) >= chunk_rows:
+                yield pd.DataFrame(buffer)
+                buffer = []
+        if buffer:
+            yield pd.DataFrame(buffer)
+    
+    @classmethod
+    def _query_frame(cls, filters: Dict = None) -> pd.DataFrame:
+        """list_* 方法的公共实现：分页查询全部匹配数据，返回解码后的 DataFrame（见 frame）"""
+        return cls.frame(filters)
+    
+    @classmethod
+    def decode_frame(cls, df: pd.DataFrame, fields: Optional[List[str]] = None) -> pd.DataFrame:
+        """把原始数据块整理为可读列名、带类型的 DataFrame（见 models.decoding.decode_frame）"""
+        field_map = cls.field_map()
+        if fields is not None:
+            field_map = {name: widget for name, widget in field_map.items() if widget in fields}
+        return decode_frame(df, field_map, cls.FIELD_TYPES)
+    
+    @classmethod
+    def frame(cls, filters: Dict = None, fields: Optional[List[str]] = None) -> pd.DataFrame:
+        """查询并解码为扁平、带类型的 DataFrame
+        
+        列名为字段名（如 name、event_date），日期时间为 datetime64，数字为数值列，
+        复选框为列表。按块解码后再拼接，不保留原始数据。fields 为 widget ID 列表，
+        只拉取并解码这些字段。
+        """
+        frames = [cls.decode_frame(chunk, fields)
+                  for chunk in cls.iter_frames(filters=filters, fields=fields)]
+        if not frames:
+            return cls.decode_frame(pd.DataFrame(), fields)
+        return concat_frames(frames)
+    
+    @classmethod
+    def export(cls, path: str, fmt: Optional[str] = None, filters: Dict = None,
+               fields: Optional[List[str]] = None, **options) -> Dict[str, Any]:
+        """流式导出为 CSV / JSONL / Parquet，返回清单（见 models.exporter.FrameExporter）"""
+        from models.exporter import FrameExporter
+        return FrameExporter(cls, path, fmt, filters=filters, fields=fields, **options).run()
+    
+    @classmethod
+    def _use_mirror(cls, filters: Dict = None, use_mirror: Optional[bool] = None) -> Optional[Dict[str, Any]]:
+        """需要且可以读镜像时返回镜像等值条件（并确保镜像足够新），否则返回 None"""
+        if not (cls.USE_MIRROR if use_mirror is None else use_mirror):
+            return None
+        conditions = cls._mirror_conditions(filters)
+        if conditions is not None:
+            cls.mirror().ensure_fresh(cls.MIRROR_MAX_AGE)
+        return conditions
+    
+    @classmethod
+    def count(cls, filters: Dict = None, use_mirror: Optional[bool] = None) -> int:
+        """统计记录数：读镜像时直接 COUNT，否则分页扫描且每行只取 _id"""
+        conditions = cls._use_mirror(filters, use_mirror)
+        if conditions is not None:
+            return cls.mirror().count(conditions)
+        
+        client = cls._client()
+        return sum(len(page) for page in client.iter_pages(
+            cls.ENTRY_ID, filters=filters, page_size=cls.PAGE_SIZE, fields=['_id']))
+    
+    @classmethod
+    def value_counts(cls, field: str, filters: Dict = None,
+                     use_mirror: Optional[bool] = None) -> Dict[Any, int]:
+        """统计某字段各取值的记录数（如状态、区域、活动类型），按条数降序
+        
+        复选框等列表值按每个选项分别计数；空值计为 None。
+        读镜像时在 SQLite 中 GROUP BY，否则分页扫描且每行只取该字段，内存只与取值个数有关。
+        """
+        counts = Counter()
+        conditions = cls._use_mirror(filters, use_mirror)
+        if conditions is not None:
+            for value, n in cls.mirror().group_counts(field, conditions):
+                if isinstance(value, str) and value.startswith('['):
+                    try:
+                        value = json.loads(value)
+                    except ValueError:
+                        pass
+                cls._count_value(counts, value, n)
+        else:
+            client = cls._client()
+            for page in client.iter_pages(cls.ENTRY_ID, filters=filters,
+                                          page_size=cls.PAGE_SIZE, fields=[field]):
+                for row in page:
+                    cls._count_value(counts, unwrap_value(row.get(field)), 1)
+        return dict(counts.most_common())
+    
+    @staticmethod
+    def _count_value(counts: Counter, value: Any, n: int) -> None:
+        if isinstance(value, list):
+            for item in value:
+                counts[item] += n
+        else:
+            counts[value if value != '' else None] += n
+    
+    @classmethod
+    def bulk_create(cls, rows: List[Dict[str, Any]]) -> BatchResult:
+        """批量新增记录，按批量接口分块并发提交"""
+        client = cls._client()
+        return client.batch_create_data(cls.ENTRY_ID, rows)
+    
+    @classmethod
+    def bulk_update(cls, record_ids: List[str], **data) -> BatchResult:
+        """把同一组字段值批量更新到多条记录"""
+        client = cls._client()
+        return client.batch_update_data(cls.ENTRY_ID, record_ids, data)
+    
+    @classmethod
+    def bulk_update_rows(cls, updates: Dict[str, Dict[str, Any]]) -> BatchResult:
+        """按记录分别更新（记录ID -> 字段值）
+        
+        字段值完全相同的记录合并为一组，各组的分块并发提交（见 JDYClient.batch_update_rows），
+        结果按 updates 的顺序逐条对应。
+        """
+        client = cls._client()
+        return client.batch_update_rows(cls.ENTRY_ID, updates)
+    
+    @classmethod
+    def write_behind(cls):
+        """本表单的写入队列（见 core.write_behind.WriteBehindQueue），首次调用时启动后台提交线程"""
+        from core.write_behind import get_write_behind
+        return get_write_behind(cls.ENTRY_ID, cls.bulk_update_rows)
+    
+    @classmethod
+    def update_deferred(cls, record_id: str, **data) -> bool:
+        """更新记录；USE_WRITE_BEHIND 时写入本地队列后立即返回，由后台线程合并批量提交"""
+        if cls.USE_WRITE_BEHIND:
+            cls.write_behind().put(record_id, data)
+            return True
+        return cls._client().update_data(cls.ENTRY_ID, record_id, data)
+    
+    @classmethod
+    def bulk_delete(cls, record_ids: List[str]) -> BatchResult:
+        """批量删除记录"""
+        client = cls._client()
+        return client.batch_delete_data(cls.ENTRY_ID, record_ids)
\ No newline at end of file
@@ -0,0 +1,207 @@
+from __future__ import annotations
+
+from core.lazy import lazy_import
+from datetime import date, datetime, timezone
+from typing import Any, Dict, List, Optional
+
+pd = lazy_import("pandas")
+
+# 简道云日期时间字段以 UTC 的 ISO 字符串返回（以 Z 结尾），统一换算到本地时区
+LOCAL_TIMEZONE = "Asia/Shanghai"
+
+def unwrap_value(value: Any) -> Any:
+    """取出 {'value': ...} 包装中的值"""
+    if isinstance(value, dict) and 'value' in value:
+        return value['value']
+    return value
+
+_LOCAL_TZ = None
+
+def _local_timezone():
+    from zoneinfo import ZoneInfo
+    global _LOCAL_TZ
+    if _LOCAL_TZ is None:
+        _LOCAL_TZ = ZoneInfo(LOCAL_TIMEZONE)
+    return _LOCAL_TZ
+
+def is_missing(value: Any) -> bool:
+    """None、空字符串，以及 pandas 为缺少该字段的行填充的 NaN / NA"""
+    if value is None or value is pd.NA or (isinstance(value, float) and value != value):
+        return True
+    return isinstance(value, str) and value == ''
+
+def decode_text(value: Any) -> Optional[str]:
+    """文本字段：空字符串和 NaN 记为 None"""
+    value = unwrap_value(value)
+    if is_missing(value):
+        return None
+    return value if isinstance(value, str) else str(value)
+
+def decode_number(value: Any) -> Optional[float]:
+    """数字字段，无法解析时返回 None"""
+    value = unwrap_value(value)
+    if value is None or value == '' or isinstance(value, bool):
+        return None
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+def decode_int(value: Any) -> Optional[int]:
+    """整数字段（人数、年龄等），无法解析时返回 None"""
+    number = decode_number(value)
+    return int(number) if number is not None and number == number else None
+
+def decode_datetime(value: Any) -> Optional[datetime]:
+    """日期时间字段，返回本地时间（不带时区）
+    
+    以 Z 结尾的值按 UTC 解析后换算到本地时区，其余按本地时间解析。
+    """
+    value = unwrap_value(value)
+    if not value or not isinstance(value, str):
+        return None
+    text = value.strip()
+    is_utc = text.endswith('Z')
+    if is_utc:
+        text = text[:-1]
+    try:
+        parsed = datetime.fromisoformat(text)
+    except ValueError:
+        return None
+    if is_utc:
+        parsed = parsed.replace(tzinfo=timezone.utc).astimezone(_local_timezone()).replace(tzinfo=None)
+    return parsed
+
+def decode_date(value: Any) -> Optional[date]:
+    """日期字段；带时间的值先换算到本地时区再取日期"""
+    parsed = decode_datetime(value)
+    return parsed.date() if parsed is not None else None
+
+def decode_list(value: Any) -> List[str]:
+    """复选框/多选字段，始终返回列表（缺失的行返回空列表）"""
+    value = unwrap_value(value)
+    if isinstance(value, list):
+        return [item for item in map(unwrap_value, value) if not is_missing(item)]
+    if is_missing(value):
+        return []
+    return [value]
+
+# 字段类型 -> 单值解码函数
+DECODERS = {
+    "text": decode_text,
+    "category": decode_text,
+    "number": decode_number,
+    "int": decode_int,
+    "date": decode_date,
+    "datetime": decode_datetime,
+    "list": decode_list,
+}
+
+def column(df: pd.DataFrame, field: str) -> pd.Series:
+    """读取一列；该列不存在（所有行都没有此字段）时返回全空列"""
+    if field in df.columns:
+        return df[field]
+    return pd.Series([None] * len(df), index=df.index, dtype=object)
+
+def unwrap_series(series: pd.Series) -> pd.Series:
+    """展开整列中的 {'value': ...} 包装"""
+    if series.dtype != object:
+        return series
+    values = [v['value'] if type(v) is dict and 'value' in v else v for v in series.tolist()]
+    return pd.Series(values, index=series.index, dtype=object, name=series.name)
+
+def to_text(series: pd.Series) -> pd.Series:
+    """整列转换为文本；空字符串、NaN 等缺失值统一记为 None"""
+    values = [None if is_missing(v) else v for v in unwrap_series(series).tolist()]
+    return pd.Series(values, index=series.index, dtype=object, name=series.name)
+
+def to_number(series: pd.Series) -> pd.Series:
+    """整列转换为数值，无法解析的记为 NaN"""
+    return pd.to_numeric(unwrap_series(series), errors='coerce')
+
+def to_category(series: pd.Series) -> pd.Series:
+    """取值个数很少的文本列（状态、性别、区域等）转换为 category，每个取值只存一份"""
+    return to_text(series).astype('category')
+
+def to_float(series: pd.Series) -> pd.Series:
+    """整列转换为可空浮点（Float64），缺失值为 <NA>"""
+    return to_number(series).astype('Float64')
+
+def to_int(series: pd.Series) -> pd.Series:
+    """整列转换为可空整数（Int64），缺失值为 <NA>，带小数的值按截断取整"""
+    number = to_number(series)
+    return number.where(number.isna(), number // 1).astype('Int64')
+
+def to_datetime(series: pd.Series) -> pd.Series:
+    """整列解析为本地时间（不带时区）
+    
+    以 Z 结尾的值按 UTC 解析后换算到本地时区，其余按本地时间解析。
+    所有值一次性按 ISO 8601 解析，再只对 UTC 的行做时区换算。
+    """
+    text = unwrap_series(series)
+    if text.dtype == object:
+        text = text.where(text.map(type) == str)
+    is_utc = text.str.endswith('Z', na=False).astype(bool)
+    has_utc = bool(is_utc.any())
+    result = pd.to_datetime(text.str.rstrip('Z') if has_utc else text, errors='coerce', format='ISO8601')
+    if has_utc:
+        result[is_utc] = (result[is_utc].dt.tz_localize('UTC')
+                          .dt.tz_convert(LOCAL_TIMEZONE).dt.tz_localize(None))
+    return result
+
+def to_date(series: pd.Series) -> pd.Series:
+    """整列解析为本地日期（datetime64，时间部分为 0 点）"""
+    return to_datetime(series).dt.normalize()
+
+def to_list(series: pd.Series) -> pd.Series:
+    """复选框/多选列：每个值都转换为列表"""
+    return pd.Series([decode_list(v) for v in series.tolist()], index=series.index,
+                     dtype=object, name=series.name)
+
+# 字段类型 -> 整列解码函数
+COLUMN_DECODERS = {
+    "text": to_text,
+    "category": to_category,
+    "number": to_float,
+    "int": to_int,
+    "date": to_date,
+    "datetime": to_datetime,
+    "list": to_list,
+}
+
+# 系统字段 -> 解码后的列名
+SYSTEM_COLUMNS = {"_id": "id", "createTime": "create_time", "updateTime": "update_time"}
+
+def decode_frame(df: pd.DataFrame, field_map: Dict[str, str],
+                 field_types: Dict[str, str]) -> pd.DataFrame:
+    """把原始数据整理为扁平、带类型的 DataFrame
+    
+    展开 {'value': ...} 包装，widget ID 改为可读列名（field_map 中的字段名），
+    并按 field_types 逐列解析日期、时间、数字和复选框，全部按列批量处理。
+    """
+    columns = {}
+    for raw, name in SYSTEM_COLUMNS.items():
+        if raw in df.columns:
+            columns[name] = df[raw] if raw == '_id' else to_datetime(df[raw])
+    for name, widget in field_map.items():
+        decode = COLUMN_DECODERS[field_types.get(name, "text")]
+        columns[name] = decode(column(df, widget))
+    return pd.DataFrame(columns, index=df.index)
+
+def concat_frames(frames: List[pd.DataFrame]) -> pd.DataFrame:
+    """拼接按块解码的 DataFrame
+    
+    各块的 category 列取值集合不同，直接拼接会退化为 object 列，
+    因此先把每块的 category 列统一为全部块的取值并集再拼接。
+    """
+    if len(frames) == 1:
+        return frames[0]
+    for name, dtype in frames[0].dtypes.items():
+        if not isinstance(dtype, pd.CategoricalDtype):
+            continue
+        categories = frames[0][name].cat.categories
+        for frame in frames[1:]:
+            categories = categories.union(frame[name].cat.categories)
+        for frame in frames:
+            frame[name] = frame[name].cat.set_categories(categories)
+    return pd.concat(frames, ignore_index=True)
@@ -1,12 +1,15 @@
-from core.api_client import JDYClient
-from config.settings import EVENT_ENTRY_ID
-import pandas as pd
+from __future__ import annotations
+
+from models.base import BaseModel, EntrySetting
+from core.lazy import lazy_import
 from typing import List, Dict, Any, Optional
 from datetime import datetime
 
-class EventModel:
+pd = lazy_import("pandas")
+
+class EventModel(BaseModel):
     FORM_NAME = "活动库"
-    ENTRY_ID = EVENT_ENTRY_ID
+    ENTRY_ID = EntrySetting("EVENT_ENTRY_ID")
     
     # 字段映射到 widget ID
     FIELD_EVENT_NAME = "_widget_1767519959682"           # 活动名称
@@ -22,41 +25,51 @@ class EventModel:
     FIELD_REQUIRED_SKILLS = "_widget_1767519959703"      # 所需技能（复选框）
     FIELD_REMARKS = "_widget_1767519959705"              # 备注
     
+    RECORD_NAME = "Event"
+    FIELD_TYPES = {
+        "event_type": "category",
+        "location": "category",
+        "status": "category",
+        "event_date": "date",
+        "start_time": "datetime",
+        "end_time": "datetime",
+        "required_volunteers": "int",
+        "current_participants": "int",
+        "required_skills": "list",
+    }
+    
     @classmethod
     def create(cls, **data) -> str:
         """创建新活动"""
-        client = JDYClient()
+        client = cls._client()
         return client.create_data(cls.ENTRY_ID, data)
     
     @classmethod
     def get_by_id(cls, record_id: str) -> Optional[Dict[str, Any]]:
         """根据ID获取活动信息"""
-        client = JDYClient()
+        client = cls._client()
         return client.get_data(cls.ENTRY_ID, record_id)
     
     @classmethod
     def update(cls, record_id: str, **data) -> bool:
         """更新活动信息"""
-        client = JDYClient()
+        client = cls._client()
         return client.update_data(cls.ENTRY_ID, record_id, data)
     
     @classmethod
     def delete(cls, record_id: str) -> bool:
         """删除活动记录"""
-        client = JDYClient()
+        client = cls._client()
         return client.delete_data(cls.ENTRY_ID, record_id)
     
     @classmethod
     def list_all(cls) -> pd.DataFrame:
         """获取所有活动列表"""
-        client = JDYClient()
-        data = client.query_data(cls.ENTRY_ID)
-        return pd.DataFrame(data)
+        return cls._query_frame()
     
     @classmethod
     def list_by_type(cls, event_type: str) -> pd.DataFrame:
         """按活动类型筛选"""
-        client = JDYClient()
         filters = {
             "rel": "and",
             "cond": [{
@@ -66,13 +79,11 @@ class EventModel:
                 "value": [event_type]
             }]
         }
-        data = client.query_data(cls.ENTRY_ID, filters=filters)
-        return pd.DataFrame(data)
+        return cls._query_frame(filters)
     
     @classmethod
     def list_by_status(cls, status: str) -> pd.DataFrame:
         """按活动状态筛选"""
-        client = JDYClient()
         filters = {
             "rel": "and",
             "cond": [{
@@ -82,13 +93,11 @@ class EventModel:
                 "value": [status]
             }]
         }
-        data = client.query_data(cls.ENTRY_ID, filters=filters)
-        return pd.DataFrame(data)
+        return cls._query_frame(filters)
     
     @classmethod
     def search_by_name(cls, name: str) -> pd.DataFrame:
         """按活动名称搜索"""
-        client = JDYClient()
         filters = {
             "rel": "and",
             "cond": [{
@@ -98,11 +107,15 @@ class EventModel:
                 "value": [name]
             }]
         }
-        data = client.query_data(cls.ENTRY_ID, filters=filters)
-        return pd.DataFrame(data)
+        return cls._query_frame(filters)
     
     @classmethod
     def get_event_count(cls) -> int:
         """获取活动总数"""
-        data = cls.list_all()
-        return len(data)
\ No newline at end of file
+        return cls.count()
+
+def __getattr__(name: str):
+    # 记录类在首次使用时生成：from models.event import Event
+    if name == "Event":
+        return EventModel.record_class()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
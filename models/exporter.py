@@ -0,0 +1,261 @@
+import gzip
+import hashlib
+import json
+import os
+import time
+from typing import Dict, Any, Optional, List, Callable
+from core.lazy import lazy_import
+from models.decoding import is_missing
+
+pd = lazy_import("pandas")
+
+# 导出格式 -> 默认扩展名
+FORMATS = {"csv": ".csv", "jsonl": ".jsonl", "parquet": ".parquet"}
+
+# CSV / JSONL 中日期和时间的写法，与写入接口的格式一致
+DATE_FORMAT = '%Y-%m-%d'
+DATETIME_FORMAT = '%Y-%m-%d %H:%M:%S'
+
+def file_sha256(path: str, block_size: int = 1 << 20) -> str:
+    """分块计算文件的 SHA-256"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(block_size), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+def _open_text(path: str, compression: Optional[str]):
+    if compression == 'gzip':
+        return gzip.open(path, 'wt', encoding='utf-8', newline='')
+    if compression:
+        raise ValueError(f"CSV / JSONL 只支持 gzip 压缩: {compression}")
+    return open(path, 'w', encoding='utf-8', newline='')
+
+def _join_list(value: Any, separator: str) -> str:
+    """把复选框的列表连接成字符串，跳过缺失的选项（单个异常值不中断整个导出）"""
+    if isinstance(value, (list, tuple)):
+        return separator.join(str(item) for item in value if not is_missing(item))
+    return '' if is_missing(value) else str(value)
+
+def _text_frame(df: pd.DataFrame, field_types: Dict[str, str], list_separator: Optional[str]) -> pd.DataFrame:
+    """把日期时间列格式化为字符串；list_separator 不为空时把列表连接成一个字符串"""
+    df = df.copy()
+    for name in df.columns:
+        kind = field_types.get(name)
+        if kind == "date":
+            df[name] = df[name].dt.strftime(DATE_FORMAT)
+        elif kind == "datetime" or name in ("create_time", "update_time"):
+            df[name] = df[name].dt.strftime(DATETIME_FORMAT)
+        elif kind == "list" and list_separator is not None:
+            df[name] = [_join_list(v, list_separator) for v in df[name].tolist()]
+    return df
+
+class CsvWriter:
+    """CSV：每块追加写入，只在第一块写表头；复选框的多个选项用逗号连接（可被导入脚本读回）"""
+
+    def __init__(self, path: str, field_types: Dict[str, str], compression: Optional[str] = None):
+        self.field_types = field_types
+        self.file = _open_text(path, compression)
+        self.header = True
+
+    def write(self, df: pd.DataFrame) -> None:
+        _text_frame(df, self.field_types, ',').to_csv(self.file, index=False, header=self.header)
+        self.header = False
+
+    def close(self) -> None:
+        self.file.close()
+
+class JsonlWriter:
+    """JSON Lines：每行一条记录，复选框为数组，缺失值为 null"""
+
+    def __init__(self, path: str, field_types: Dict[str, str], compression: Optional[str] = None):
+        self.field_types = field_types
+        self.file = _open_text(path, compression)
+
+    def write(self, df: pd.DataFrame) -> None:
+        if df.empty:
+            return
+        text = _text_frame(df, self.field_types, None).to_json(orient='records', lines=True, force_ascii=False)
+        self.file.write(text if text.endswith('\n') else text + '\n')
+
+    def close(self) -> None:
+        self.file.close()
+
+class ParquetWriter:
+    """Parquet（需要 pyarrow）：每块写为一个 row group
+
+    列类型按 FIELD_TYPES 固定（不随每块的数据推断），保证各 row group 的 schema 一致。
+    """
+
+    def __init__(self, path: str, field_types: Dict[str, str], compression: Optional[str] = None):
+        try:
+            import pyarrow
+            import pyarrow.parquet
+        except ImportError:
+            raise ImportError("导出 Parquet 需要 pyarrow：pip install pyarrow") from None
+        self.pa = pyarrow
+        self.pq = pyarrow.parquet
+        self.path = path
+        self.field_types = field_types
+        self.compression = compression or 'snappy'
+        self.schema = None
+        self.writer = None
+
+    def _arrow_type(self, name: str):
+        pa = self.pa
+        kind = self.field_types.get(name, "text")
+        if name in ("create_time", "update_time"):
+            kind = "datetime"
+        return {
+            "text": pa.string(),
+            "category": pa.dictionary(pa.int32(), pa.string()),
+            "number": pa.float64(),
+            "int": pa.int64(),
+            "date": pa.date32(),
+            "datetime": pa.timestamp('ms'),
+            "list": pa.list_(pa.string()),
+        }[kind]
+
+    def write(self, df: pd.DataFrame) -> None:
+        if self.schema is None:
+            self.schema = self.pa.schema([(name, self._arrow_type(name)) for name in df.columns])
+            self.writer = self.pq.ParquetWriter(self.path, self.schema, compression=self.compression)
+        table = self.pa.Table.from_pandas(df, schema=self.schema, preserve_index=False)
+        self.writer.write_table(table)
+
+    def close(self) -> None:
+        if self.writer is not None:
+            self.writer.close()
+
+WRITERS = {"csv": CsvWriter, "jsonl": JsonlWriter, "parquet": ParquetWriter}
+
+class FrameExporter:
+    """把一个表单的数据流式导出为 CSV / JSONL / Parquet
+
+    按游标分页拉取，每 chunk_rows 行解码为一块 DataFrame 后立即写出并丢弃，
+    内存只与块大小有关。fields 为字段名或 widget ID 列表，只拉取并导出这些字段。
+    file_rows 不为空时每满 file_rows 行换一个分片文件（<文件名>.part-00000.<扩展名>）。
+    导出完成后写入清单文件（<文件名>.manifest.json），记录每个文件的行数、大小和 SHA-256。
+    """
+
+    def __init__(self, model, path: str, fmt: Optional[str] = None, filters: Optional[Dict] = None,
+                 fields: Optional[List[str]] = None, compression: Optional[str] = None,
+                 chunk_rows: Optional[int] = None, file_rows: Optional[int] = None):
+        self.model = model
+        self.path = path
+        self.format = fmt or self._guess_format(path)
+        if self.format not in WRITERS:
+            raise ValueError(f"不支持的导出格式: {self.format}（支持 {', '.join(WRITERS)}）")
+        self.filters = filters
+        self.widgets = self._resolve_fields(fields) if fields else None
+        self.compression = compression
+        self.chunk_rows = chunk_rows or model.CHUNK_ROWS
+        self.file_rows = file_rows
+        self.manifest_path = f"{path}.manifest.json"
+
+    @staticmethod
+    def _guess_format(path: str) -> str:
+        name = path[:-3] if path.endswith('.gz') else path
+        suffix = os.path.splitext(name)[1].lower()
+        for fmt, ext in FORMATS.items():
+            if suffix == ext:
+                return fmt
+        raise ValueError(f"无法从文件名判断导出格式，请指定 fmt: {path}")
+
+    def _resolve_fields(self, fields: List[str]) -> List[str]:
+        """字段名或 widget ID -> widget ID"""
+        field_map = self.model.field_map()
+        widgets = set(field_map.values())
+        resolved = []
+        for item in fields:
+            widget = field_map.get(item, item)
+            if widget not in widgets:
+                raise ValueError(f"{self.model.FORM_NAME} 没有字段: {item}")
+            resolved.append(widget)
+        return resolved
+
+    def _file_path(self, index: int) -> str:
+        if not self.file_rows:
+            return self.path
+        base, ext = os.path.splitext(self.path)
+        if ext == '.gz':
+            base, inner = os.path.splitext(base)
+            ext = inner + ext
+        return f"{base}.part-{index:05d}{ext}"
+
+    def run(self, progress: Optional[Callable[[Dict[str, Any]], None]] = None) -> Dict[str, Any]:
+        """执行导出，返回清单（同时写入 manifest_path）"""
+        started = time.time()
+        field_types = self.model.FIELD_TYPES
+        files: List[Dict[str, Any]] = []
+        columns = None
+        writer = None
+        total = 0
+
+        def open_file() -> None:
+            nonlocal writer
+            path = self._file_path(len(files))
+            directory = os.path.dirname(path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            writer = WRITERS[self.format](path, field_types, self.compression)
+            files.append({"path": path, "rows": 0, "chunks": []})
+
+        def close_file() -> None:
+            nonlocal writer
+            writer.close()
+            writer = None
+            entry = files[-1]
+            entry["bytes"] = os.path.getsize(entry["path"])
+            entry["sha256"] = file_sha256(entry["path"])
+
+        try:
+            for raw in self.model.iter_frames(filters=self.filters, chunk_rows=self.chunk_rows,
+                                              fields=self.widgets):
+                df = self.model.decode_frame(raw, self.widgets)
+                del raw
+                if columns is None:
+                    columns = list(df.columns)
+                df = df.reindex(columns=columns)
+                offset = 0
+                while offset < len(df):
+                    if writer is None:
+                        open_file()
+                    room = self.file_rows - files[-1]["rows"] if self.file_rows else len(df)
+                    part = df.iloc[offset:offset + room]
+                    writer.write(part)
+                    files[-1]["rows"] += len(part)
+                    files[-1]["chunks"].append(len(part))
+                    offset += len(part)
+                    if self.file_rows and files[-1]["rows"] >= self.file_rows:
+                        close_file()
+                total += len(df)
+                if progress:
+                    progress({"rows": total, "files": len(files)})
+            if not files:
+                # 没有数据时也写出只有表头 / schema 的空文件
+                empty = self.model.decode_frame(pd.DataFrame(), self.widgets)
+                columns = list(empty.columns)
+                open_file()
+                writer.write(empty)
+            if writer is not None:
+                close_file()
+        finally:
+            if writer is not None:
+                writer.close()
+
+        manifest = {
+            "form": self.model.FORM_NAME,
+            "entry_id": self.model.ENTRY_ID,
+            "format": self.format,
+            "compression": self.compression or ('snappy' if self.format == 'parquet' else None),
+            "filters": self.filters,
+            "columns": columns,
+            "rows": total,
+            "files": [dict(f, path=os.path.basename(f["path"])) for f in files],
+            "started_at": started,
+            "finished_at": time.time(),
+        }
+        with open(self.manifest_path, 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, ensure_ascii=False, indent=2)
+        return manifest
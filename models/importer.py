@@ -0,0 +1,245 @@
+import csv
+import json
+import logging
+import os
+import re
+import time
+import uuid
+from typing import Dict, Any, Optional, List, Iterator, Tuple, Callable
+from config.settings import BATCH_CONCURRENCY
+from core.encoding import PayloadEncoder
+
+# 复选框列在表格中以分隔符连接多个选项，如 "摄影,书法" 或 "摄影、书法"
+LIST_SEPARATORS = re.compile(r"[,，、;；\n]")
+
+def read_csv_rows(path: str, encoding: str = "utf-8-sig") -> Iterator[Tuple[List[str], List[Any]]]:
+    """逐行读取 CSV，第一次产出表头，之后产出 (表头, 行值)"""
+    with open(path, newline='', encoding=encoding) as f:
+        reader = csv.reader(f)
+        header = next(reader, None)
+        if header is None:
+            return
+        for values in reader:
+            yield header, values
+
+def read_xlsx_rows(path: str, sheet: Optional[str] = None) -> Iterator[Tuple[List[str], List[Any]]]:
+    """以只读模式逐行读取 Excel（需要 openpyxl），内存与文件大小无关"""
+    try:
+        from openpyxl import load_workbook
+    except ImportError:
+        raise ImportError("读取 .xlsx 需要 openpyxl：pip install openpyxl") from None
+    workbook = load_workbook(path, read_only=True, data_only=True)
+    try:
+        worksheet = workbook[sheet] if sheet else workbook.active
+        rows = worksheet.iter_rows(values_only=True)
+        header = next(rows, None)
+        if header is None:
+            return
+        header = ['' if cell is None else str(cell) for cell in header]
+        for values in rows:
+            yield header, list(values)
+    finally:
+        workbook.close()
+
+def read_rows(path: str, sheet: Optional[str] = None) -> Iterator[Tuple[List[str], List[Any]]]:
+    """按扩展名选择 CSV / Excel 读取方式"""
+    suffix = os.path.splitext(path)[1].lower()
+    if suffix in ('.xlsx', '.xlsm'):
+        return read_xlsx_rows(path, sheet)
+    if suffix in ('.csv', '.txt'):
+        return read_csv_rows(path)
+    raise ValueError(f"不支持的文件类型: {suffix}（支持 .csv / .xlsx）")
+
+class ImportCheckpoint:
+    """导入进度文件：记录已处理的行数和批次，中断后从这里继续"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.state: Dict[str, Any] = {}
+
+    def load(self) -> bool:
+        try:
+            with open(self.path, encoding='utf-8') as f:
+                self.state = json.load(f)
+            return True
+        except FileNotFoundError:
+            return False
+
+    def save(self) -> None:
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.state, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, self.path)
+
+class RowImporter:
+    """把 CSV / Excel 中的数据流式导入到一个表单
+
+    表头按 FIELD_* 字段名、widget ID 或表单中的字段标题匹配（mapping 可指定 表头 -> 字段名/widget ID），
+    每行按字段类型校验后累积到 batch_rows 行，用批量接口分块并发提交。
+    每提交完一批就写一次进度文件；批次的 transaction_id 由导入 ID 和批次序号确定，
+    中断后重跑时未确认的那一批会以相同的 transaction_id 重发，由服务端去重。
+    校验或提交失败的行写入 rejects 文件（行号、原因、原始数据），不影响其他行。
+    """
+
+    def __init__(self, model, path: str, mapping: Optional[Dict[str, str]] = None,
+                 checkpoint_path: Optional[str] = None, rejects_path: Optional[str] = None,
+                 batch_rows: int = 1000, concurrency: int = BATCH_CONCURRENCY, sheet: Optional[str] = None):
+        self.model = model
+        self.path = path
+        self.mapping = dict(mapping or {})
+        self.checkpoint = ImportCheckpoint(checkpoint_path or f"{path}.checkpoint.json")
+        self.rejects_path = rejects_path or f"{path}.rejects.csv"
+        self.batch_rows = batch_rows
+        self.concurrency = concurrency
+        self.sheet = sheet
+        self.logger = logging.getLogger("RowImporter")
+
+        field_map = model.field_map()
+        self.field_types = {widget: model.FIELD_TYPES.get(name, "text") for name, widget in field_map.items()}
+        self.encoder = PayloadEncoder(self.field_types)
+
+    def _labels(self) -> Dict[str, str]:
+        """表单字段标题 -> widget ID（读字段缓存，获取失败时只按字段名匹配）"""
+        try:
+            from core.schema import get_schema_registry
+            schema = get_schema_registry().get(self.model.ENTRY_ID)
+        except Exception as e:
+            self.logger.warning(f"无法获取表单字段标题，只按字段名/widget ID 匹配表头: {e}")
+            return {}
+        return {w.get('label'): w.get('name') for w in schema.widgets if w.get('label')}
+
+    def resolve_columns(self, header: List[str]) -> Dict[int, str]:
+        """表头 -> 列下标到 widget ID 的映射；无法匹配的列忽略"""
+        field_map = self.model.field_map()
+        widgets = set(field_map.values())
+        labels = None
+        columns = {}
+        for index, title in enumerate(header):
+            title = (title or '').strip()
+            target = self.mapping.get(title, title)
+            if target in field_map:
+                target = field_map[target]
+            elif target not in widgets:
+                if labels is None:
+                    labels = self._labels()
+                target = labels.get(target)
+            if target in widgets:
+                columns[index] = target
+            elif title:
+                self.logger.warning(f"忽略无法对应字段的列: {title}")
+        if not columns:
+            raise ValueError("表头中没有任何列能对应到表单字段，请用 mapping 指定")
+        return columns
+
+    def convert(self, values: List[Any], columns: Dict[int, str]) -> Dict[str, Any]:
+        """把一行表格数据转换为接口格式；校验失败抛出 ValueError"""
+        data = {}
+        for index, widget in columns.items():
+            value = values[index] if index < len(values) else None
+            if isinstance(value, str):
+                value = value.strip()
+            if value is None or value == '':
+                continue
+            if self.field_types[widget] == "list" and isinstance(value, str):
+                value = [item.strip() for item in LIST_SEPARATORS.split(value) if item.strip()]
+            data[widget] = value
+        if not data:
+            raise ValueError("空行")
+        return self.encoder.encode(data)
+
+    def _fingerprint(self) -> Dict[str, Any]:
+        stat = os.stat(self.path)
+        return {"source": os.path.abspath(self.path), "size": stat.st_size, "mtime": stat.st_mtime}
+
+    def _start(self, restart: bool) -> Dict[str, Any]:
+        fingerprint = self._fingerprint()
+        if not restart and self.checkpoint.load():
+            state = self.checkpoint.state
+            if any(state.get(key) != value for key, value in fingerprint.items()):
+                raise ValueError(f"源文件自上次导入后已变化，请使用 restart 重新导入: {self.checkpoint.path}")
+            if state.get("entry_id") != self.model.ENTRY_ID:
+                raise ValueError(f"进度文件属于另一个表单: {state.get('entry_id')}")
+            self.logger.info(f"从第 {state['rows_read'] + 1} 行继续导入（已完成 {state['batches']} 批）")
+            return state
+        state = dict(fingerprint, entry_id=self.model.ENTRY_ID, import_id=uuid.uuid4().hex,
+                     rows_read=0, batches=0, created=0, rejected=0, done=False, started_at=time.time())
+        self.checkpoint.state = state
+        if os.path.exists(self.rejects_path):
+            os.remove(self.rejects_path)
+        return state
+
+    def run(self, restart: bool = False, dry_run: bool = False,
+            progress: Optional[Callable[[Dict[str, Any]], None]] = None) -> Dict[str, Any]:
+        """执行导入，返回进度统计（rows_read / created / rejected / batches）
+
+        dry_run 时只读取和校验，不提交、不写进度文件。
+        """
+        state = self._start(restart)
+        if state.get("done"):
+            return state
+        client = self.model._client()
+        skip = state["rows_read"]
+        columns = None
+        batch: List[Dict[str, Any]] = []
+        batch_rows: List[Tuple[int, List[Any]]] = []
+        # 被拒绝的行随批次一起落盘，保证 rejects 文件与进度文件一致（续传时不会重复记录）
+        rejected: List[List[Any]] = []
+
+        def reject(row_number: int, reason: str, values: List[Any]) -> None:
+            rejected.append([row_number, reason, json.dumps(values, ensure_ascii=False, default=str)])
+
+        def flush(rows_read: int) -> None:
+            if batch and not dry_run:
+                transaction_id = f"{state['import_id']}:{state['batches']}"
+                result = client.batch_create_data(
+                    self.model.ENTRY_ID, batch, transaction_id=transaction_id, concurrency=self.concurrency
+                )
+                state["created"] += result.success_count
+                for index, reason in sorted(result.errors.items()):
+                    row_number, values = batch_rows[index]
+                    reject(row_number, reason, values)
+            if rejected:
+                rejected.sort()
+                new_file = not os.path.exists(self.rejects_path)
+                with open(self.rejects_path, 'a', newline='', encoding='utf-8-sig') as f:
+                    writer = csv.writer(f)
+                    if new_file:
+                        writer.writerow(["行号", "原因", "原始数据"])
+                    writer.writerows(rejected)
+                state["rejected"] += len(rejected)
+                rejected.clear()
+            state["rows_read"] = rows_read
+            if batch:
+                state["batches"] += 1
+            if not dry_run:
+                self.checkpoint.save()
+            if progress:
+                progress(state)
+            batch.clear()
+            batch_rows.clear()
+
+        row_number = 0
+        for header, values in read_rows(self.path, self.sheet):
+            if columns is None:
+                columns = self.resolve_columns(header)
+            row_number += 1
+            if row_number <= skip:
+                continue
+            try:
+                batch.append(self.convert(values, columns))
+                batch_rows.append((row_number + 1, values))  # 表格中的行号（含表头）
+            except ValueError as e:
+                if str(e) != "空行":
+                    reject(row_number + 1, str(e), values)
+            if len(batch) >= self.batch_rows:
+                flush(row_number)
+        flush(row_number)
+
+        state["done"] = True
+        state["finished_at"] = time.time()
+        if not dry_run:
+            self.checkpoint.save()
+        return state
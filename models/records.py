@@ -0,0 +1,76 @@
+from dataclasses import make_dataclass, field, asdict
+from datetime import date, datetime
+from typing import Dict, Any, Optional, List
+from models.decoding import DECODERS, decode_text
+
+# 字段类型 -> 记录类中的类型注解
+FIELD_PYTHON_TYPES = {
+    "text": Optional[str],
+    "category": Optional[str],
+    "number": Optional[float],
+    "int": Optional[int],
+    "date": Optional[date],
+    "datetime": Optional[datetime],
+    "list": List[str],
+}
+
+class Record:
+    """表单记录的公共方法（具体的记录类由 make_record_class 生成）"""
+    __slots__ = ()
+
+    # (属性名, widget ID, 解码函数)，由 make_record_class 填充
+    _decoders = ()
+
+    @classmethod
+    def from_row(cls, row: Dict[str, Any]) -> "Record":
+        """由接口返回的原始数据构造记录，逐字段按类型解码"""
+        return cls(
+            row.get('_id'),
+            decode_text(row.get('createTime')) if 'createTime' in row else None,
+            decode_text(row.get('updateTime')) if 'updateTime' in row else None,
+            *[decode(row.get(widget)) for _, widget, decode in cls._decoders]
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        """字段名 -> 值"""
+        return asdict(self)
+
+    def to_payload(self) -> Dict[str, Any]:
+        """widget ID -> 值（可直接用于 create/update），空值不输出"""
+        payload = {}
+        for name, widget, _ in self._decoders:
+            value = getattr(self, name)
+            if value is None or value == []:
+                continue
+            if isinstance(value, datetime):
+                value = value.strftime('%Y-%m-%d %H:%M:%S')
+            elif isinstance(value, date):
+                value = value.strftime('%Y-%m-%d')
+            payload[widget] = value
+        return payload
+
+def make_record_class(name: str, field_map: Dict[str, str], field_types: Dict[str, str]) -> type:
+    """按 FIELD_* 映射生成带 __slots__ 的记录类
+
+    每个字段一个属性，类型由 field_types 指定（未指定的按文本处理），
+    另有 id / create_time / update_time 三个系统字段。
+    """
+    unknown = set(field_types) - set(field_map)
+    if unknown:
+        raise KeyError(f"{name} 的 FIELD_TYPES 中有未定义的字段: {', '.join(sorted(unknown))}")
+
+    fields = [
+        ("id", Optional[str], field(default=None)),
+        ("create_time", Optional[str], field(default=None)),
+        ("update_time", Optional[str], field(default=None)),
+    ]
+    decoders = []
+    for attr, widget in field_map.items():
+        kind = field_types.get(attr, "text")
+        default = field(default_factory=list) if kind == "list" else field(default=None)
+        fields.append((attr, FIELD_PYTHON_TYPES[kind], default))
+        decoders.append((attr, widget, DECODERS[kind]))
+
+    cls = make_dataclass(name, fields, bases=(Record,), slots=True)
+    cls._decoders = tuple(decoders)
+    return cls
@@ -1,12 +1,17 @@
-from core.api_client import JDYClient
-from config.settings import SCHEDULE_ENTRY_ID
-import pandas as pd
-from typing import List, Dict, Any, Optional
+from __future__ import annotations
+
+from models.base import BaseModel, EntrySetting
+from core.batch import BatchResult
+from models.decoding import column, unwrap_series, to_number, to_datetime
+from core.lazy import lazy_import
+from typing import List, Dict, Any, Optional, Union
 from datetime import datetime
 
-class ScheduleModel:
+pd = lazy_import("pandas")
+
+class ScheduleModel(BaseModel):
     FORM_NAME = "排班签到"
-    ENTRY_ID = SCHEDULE_ENTRY_ID
+    ENTRY_ID = EntrySetting("SCHEDULE_ENTRY_ID")
     
     # 字段映射到 widget ID
     FIELD_NAME = "_widget_1767577273272"               # 姓名
@@ -24,41 +29,62 @@ class ScheduleModel:
     FIELD_WORK_PERFORMANCE = "_widget_1767577975115"   # 工作表现
     FIELD_REMARKS = "_widget_1767577975117"            # 备注
     
+    RECORD_NAME = "Schedule"
+    FIELD_TYPES = {
+        "gender": "category",
+        "event_name": "category",
+        "location": "category",
+        "role": "category",
+        "status": "category",
+        "work_performance": "category",
+        "event_date": "date",
+        "check_in_time": "datetime",
+        "check_out_time": "datetime",
+        "actual_hours": "number",
+    }
+    
+    # 计入出勤的排班状态
+    ATTENDED_STATUSES = ("已签到", "已签退")
+    
+    # 工时汇总的分组维度
+    HOURS_GROUPS = {
+        "volunteer": ["name", "phone"],
+        "event": ["event_name"],
+        "month": ["month"],
+    }
+    
     @classmethod
     def create(cls, **data) -> str:
         """创建排班记录"""
-        client = JDYClient()
+        client = cls._client()
         return client.create_data(cls.ENTRY_ID, data)
     
     @classmethod
     def get_by_id(cls, record_id: str) -> Optional[Dict[str, Any]]:
         """根据ID获取排班记录"""
-        client = JDYClient()
+        client = cls._client()
         return client.get_data(cls.ENTRY_ID, record_id)
     
     @classmethod
     def update(cls, record_id: str, **data) -> bool:
         """更新排班记录"""
-        client = JDYClient()
+        client = cls._client()
         return client.update_data(cls.ENTRY_ID, record_id, data)
     
     @classmethod
     def delete(cls, record_id: str) -> bool:
         """删除排班记录"""
-        client = JDYClient()
+        client = cls._client()
         return client.delete_data(cls.ENTRY_ID, record_id)
     
     @classmethod
     def list_all(cls) -> pd.DataFrame:
         """获取所有排班记录"""
-        client = JDYClient()
-        data = client.query_data(cls.ENTRY_ID)
-        return pd.DataFrame(data)
+        return cls._query_frame()
     
     @classmethod
     def list_by_volunteer(cls, name: str) -> pd.DataFrame:
         """获取指定义工的排班记录"""
-        client = JDYClient()
         filters = {
             "rel": "and",
             "cond": [{
@@ -68,13 +94,11 @@ class ScheduleModel:
                 "value": [name]
             }]
         }
-        data = client.query_data(cls.ENTRY_ID, filters=filters)
-        return pd.DataFrame(data)
+        return cls._query_frame(filters)
     
     @classmethod
     def list_by_event(cls, event_name: str) -> pd.DataFrame:
         """获取指定活动的排班记录"""
-        client = JDYClient()
         filters = {
             "rel": "and",
             "cond": [{
@@ -84,13 +108,11 @@ class ScheduleModel:
                 "value": [event_name]
             }]
         }
-        data = client.query_data(cls.ENTRY_ID, filters=filters)
-        return pd.DataFrame(data)
+        return cls._query_frame(filters)
     
     @classmethod
     def list_by_status(cls, status: str) -> pd.DataFrame:
         """按排班状态筛选"""
-        client = JDYClient()
         filters = {
             "rel": "and",
             "cond": [{
@@ -100,31 +122,76 @@ class ScheduleModel:
                 "value": [status]
             }]
         }
-        data = client.query_data(cls.ENTRY_ID, filters=filters)
-        return pd.DataFrame(data)
+        return cls._query_frame(filters)
     
     @classmethod
-    def check_in(cls, record_id: str) -> bool:
-        """义工签到"""
-        check_in_time = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        return cls.update(record_id, **{
+    def _check_in_data(cls, check_in_time: str) -> Dict[str, Any]:
+        return {
             cls.FIELD_STATUS: "已签到",
             cls.FIELD_CHECK_IN_TIME: check_in_time
-        })
+        }
     
     @classmethod
-    def check_out(cls, record_id: str, actual_hours: float = None) -> bool:
-        """义工签退"""
-        check_out_time = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    def _check_out_data(cls, check_out_time: str, actual_hours: float = None) -> Dict[str, Any]:
         update_data = {
             cls.FIELD_STATUS: "已签退",
             cls.FIELD_CHECK_OUT_TIME: check_out_time
         }
-        
         if actual_hours is not None:
             update_data[cls.FIELD_ACTUAL_HOURS] = actual_hours
+        return update_data
+    
+    @classmethod
+    def _deferred_time(cls) -> str:
+        """签到/签退时间；启用写入队列时精确到分钟
+        
+        同一分钟内的签到字段值完全相同，队列提交时合并为一次批量请求，
+        而不是每条记录（时间精确到秒、各不相同）单独一次请求。时间仍取签到时刻，不受提交延迟影响。
+        """
+        now = datetime.now()
+        if cls.USE_WRITE_BEHIND:
+            now = now.replace(second=0)
+        return now.strftime("%Y-%m-%d %H:%M:%S")
+    
+    @classmethod
+    def check_in(cls, record_id: str) -> bool:
+        """义工签到（启用写入队列时先记入本地队列，立即返回）"""
+        return cls.update_deferred(record_id, **cls._check_in_data(cls._deferred_time()))
+    
+    @classmethod
+    def check_out(cls, record_id: str, actual_hours: float = None) -> bool:
+        """义工签退（启用写入队列时先记入本地队列，立即返回）"""
+        if actual_hours is not None:
+            actual_hours = float(actual_hours)
+        return cls.update_deferred(record_id, **cls._check_out_data(cls._deferred_time(), actual_hours))
+    
+    @classmethod
+    def bulk_check_in(cls, record_ids: List[str]) -> BatchResult:
+        """批量签到：所有记录使用同一签到时间，按批量更新接口分块提交
+        
+        重复的记录ID只签到一次，结果按去重后的顺序逐条对应。
+        """
+        record_ids = list(dict.fromkeys(record_ids))
+        check_in_time = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        return cls.bulk_update(record_ids, **cls._check_in_data(check_in_time))
+    
+    @classmethod
+    def bulk_check_out(cls, record_ids: List[str],
+                       hours: Union[float, Dict[str, float], None] = None) -> BatchResult:
+        """批量签退：所有记录使用同一签退时间
         
-        return cls.update(record_id, **update_data)
+        hours 为数字时所有记录记同样的工时，为 记录ID -> 工时 的字典时逐条记录
+        （工时相同的记录合并为一组批量提交）。结果按去重后的顺序逐条对应。
+        签退时间每次调用只取一次，工时统一为浮点数（2 与 2.0 视为同一组），保证能合并的记录都合并。
+        """
+        check_out_time = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        updates = {}
+        for record_id in record_ids:
+            actual_hours = hours.get(record_id) if isinstance(hours, dict) else hours
+            if actual_hours is not None:
+                actual_hours = float(actual_hours)
+            updates[record_id] = cls._check_out_data(check_out_time, actual_hours)
+        return cls.bulk_update_rows(updates)
     
     @classmethod
     def get_volunteer_hours(cls, name: str) -> float:
@@ -133,8 +200,68 @@ class ScheduleModel:
         if schedules.empty:
             return 0.0
         
-        total_hours = schedules[cls.FIELD_ACTUAL_HOURS].sum()
-        return float(total_hours)
+        return float(schedules["actual_hours"].sum())
+    
+    @classmethod
+    def _hours_frame(cls, df: pd.DataFrame) -> pd.DataFrame:
+        """把一块排班数据整理为工时统计所需的列"""
+        event_date = to_datetime(column(df, cls.FIELD_EVENT_DATE))
+        attended = unwrap_series(column(df, cls.FIELD_STATUS)).isin(cls.ATTENDED_STATUSES)
+        return pd.DataFrame({
+            "name": unwrap_series(column(df, cls.FIELD_NAME)),
+            "phone": unwrap_series(column(df, cls.FIELD_PHONE)),
+            "event_name": unwrap_series(column(df, cls.FIELD_EVENT_NAME)),
+            "month": event_date.dt.strftime("%Y-%m"),
+            "hours": to_number(column(df, cls.FIELD_ACTUAL_HOURS)).fillna(0.0),
+            "attended": attended.astype(int),
+            "served_date": event_date.where(attended),
+        })
+    
+    @staticmethod
+    def _aggregate_hours(data: pd.DataFrame, by: List[str]) -> pd.DataFrame:
+        """按维度汇总工时、排班次数、出勤次数和最近服务日期"""
+        return data.groupby(by, dropna=False).agg(
+            total_hours=("hours", "sum"),
+            shifts=("hours", "size"),
+            attended=("attended", "sum"),
+            last_served=("served_date", "max"),
+        )
+    
+    @classmethod
+    def hours_report(cls, filters: Dict = None) -> Dict[str, pd.DataFrame]:
+        """一次扫描排班表，汇总每位义工 / 每个活动 / 每月的工时
+        
+        返回 {"volunteer": ..., "event": ..., "month": ...}，每个 DataFrame 含
+        total_hours（工时合计）、shifts（排班次数）、attended（出勤次数）、
+        last_served（最近服务日期）列。数据按块分组后再合并，内存只与分组数有关。
+        """
+        fields = [cls.FIELD_NAME, cls.FIELD_PHONE, cls.FIELD_EVENT_NAME, cls.FIELD_EVENT_DATE,
+                  cls.FIELD_ACTUAL_HOURS, cls.FIELD_STATUS]
+        partials = {level: [] for level in cls.HOURS_GROUPS}
+        for frame in cls.iter_frames(filters=filters, fields=fields):
+            data = cls._hours_frame(frame)
+            for level, by in cls.HOURS_GROUPS.items():
+                partials[level].append(cls._aggregate_hours(data, by))
+        
+        report = {}
+        for level, by in cls.HOURS_GROUPS.items():
+            if not partials[level]:
+                report[level] = pd.DataFrame(
+                    columns=by + ["total_hours", "shifts", "attended", "last_served"])
+                continue
+            combined = pd.concat(partials[level]).groupby(level=by, dropna=False).agg(
+                total_hours=("total_hours", "sum"),
+                shifts=("shifts", "sum"),
+                attended=("attended", "sum"),
+                last_served=("last_served", "max"),
+            )
+            report[level] = combined.sort_values("total_hours", ascending=False).reset_index()
+        return report
+    
+    @classmethod
+    def get_all_volunteer_hours(cls) -> pd.DataFrame:
+        """所有义工的工时汇总（一次扫描）"""
+        return cls.hours_report()["volunteer"]
     
     @classmethod
     def get_event_volunteers(cls, event_name: str) -> pd.DataFrame:
@@ -144,5 +271,10 @@ class ScheduleModel:
     @classmethod
     def get_schedule_count(cls) -> int:
         """获取排班记录总数"""
-        data = cls.list_all()
-        return len(data)
\ No newline at end of file
+        return cls.count()
+
+def __getattr__(name: str):
+    # 记录类在首次使用时生成：from models.schedule import Schedule
+    if name == "Schedule":
+        return ScheduleModel.record_class()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
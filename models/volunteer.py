@@ -1,11 +1,14 @@
-from core.api_client import JDYClient
-from config.settings import VOLUNTEER_ENTRY_ID
-import pandas as pd
+from __future__ import annotations
+
+from models.base import BaseModel, EntrySetting
+from core.lazy import lazy_import
 from typing import List, Dict, Any, Optional
 
-class VolunteerModel:
+pd = lazy_import("pandas")
+
+class VolunteerModel(BaseModel):
     FORM_NAME = "义工档案"
-    ENTRY_ID = VOLUNTEER_ENTRY_ID
+    ENTRY_ID = EntrySetting("VOLUNTEER_ENTRY_ID")
     
     # 字段映射到 widget ID
     FIELD_NAME = "_widget_1767515266471"                # 姓名
@@ -23,41 +26,51 @@ class VolunteerModel:
     FIELD_STATUS = "_widget_1767516573296"              # 状态
     FIELD_REMARKS = "_widget_1767516573315"             # 备注
     
+    RECORD_NAME = "Volunteer"
+    FIELD_TYPES = {
+        "age": "int",
+        "gender": "category",
+        "area": "category",
+        "is_ordained": "category",
+        "status": "category",
+        "skills": "list",
+        "available_time": "list",
+        "ordained_date": "date",
+        "join_date": "date",
+    }
+    
     @classmethod
     def create(cls, **data) -> str:
         """新增义工"""
-        client = JDYClient()
+        client = cls._client()
         return client.create_data(cls.ENTRY_ID, data)
     
     @classmethod
     def get_by_id(cls, record_id: str) -> Optional[Dict[str, Any]]:
         """根据ID获取义工信息"""
-        client = JDYClient()
+        client = cls._client()
         return client.get_data(cls.ENTRY_ID, record_id)
     
     @classmethod
     def update(cls, record_id: str, **data) -> bool:
         """更新义工信息"""
-        client = JDYClient()
+        client = cls._client()
         return client.update_data(cls.ENTRY_ID, record_id, data)
     
     @classmethod
     def delete(cls, record_id: str) -> bool:
         """删除义工记录"""
-        client = JDYClient()
+        client = cls._client()
         return client.delete_data(cls.ENTRY_ID, record_id)
     
     @classmethod
     def list_all(cls) -> pd.DataFrame:
         """获取所有义工列表"""
-        client = JDYClient()
-        data = client.query_data(cls.ENTRY_ID)
-        return pd.DataFrame(data)
+        return cls._query_frame()
     
     @classmethod
     def list_by_status(cls, status: str) -> pd.DataFrame:
         """按状态筛选义工"""
-        client = JDYClient()
         filters = {
             "rel": "and",
             "cond": [{
@@ -67,13 +80,11 @@ class VolunteerModel:
                 "value": [status]
             }]
         }
-        data = client.query_data(cls.ENTRY_ID, filters=filters)
-        return pd.DataFrame(data)
+        return cls._query_frame(filters)
     
     @classmethod
     def search_by_name(cls, name: str) -> pd.DataFrame:
         """按姓名搜索义工"""
-        client = JDYClient()
         filters = {
             "rel": "and",
             "cond": [{
@@ -83,16 +94,20 @@ class VolunteerModel:
                 "value": [name]
             }]
         }
-        data = client.query_data(cls.ENTRY_ID, filters=filters)
-        return pd.DataFrame(data)
+        return cls._query_frame(filters)
     
     @classmethod
     def get_volunteer_count(cls) -> int:
         """获取义工总数"""
-        data = cls.list_all()
-        return len(data)
+        return cls.count()
     
     @classmethod
     def get_active_volunteers(cls) -> pd.DataFrame:
         """获取活跃义工列表"""
-        return cls.list_by_status("活跃")
\ No newline at end of file
+        return cls.list_by_status("活跃")
+
+def __getattr__(name: str):
+    # 记录类在首次使用时生成：from models.volunteer import Volunteer
+    if name == "Volunteer":
+        return VolunteerModel.record_class()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
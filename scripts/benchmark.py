@@ -0,0 +1,326 @@
+#!/usr/bin/env python3
+"""
+客户端与模型热点路径基准测试
+
+默认在后台启动本地模拟服务（scripts/mock_server.py），依次测量：
+单条创建/读取/更新、分页全量扫描、1k/10k 行批量创建、并发签到与批量签到、list_all 的 DataFrame 转换、
+5 万行原始数据的按列解码。
+输出吞吐量、p50/p95/p99 延迟和峰值内存，并保存为 JSON 便于对比前后两次运行。
+
+用法:
+    python scripts/benchmark.py                                 # 结果写入 bench_results.json
+    python scripts/benchmark.py --output after.json --compare before.json
+    python scripts/benchmark.py --latency 0.01 --only batch_create_1k,full_scan
+    python scripts/benchmark.py --no-rate-limit                 # 关闭客户端限流，测量极限吞吐
+    python scripts/benchmark.py --base-url http://127.0.0.1:8900/api/v5   # 使用已启动的模拟服务
+"""
+import sys
+import os
+import gc
+import json
+import time
+import platform
+import argparse
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Dict, Any, List, Callable, Optional
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+def percentile(values: List[float], p: float) -> Optional[float]:
+    """线性插值百分位数"""
+    if not values:
+        return None
+    ordered = sorted(values)
+    k = (len(ordered) - 1) * p / 100
+    low = int(k)
+    high = min(low + 1, len(ordered) - 1)
+    return ordered[low] + (ordered[high] - ordered[low]) * (k - low)
+
+class Scenario:
+    """单个测试场景：run(ctx) 返回 (处理的条数, 每次调用的延迟列表)"""
+    
+    def __init__(self, name: str, description: str, run: Callable[[Dict[str, Any]], tuple]):
+        self.name = name
+        self.description = description
+        self.run = run
+
+def _timed(func: Callable, *args) -> float:
+    started = time.perf_counter()
+    func(*args)
+    return time.perf_counter() - started
+
+def _volunteer_row(i: int) -> Dict[str, Any]:
+    from models.volunteer import VolunteerModel
+    return {
+        VolunteerModel.FIELD_NAME: f"义工{i}",
+        VolunteerModel.FIELD_PHONE: f"138{i:08d}",
+        VolunteerModel.FIELD_AGE: 20 + i % 50,
+        VolunteerModel.FIELD_SKILLS: ['摄影', '书法'] if i % 2 else ['编程'],
+        VolunteerModel.FIELD_AREA: '天河区',
+        VolunteerModel.FIELD_STATUS: '活跃',
+    }
+
+def _schedule_row(i: int) -> Dict[str, Any]:
+    from models.schedule import ScheduleModel
+    return {
+        ScheduleModel.FIELD_NAME: f"义工{i % 500}",
+        ScheduleModel.FIELD_PHONE: f"138{i % 500:08d}",
+        ScheduleModel.FIELD_EVENT_NAME: f"活动{i % 40}",
+        ScheduleModel.FIELD_EVENT_DATE: f"2026-{1 + i % 12:02d}-15",
+        ScheduleModel.FIELD_ROLE: '接待员',
+        ScheduleModel.FIELD_STATUS: '已排班',
+        ScheduleModel.FIELD_ACTUAL_HOURS: 1 + i % 6,
+    }
+
+def bench_single_create(ctx):
+    from models.volunteer import VolunteerModel
+    latencies, ids = [], []
+    for i in range(ctx['ops']):
+        started = time.perf_counter()
+        ids.append(VolunteerModel.create(**_volunteer_row(i)))
+        latencies.append(time.perf_counter() - started)
+    ctx['volunteer_ids'] = ids
+    return len(ids), latencies
+
+def bench_single_get(ctx):
+    from models.volunteer import VolunteerModel
+    client = ctx['client']
+    ids = ctx.get('volunteer_ids') or VolunteerModel.bulk_create(
+        [_volunteer_row(i) for i in range(ctx['ops'])]).success_ids
+    latencies = [_timed(client.get_data, VolunteerModel.ENTRY_ID, data_id, False) for data_id in ids]
+    return len(ids), latencies
+
+def bench_single_get_cached(ctx):
+    from models.volunteer import VolunteerModel
+    ids = ctx.get('volunteer_ids') or []
+    latencies = [_timed(VolunteerModel.get_by_id, data_id) for data_id in ids]
+    return len(ids), latencies
+
+def bench_single_update(ctx):
+    from models.volunteer import VolunteerModel
+    ids = ctx.get('volunteer_ids') or []
+    latencies = [_timed(lambda d: VolunteerModel.update(d, **{VolunteerModel.FIELD_REMARKS: '基准测试'}), data_id)
+                 for data_id in ids]
+    return len(ids), latencies
+
+def _batch_create(ctx, rows: int):
+    from models.schedule import ScheduleModel
+    data = [_schedule_row(i) for i in range(rows)]
+    started = time.perf_counter()
+    result = ScheduleModel.bulk_create(data)
+    elapsed = time.perf_counter() - started
+    if result.failure_count:
+        raise RuntimeError(f"批量创建失败 {result.failure_count} 行")
+    ctx.setdefault('schedule_ids', []).extend(result.success_ids)
+    return rows, [elapsed]
+
+def bench_batch_create_1k(ctx):
+    return _batch_create(ctx, 1000)
+
+def bench_batch_create_10k(ctx):
+    return _batch_create(ctx, 10000)
+
+def bench_full_scan(ctx):
+    from models.schedule import ScheduleModel
+    client = ctx['client']
+    latencies, rows = [], 0
+    started = time.perf_counter()
+    for page in client.iter_pages(ScheduleModel.ENTRY_ID):
+        now = time.perf_counter()
+        latencies.append(now - started)
+        started = now
+        rows += len(page)
+    return rows, latencies
+
+def bench_list_all_dataframe(ctx):
+    # pandas 按需导入，先导入以免首次导入耗时计入结果
+    import pandas
+    from models.schedule import ScheduleModel
+    started = time.perf_counter()
+    df = ScheduleModel.list_all()
+    return len(df), [time.perf_counter() - started]
+
+def bench_decode_frame_50k(ctx):
+    import pandas as pd
+    from models.schedule import ScheduleModel
+    # 接口返回格式：一半的值带 {'value': ...} 包装，日期为 UTC 字符串
+    raw = []
+    for i in range(50000):
+        row = {k: ({'value': v} if i % 2 else v) for k, v in _schedule_row(i).items()}
+        row[ScheduleModel.FIELD_EVENT_DATE] = f"2026-{1 + i % 12:02d}-14T16:00:00.000Z"
+        row[ScheduleModel.FIELD_CHECK_IN_TIME] = f"2026-{1 + i % 12:02d}-15 09:{i % 60:02d}:00"
+        row['_id'] = f"{i:024x}"
+        raw.append(row)
+    df = pd.DataFrame(raw)
+    started = time.perf_counter()
+    decoded = ScheduleModel.decode_frame(df)
+    return len(decoded), [time.perf_counter() - started]
+
+def bench_concurrent_check_in(ctx):
+    from models.schedule import ScheduleModel
+    ids = ctx.get('schedule_ids') or ScheduleModel.bulk_create(
+        [_schedule_row(i) for i in range(ctx['ops'])]).success_ids
+    ids = ids[:ctx['ops'] * 2]
+    with ThreadPoolExecutor(max_workers=ctx['threads']) as executor:
+        latencies = list(executor.map(lambda d: _timed(ScheduleModel.check_in, d), ids))
+    return len(ids), latencies
+
+def bench_bulk_check_in(ctx):
+    from models.schedule import ScheduleModel
+    ids = ctx.get('schedule_ids') or ScheduleModel.bulk_create(
+        [_schedule_row(i) for i in range(ctx['ops'])]).success_ids
+    ids = ids[:ctx['ops'] * 2]
+    started = time.perf_counter()
+    result = ScheduleModel.bulk_check_in(ids)
+    elapsed = time.perf_counter() - started
+    if result.failure_count:
+        raise RuntimeError(f"批量签到失败 {result.failure_count} 条")
+    return len(ids), [elapsed]
+
+SCENARIOS = [
+    Scenario("single_create", "逐条创建义工", bench_single_create),
+    Scenario("single_get", "逐条读取（不走缓存）", bench_single_get),
+    Scenario("single_get_cached", "逐条读取（get_by_id，命中缓存）", bench_single_get_cached),
+    Scenario("single_update", "逐条更新", bench_single_update),
+    Scenario("batch_create_1k", "批量创建 1k 行排班", bench_batch_create_1k),
+    Scenario("batch_create_10k", "批量创建 10k 行排班", bench_batch_create_10k),
+    Scenario("full_scan", "分页全量扫描排班表（延迟为每页）", bench_full_scan),
+    Scenario("list_all_dataframe", "ScheduleModel.list_all 转 DataFrame", bench_list_all_dataframe),
+    Scenario("decode_frame_50k", "5 万行排班原始数据解码为带类型的列", bench_decode_frame_50k),
+    Scenario("concurrent_check_in", "多线程并发签到", bench_concurrent_check_in),
+    Scenario("bulk_check_in", "批量签到（合并为批量更新）", bench_bulk_check_in),
+]
+
+def run_scenario(scenario: Scenario, ctx: Dict[str, Any], trace_memory: bool) -> Dict[str, Any]:
+    """执行一个场景并汇总指标"""
+    gc.collect()
+    if trace_memory:
+        tracemalloc.start()
+    started = time.perf_counter()
+    try:
+        items, latencies = scenario.run(ctx)
+        error = None
+    except Exception as e:
+        items, latencies, error = 0, [], str(e)[:200]
+    elapsed = time.perf_counter() - started
+    peak = None
+    if trace_memory:
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+    
+    def ms(value):
+        return round(value * 1000, 3) if value is not None else None
+    
+    return {
+        "description": scenario.description,
+        "items": items,
+        "calls": len(latencies),
+        "seconds": round(elapsed, 4),
+        "throughput": round(items / elapsed, 2) if elapsed and items else 0.0,
+        "p50_ms": ms(percentile(latencies, 50)),
+        "p95_ms": ms(percentile(latencies, 95)),
+        "p99_ms": ms(percentile(latencies, 99)),
+        "peak_mem_mb": round(peak / 1024 / 1024, 2) if peak is not None else None,
+        "error": error,
+    }
+
+def compare(current: Dict[str, Any], baseline: Dict[str, Any]) -> None:
+    """打印与基线结果的对比"""
+    print("\n📈 与基线对比（吞吐量越高越好，p95 越低越好）")
+    print("-" * 78)
+    print(f"{'场景':<22}{'吞吐量':>14}{'变化':>10}{'p95(ms)':>14}{'变化':>10}")
+    for name, result in current["results"].items():
+        base = baseline.get("results", {}).get(name)
+        if not base:
+            continue
+        
+        def change(new, old):
+            if not new or not old:
+                return "-"
+            return f"{(new - old) / old * 100:+.1f}%"
+        print(f"{name:<22}{result['throughput']:>14}{change(result['throughput'], base['throughput']):>10}"
+              f"{str(result['p95_ms']):>14}{change(result['p95_ms'], base['p95_ms']):>10}")
+
+def main():
+    parser = argparse.ArgumentParser(description="客户端与模型热点路径基准测试")
+    parser.add_argument('--base-url', default=None, help="已启动的模拟服务地址（默认自动启动）")
+    parser.add_argument('--latency', type=float, default=0.0, help="自动启动的模拟服务的响应延迟（秒）")
+    parser.add_argument('--ops', type=int, default=200, help="单条操作场景的请求次数")
+    parser.add_argument('--threads', type=int, default=16, help="并发签到的线程数")
+    parser.add_argument('--only', default=None, help="只运行指定场景，逗号分隔")
+    parser.add_argument('--no-rate-limit', action='store_true',
+                        help="关闭客户端限流以测量极限吞吐（默认保留，与实际调用路径一致）")
+    parser.add_argument('--no-memory', action='store_true', help="不统计峰值内存（tracemalloc 会拖慢执行）")
+    parser.add_argument('--output', default='bench_results.json')
+    parser.add_argument('--compare', default=None, help="用于对比的历史结果 JSON")
+    args = parser.parse_args()
+    
+    server = None
+    if args.base_url is None:
+        # 模拟服务不校验密钥和表单，缺少配置时用占位值，避免误连真实接口
+        from scripts.mock_server import MockJDYServer
+        server = MockJDYServer(latency=args.latency).start()
+        os.environ['JDY_BASE_URL'] = server.base_url
+        for key in ('JDY_API_KEY', 'JDY_APP_ID', 'JDY_VOLUNTEER_ENTRY_ID',
+                    'JDY_EVENT_ENTRY_ID', 'JDY_SCHEDULE_ENTRY_ID'):
+            os.environ.setdefault(key, f"bench_{key.lower()}")
+    else:
+        os.environ['JDY_BASE_URL'] = args.base_url
+    
+    from core.api_client import get_client
+    client = get_client()
+    rate_limit = not args.no_rate_limit and client.rate_limiter is not None
+    if args.no_rate_limit:
+        client.rate_limiter = None
+    
+    selected = set(args.only.split(',')) if args.only else None
+    ctx = {"client": client, "ops": args.ops, "threads": args.threads}
+    
+    print("⏱️  基准测试")
+    print("=" * 78)
+    print(f"接口地址: {client.base_url}")
+    print(f"客户端限流: {'开启' if rate_limit else '关闭'}")
+    print(f"{'场景':<22}{'条数':>8}{'吞吐量/s':>12}{'p50(ms)':>10}{'p95(ms)':>10}{'p99(ms)':>10}{'内存(MB)':>10}")
+    
+    results = {}
+    try:
+        for scenario in SCENARIOS:
+            if selected and scenario.name not in selected:
+                continue
+            result = run_scenario(scenario, ctx, trace_memory=not args.no_memory)
+            results[scenario.name] = result
+            if result["error"]:
+                print(f"{scenario.name:<22}❌ {result['error'][:60]}")
+                continue
+            print(f"{scenario.name:<22}{result['items']:>8}{result['throughput']:>12}"
+                  f"{str(result['p50_ms']):>10}{str(result['p95_ms']):>10}{str(result['p99_ms']):>10}"
+                  f"{str(result['peak_mem_mb']):>10}")
+    finally:
+        if server:
+            server.stop()
+    
+    output = {
+        "meta": {
+            "timestamp": datetime.now().isoformat(timespec='seconds'),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "base_url": client.base_url,
+            "mock_server": server is not None,
+            "latency": args.latency,
+            "ops": args.ops,
+            "threads": args.threads,
+            "rate_limit": rate_limit,
+        },
+        "results": results,
+    }
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(output, f, ensure_ascii=False, indent=2)
+    print(f"\n💾 结果已保存到 {args.output}")
+    
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as f:
+            compare(output, json.load(f))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+字段解码检查
+
+用构造的原始数据（每个字段只在部分行出现，另一部分行缺少该字段或为空字符串）
+调用各模型的 decode_frame，检查缺失值是否统一：
+复选框列缺失时为空列表（不能是 [nan]），文本列缺失时为 None（不能是 NaN）。
+不访问简道云接口，可放在 CI 中运行，发现问题时以非零状态退出。
+
+用法:
+    python scripts/check_decoding.py
+"""
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pandas as pd
+from models.volunteer import VolunteerModel
+from models.event import EventModel
+from models.schedule import ScheduleModel
+
+SAMPLE_VALUES = {
+    "text": "示例",
+    "category": "示例",
+    "number": 1.5,
+    "int": 3,
+    "date": "2026-01-14T16:00:00.000Z",
+    "datetime": "2026-01-15 09:30:00",
+    "list": ["选项一", "选项二"],
+}
+
+def raw_frame(model, wrapped: bool) -> pd.DataFrame:
+    """第 0、3 行包含全部字段（wrapped 时第 3 行带 {'value': ...} 包装），
+    第 1 行只有 _id（缺少其余字段），第 2 行全部为空字符串"""
+    rows = [{"_id": f"{i:024x}"} for i in range(4)]
+    for name, widget in model.field_map().items():
+        value = SAMPLE_VALUES[model.FIELD_TYPES.get(name, "text")]
+        rows[0][widget] = value
+        rows[2][widget] = ''
+        rows[3][widget] = {"value": value} if wrapped else value
+    return pd.DataFrame(rows)
+
+def check_model(model) -> list:
+    """返回发现的问题列表（带包装和不带包装的原始数据各检查一次）"""
+    problems = []
+    for wrapped in (False, True):
+        problems += [f"{'带' if wrapped else '不带'}包装 {problem}"
+                     for problem in check_frame(model, model.decode_frame(raw_frame(model, wrapped)))]
+    return problems
+
+def check_frame(model, decoded: pd.DataFrame) -> list:
+    problems = []
+    for name in model.field_map():
+        kind = model.FIELD_TYPES.get(name, "text")
+        values = decoded[name].tolist()
+        if kind == "list":
+            expected = [SAMPLE_VALUES["list"], [], [], SAMPLE_VALUES["list"]]
+            if values != expected:
+                problems.append(f"{name}: 复选框列应为 {expected}，实际为 {values}")
+        elif kind == "text":
+            if values[1:3] != [None, None] or values[0] != SAMPLE_VALUES["text"]:
+                problems.append(f"{name}: 文本列缺失值应为 None，实际为 {values}")
+        elif kind == "category":
+            if str(decoded[name].dtype) != "category" or not decoded[name].iloc[1:3].isna().all():
+                problems.append(f"{name}: 应为 category 且缺失值为 NA，实际为 {decoded[name].dtype} {values}")
+        elif not decoded[name].iloc[1:3].isna().all():
+            problems.append(f"{name}: 缺失值应为 NA，实际为 {values}")
+    return problems
+
+def main():
+    failures = 0
+    for model in (VolunteerModel, EventModel, ScheduleModel):
+        problems = check_model(model)
+        mark = "✅" if not problems else "❌"
+        print(f"{mark} {model.__name__}")
+        for problem in problems:
+            print(f"   - {problem}")
+        failures += len(problems)
+
+    if failures:
+        print(f"\n发现 {failures} 个解码问题")
+        sys.exit(1)
+    print("\n全部通过")
+
+if __name__ == "__main__":
+    main()
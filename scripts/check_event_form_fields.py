@@ -7,18 +7,19 @@ import os
 import json
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from core.api_client import JDYClient
-from config.settings import EVENT_ENTRY_ID
+from core.schema import get_schema_registry
+from config.settings import require
 
 def debug_event_fields():
     """调试活动库表的字段 - 显示原始 API 响应"""
-    client = JDYClient()
     
     print("🔍 调试活动库表字段...\n")
     print("=" * 80)
     
     try:
-        result = client.get_form_widgets(EVENT_ENTRY_ID)
+        # 字段列表优先读本地缓存（data/schema_cache.json），加 --refresh 重新获取
+        schema = get_schema_registry().get(require("EVENT_ENTRY_ID"), refresh='--refresh' in sys.argv)
+        result = {"widgets": schema.widgets}
         
         # 打印完整的原始响应
         print("📡 原始 API 响应：\n")
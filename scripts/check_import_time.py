@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+导入耗时检查
+
+在干净的子进程中多次导入各模块，检查耗时中位数是否在预算内，
+并确认 pandas、requests 等重量级依赖没有在导入阶段被加载。
+单次导入耗时在 10-60 ms 之间波动，默认预算留出足够余量，只拦截明显的退化
+（如 pandas 被提前导入约 350 ms）；重量级依赖是否被加载另行精确检查。
+可放在 CI 或定时任务前运行，超出预算时以非零状态退出。
+
+用法:
+    python scripts/check_import_time.py
+    python scripts/check_import_time.py --budget 0.1 --repeat 7
+"""
+import sys
+import os
+import json
+import argparse
+import statistics
+import subprocess
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# 需要检查的模块
+MODULES = [
+    "config.settings",
+    "core.api_client",
+    "models.volunteer",
+    "models.event",
+    "models.schedule",
+]
+
+# 导入阶段不应加载的依赖
+HEAVY_MODULES = ["pandas", "numpy", "requests", "urllib3"]
+
+PROBE = """
+import json, sys, time
+started = time.perf_counter()
+import {module}
+elapsed = time.perf_counter() - started
+print(json.dumps({{"seconds": elapsed, "loaded": [m for m in {heavy!r} if m in sys.modules]}}))
+"""
+
+def measure(module: str, env: dict) -> dict:
+    """在新的解释器中导入模块，返回耗时和已加载的重量级依赖"""
+    code = PROBE.format(module=module, heavy=HEAVY_MODULES)
+    output = subprocess.run(
+        [sys.executable, "-c", code], cwd=ROOT, env=env,
+        capture_output=True, text=True, check=True
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+def main():
+    parser = argparse.ArgumentParser(description="检查模块导入耗时")
+    parser.add_argument('--budget', type=float, default=0.15, help='单个模块导入耗时中位数上限（秒）')
+    parser.add_argument('--repeat', type=int, default=5, help='每个模块测量次数（取中位数）')
+    args = parser.parse_args()
+
+    env = dict(os.environ)
+
+    failures = []
+    print(f"⏱  导入耗时预算: {args.budget * 1000:.0f} ms\n")
+    for module in MODULES:
+        try:
+            results = [measure(module, env) for _ in range(args.repeat)]
+        except subprocess.CalledProcessError as e:
+            print(f"❌ {module}: 导入失败\n{e.stderr}")
+            failures.append(module)
+            continue
+        seconds = statistics.median(r["seconds"] for r in results)
+        loaded = results[0]["loaded"]
+        ok = seconds <= args.budget and not loaded
+        mark = "✅" if ok else "❌"
+        note = f"  已加载: {', '.join(loaded)}" if loaded else ""
+        print(f"{mark} {module:<20} {seconds * 1000:7.1f} ms{note}")
+        if not ok:
+            failures.append(module)
+
+    if failures:
+        print(f"\n超出预算或提前加载了重量级依赖: {', '.join(failures)}")
+        sys.exit(1)
+    print("\n全部通过")
+
+if __name__ == "__main__":
+    main()
@@ -7,17 +7,18 @@ import os
 import json
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from core.api_client import JDYClient
-from config.settings import VOLUNTEER_ENTRY_ID
+from core.schema import get_schema_registry
+from config.settings import require
 
 def check_volunteer_fields():
     """检查义工表的字段"""
-    client = JDYClient()
     
     print("🔍 检查义工档案表的字段...\n")
     
     try:
-        result = client.get_form_widgets(VOLUNTEER_ENTRY_ID)
+        # 字段列表优先读本地缓存（data/schema_cache.json），加 --refresh 重新获取
+        schema = get_schema_registry().get(require("VOLUNTEER_ENTRY_ID"), refresh='--refresh' in sys.argv)
+        result = {"widgets": schema.widgets}
         
         widgets = result.get('widgets', [])
         
@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""
+流式导出表单数据（义工档案 / 活动库 / 排班签到）
+
+按游标分页拉取并逐块解码、写出，内存占用与数据总量无关。
+支持 CSV、JSON Lines（可 gzip 压缩）和 Parquet（需要 pyarrow，每块一个 row group），
+完成后写入 <文件名>.manifest.json，记录行数、文件大小和 SHA-256。
+
+用法:
+    python scripts/export_data.py schedule archive/schedule-2025.parquet --compression zstd
+    python scripts/export_data.py schedule schedule.csv.gz --compression gzip
+    python scripts/export_data.py volunteer volunteers.jsonl --fields name,phone,status
+    python scripts/export_data.py schedule archive/schedule.parquet --file-rows 500000
+"""
+import sys
+import os
+import time
+import argparse
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from models.exporter import FrameExporter, FORMATS
+from models.volunteer import VolunteerModel
+from models.event import EventModel
+from models.schedule import ScheduleModel
+
+MODELS = {
+    "volunteer": VolunteerModel,
+    "event": EventModel,
+    "schedule": ScheduleModel,
+}
+
+def main():
+    parser = argparse.ArgumentParser(description="流式导出表单数据")
+    parser.add_argument('form', choices=sorted(MODELS), help='要导出的表单')
+    parser.add_argument('path', help='输出文件')
+    parser.add_argument('--format', choices=sorted(FORMATS), help='导出格式（默认按扩展名判断）')
+    parser.add_argument('--fields', help='只导出这些字段（逗号分隔的字段名或 widget ID）')
+    parser.add_argument('--compression', help='压缩方式：CSV/JSONL 为 gzip，Parquet 为 snappy/zstd/gzip/none')
+    parser.add_argument('--chunk-rows', type=int, help='每块解码和写出的行数')
+    parser.add_argument('--file-rows', type=int, help='每个分片文件的最大行数（默认不分片）')
+    args = parser.parse_args()
+
+    model = MODELS[args.form]
+    fields = [f.strip() for f in args.fields.split(',') if f.strip()] if args.fields else None
+    started = time.time()
+
+    def progress(state):
+        print(f"  已导出 {state['rows']} 行，{state['files']} 个文件 ({time.time() - started:.1f}s)")
+
+    print(f"📤 导出 {model.FORM_NAME} -> {args.path}")
+    print("=" * 60)
+    try:
+        exporter = FrameExporter(model, args.path, args.format, fields=fields,
+                                 compression=args.compression, chunk_rows=args.chunk_rows,
+                                 file_rows=args.file_rows)
+        manifest = exporter.run(progress=progress)
+    except (ValueError, ImportError, OSError) as e:
+        print(f"❌ {e}")
+        sys.exit(1)
+    print("=" * 60)
+    print(f"✅ 完成: {manifest['rows']} 行，{len(manifest['files'])} 个文件，清单 {exporter.manifest_path}")
+    for item in manifest['files']:
+        print(f"   {item['path']}: {item['rows']} 行，{item['bytes']} 字节，sha256 {item['sha256'][:16]}…")
+
+if __name__ == "__main__":
+    main()
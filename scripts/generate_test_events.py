@@ -6,7 +6,6 @@
 import sys
 import os
 import random
-import time
 from datetime import datetime, timedelta
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
@@ -157,28 +156,19 @@ def batch_create_events(count=50):
     print("=" * 70)
     print(f"📝 时间范围：8:00 - 16:30（白天时间）\n")
     
-    success_count = 0
-    fail_count = 0
+    events = [generate_event() for _ in range(count)]
     
-    for i in range(1, count + 1):
-        try:
-            event_data = generate_event()
-            event_id = EventModel.create(**event_data)
-            
-            if event_id:
-                success_count += 1
-                if i % 10 == 0:
-                    print(f"✅ 已创建 {i}/{count} 条数据 (成功: {success_count}, 失败: {fail_count})")
-            else:
-                fail_count += 1
-                print(f"⚠️  第 {i} 条数据返回空ID")
-            
-            # 简单的限流：每个请求间隔 200ms
-            time.sleep(0.2)
-                
-        except Exception as e:
-            fail_count += 1
-            print(f"❌ 第 {i} 条数据创建失败: {str(e)[:80]}")
+    try:
+        result = EventModel.bulk_create(events)
+        success_count = result.success_count
+        fail_count = result.failure_count
+        
+        for index, reason in sorted(result.errors.items()):
+            print(f"❌ 第 {index + 1} 条数据创建失败: {reason[:80]}")
+    except Exception as e:
+        success_count = 0
+        fail_count = count
+        print(f"❌ 批量创建失败: {str(e)[:80]}")
     
     print("\n" + "=" * 70)
     print(f"✅ 活动数据生成完成！")
@@ -193,11 +183,7 @@ def batch_create_events(count=50):
         total = EventModel.get_event_count()
         print(f"\n📊 数据库中活动总数: {total}")
         
-        statuses = {}
-        for status in ['计划中', '报名中', '进行中', '已完成', '已取消']:
-            count = len(EventModel.list_by_status(status))
-            if count > 0:
-                statuses[status] = count
+        statuses = EventModel.value_counts(EventModel.FIELD_STATUS)
         
         if statuses:
             print(f"   按状态分布:")
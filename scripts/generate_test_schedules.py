@@ -1,17 +1,26 @@
 #!/usr/bin/env python3
 """
 生成测试排班数据 - 基于已有的义工和活动数据
+
+按活动所需技能、所需人数和义工可服务时段分配（见 models/assignment.py），
+同一义工同一天同一时段只排一个活动，排班记录批量提交。
+
+用法:
+    python scripts/generate_test_schedules.py
+    python scripts/generate_test_schedules.py --max-per-volunteer 5
 """
 import sys
 import os
-import random
 import time
+import random
+import argparse
 from datetime import datetime, timedelta
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from models.schedule import ScheduleModel
 from models.volunteer import VolunteerModel
 from models.event import EventModel
+from models.assignment import AssignmentEngine, upcoming_events
 
 # 担任角色选项
 ROLES = [
@@ -50,64 +59,19 @@ REMARKS = [
     '',
 ]
 
-def get_field_value(data, field_key, default=''):
-    """安全地获取字段值，支持两种格式"""
-    value = data.get(field_key, default)
-    
-    # 如果是字典格式 {'value': ...}
-    if isinstance(value, dict):
-        return value.get('value', default)
-    # 如果是直接的字符串或其他类型
-    return value if value else default
-
-def parse_date_string(date_str):
-    """解析日期字符串，支持多种格式"""
-    if not date_str:
-        return None
-    
-    try:
-        if 'T' in date_str:
-            return datetime.strptime(date_str.split('T')[0], '%Y-%m-%d')
-        elif ' ' in date_str:
-            return datetime.strptime(date_str.split(' ')[0], '%Y-%m-%d')
-        else:
-            return datetime.strptime(date_str, '%Y-%m-%d')
-    except Exception as e:
-        print(f"⚠️  日期解析失败 '{date_str}': {e}")
-        return None
-
-def extract_time_only(datetime_str):
-    """从日期时间字符串中提取时间部分（HH:MM）"""
-    if not datetime_str:
-        return ''
-    if ' ' in datetime_str:
-        time_part = datetime_str.split(' ')[1]
-        return time_part.split(':')[0] + ':' + time_part.split(':')[1]
-    return ''
-
-def generate_schedule(volunteer_data, event_data):
-    """生成一条排班记录"""
-    
-    # 从义工档案表中获取数据
-    volunteer_name = get_field_value(volunteer_data, VolunteerModel.FIELD_NAME, '')
-    volunteer_phone = get_field_value(volunteer_data, VolunteerModel.FIELD_PHONE, '')
-    volunteer_gender = get_field_value(volunteer_data, VolunteerModel.FIELD_GENDER, '')
+def generate_schedule(volunteer, event):
+    """生成一条排班记录（volunteer / event 为解码后的记录对象）"""
     
     # 检查必需字段
-    if not volunteer_name or not volunteer_phone:
+    if not volunteer.name or not volunteer.phone:
         return None
     
-    event_name = get_field_value(event_data, EventModel.FIELD_EVENT_NAME, '未知活动')
-    event_date = get_field_value(event_data, EventModel.FIELD_EVENT_DATE, '')
-    start_time = get_field_value(event_data, EventModel.FIELD_START_TIME, '')
-    end_time = get_field_value(event_data, EventModel.FIELD_END_TIME, '')
-    location = get_field_value(event_data, EventModel.FIELD_LOCATION, '')
+    event_name = event.event_name or '未知活动'
+    event_date = event.event_date.strftime('%Y-%m-%d') if event.event_date else ''
     
     # 组合活动时间（HH:MM-HH:MM 格式）
-    start_time_only = extract_time_only(start_time)
-    end_time_only = extract_time_only(end_time)
-    if start_time_only and end_time_only:
-        event_time = f"{start_time_only}-{end_time_only}"
+    if event.start_time and event.end_time:
+        event_time = f"{event.start_time:%H:%M}-{event.end_time:%H:%M}"
     else:
         event_time = "09:00-17:00"
     
@@ -122,9 +86,7 @@ def generate_schedule(volunteer_data, event_data):
     # 根据状态决定是否生成签到签退时间
     if status in ['已签到', '已签退']:
         try:
-            event_date_obj = parse_date_string(event_date)
-            if not event_date_obj:
-                event_date_obj = datetime.now()
+            event_date_obj = event.event_date or datetime.now().date()
             
             check_in_hour = random.randint(8, 10)
             check_in_minute = random.choice([0, 15, 30, 45])
@@ -147,13 +109,13 @@ def generate_schedule(volunteer_data, event_data):
             actual_hours = None
     
     data = {
-        ScheduleModel.FIELD_NAME: volunteer_name,
-        ScheduleModel.FIELD_PHONE: volunteer_phone,
-        ScheduleModel.FIELD_GENDER: volunteer_gender,
+        ScheduleModel.FIELD_NAME: volunteer.name,
+        ScheduleModel.FIELD_PHONE: volunteer.phone,
+        ScheduleModel.FIELD_GENDER: volunteer.gender or '',
         ScheduleModel.FIELD_EVENT_NAME: event_name,
         ScheduleModel.FIELD_EVENT_DATE: event_date,
         ScheduleModel.FIELD_EVENT_TIME: event_time,
-        ScheduleModel.FIELD_LOCATION: location,
+        ScheduleModel.FIELD_LOCATION: event.location or '',
         ScheduleModel.FIELD_ROLE: random.choice(ROLES),
         ScheduleModel.FIELD_STATUS: status,
         ScheduleModel.FIELD_WORK_PERFORMANCE: random.choice(PERFORMANCES) if status in ['已签退', '已签到'] else '',
@@ -170,75 +132,52 @@ def generate_schedule(volunteer_data, event_data):
     
     return data
 
-def batch_create_schedules(schedules_per_event=5):
-    """批量创建排班记录"""
+def batch_create_schedules(max_per_volunteer=3):
+    """按技能、可服务时段为即将开始的活动分配义工，批量创建排班记录"""
     
     print("🚀 开始生成排班签到数据")
     print("=" * 70)
     
     # 获取所有义工
     try:
-        volunteers_df = VolunteerModel.list_all()
-        if volunteers_df.empty:
+        volunteers = list(VolunteerModel.iter_records())
+        if not volunteers:
             print("❌ 没有找到任何义工数据！请先生成义工数据。")
             return
-        volunteers = volunteers_df.to_dict('records')
         print(f"✅ 找到 {len(volunteers)} 个义工")
     except Exception as e:
         print(f"❌ 获取义工数据失败: {e}")
         return
     
-    # 获取所有活动
+    # 获取即将开始的活动
     try:
-        events_df = EventModel.list_all()
-        if events_df.empty:
-            print("❌ 没有找到任何活动数据！请先生成活动数据。")
+        events = upcoming_events(EventModel.iter_records())
+        if not events:
+            print("❌ 没有找到任何即将开始的活动！请先生成活动数据。")
             return
-        events = events_df.to_dict('records')
-        print(f"✅ 找到 {len(events)} 个活动")
+        print(f"✅ 找到 {len(events)} 个即将开始的活动")
     except Exception as e:
         print(f"❌ 获取活动数据失败: {e}")
         return
     
     print("\n" + "=" * 70)
-    print(f"📊 准备为每个活动分配 {schedules_per_event} 个义工\n")
-    
-    success_count = 0
-    fail_count = 0
-    
-    # 为每个活动分配义工
-    for event_idx, event in enumerate(events):
-        # 每个活动分配 schedules_per_event 个义工
-        for _ in range(schedules_per_event):
-            try:
-                # 随机选择一个义工
-                volunteer = random.choice(volunteers)
-                
-                # 生成排班数据（传入完整的义工对象）
-                schedule_data = generate_schedule(volunteer, event)
-                
-                if not schedule_data:
-                    continue
-                
-                # 创建排班记录
-                schedule_id = ScheduleModel.create(**schedule_data)
-                
-                if schedule_id:
-                    success_count += 1
-                else:
-                    fail_count += 1
-                
-                # 限流
-                time.sleep(0.1)
-                
-            except Exception as e:
-                fail_count += 1
-                if fail_count % 10 == 0:
-                    print(f"❌ 第 {fail_count} 条创建失败: {str(e)[:60]}")
-        
-        # 每处理完 5 个活动就打印一次进度
-        if (event_idx + 1) % 5 == 0:
-            print(f"✅ 已处理 {event_idx + 1}/{len(events)} 个活动 (成功: {success_count}, 失败: {fail_count})")
+    print(f"📊 按所需技能、人数和可服务时段分配义工（每人最多 {max_per_volunteer} 个活动）\n")
+    
+    started = time.time()
+    engine = AssignmentEngine(volunteers, max_per_volunteer=max_per_volunteer)
+    assignments, shortfall = engine.assign(events)
+    print(f"✅ 分配完成: {len(assignments)} 个排班，耗时 {time.time() - started:.2f}s")
+    if shortfall:
+        print(f"⚠️  {len(shortfall)} 个活动人数不足，共缺 {sum(n for _, n in shortfall)} 人")
+        for event, missing in shortfall[:5]:
+            day = event.event_date.strftime('%Y-%m-%d') if event.event_date else '日期未定'
+            print(f"     - {event.event_name} ({day}): 缺 {missing} 人")
+    
+    rows = [generate_schedule(a.volunteer, a.event) for a in assignments]
+    rows = [row for row in rows if row]
+    result = ScheduleModel.bulk_create(rows)
+    success_count = result.success_count
+    fail_count = result.failure_count
     
     print("\n" + "=" * 70)
     print(f"✅ 排班数据生成完成！")
@@ -253,11 +192,7 @@ def batch_create_schedules(schedules_per_event=5):
         total = ScheduleModel.get_schedule_count()
         print(f"\n📊 数据库中排班总数: {total}")
         
-        statuses = {}
-        for status in ['已排班', '已确认', '已签到', '已签退', '缺席']:
-            count = len(ScheduleModel.list_by_status(status))
-            if count > 0:
-                statuses[status] = count
+        statuses = ScheduleModel.value_counts(ScheduleModel.FIELD_STATUS)
         
         if statuses:
             print(f"   按状态分布:")
@@ -268,4 +203,7 @@ def batch_create_schedules(schedules_per_event=5):
         print(f"❌ 验证失败: {e}")
 
 if __name__ == "__main__":
-    batch_create_schedules(schedules_per_event=5)
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="生成测试排班数据")
+    parser.add_argument('--max-per-volunteer', type=int, default=3, help='每名义工最多排班的活动数')
+    args = parser.parse_args()
+    batch_create_schedules(max_per_volunteer=args.max_per_volunteer)
\ No newline at end of file
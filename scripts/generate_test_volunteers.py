@@ -147,26 +147,23 @@ def batch_create_volunteers(count=200):
     print(f"🚀 开始生成 {count} 条测试义工数据 (广州地区)")
     print("=" * 70)
     
-    success_count = 0
-    fail_count = 0
+    volunteers = [generate_volunteer() for _ in range(count)]
     
-    for i in range(1, count + 1):
-        try:
-            volunteer_data = generate_volunteer()
-            volunteer_id = VolunteerModel.create(**volunteer_data)
-            
-            if volunteer_id:
-                success_count += 1
-                if i % 20 == 0:
-                    print(f"✅ 已创建 {i}/{count} 条数据 (成功: {success_count}, 失败: {fail_count})")
-            else:
-                fail_count += 1
-                print(f"⚠️  第 {i} 条数据返回空ID")
-                
-        except Exception as e:
-            fail_count += 1
-            if i % 50 == 0:
-                print(f"❌ 第 {i} 条数据创建失败: {str(e)[:50]}")
+    try:
+        result = VolunteerModel.bulk_create(volunteers)
+        success_count = result.success_count
+        fail_count = result.failure_count
+        
+        # 按失败原因汇总
+        reasons = {}
+        for reason in result.errors.values():
+            reasons[reason] = reasons.get(reason, 0) + 1
+        for reason, n in reasons.items():
+            print(f"❌ {n} 条数据创建失败: {reason[:50]}")
+    except Exception as e:
+        success_count = 0
+        fail_count = count
+        print(f"❌ 批量创建失败: {str(e)[:50]}")
     
     print("\n" + "=" * 70)
     print(f"✅ 数据生成完成！")
@@ -180,14 +177,14 @@ def batch_create_volunteers(count=200):
         total = VolunteerModel.get_volunteer_count()
         print(f"\n📊 数据库中义工总数: {total}")
         
-        active = len(VolunteerModel.list_by_status('活跃'))
-        print(f"   - 活跃义工: {active}")
+        statuses = VolunteerModel.value_counts(VolunteerModel.FIELD_STATUS)
+        print(f"   - 活跃义工: {statuses.get('活跃', 0)}")
         
         # 按区统计
         print(f"\n📍 各区义工分布:")
+        areas = VolunteerModel.value_counts(VolunteerModel.FIELD_AREA)
         for area in AREAS:
-            # 这里可以添加按区统计的逻辑
-            pass
+            print(f"     - {area}: {areas.get(area, 0)}")
             
     except Exception as e:
         print(f"❌ 验证失败: {e}")
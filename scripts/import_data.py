@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+从 CSV / Excel 批量导入数据（义工档案 / 活动库 / 排班签到）
+
+逐行流式读取（内存占用与文件大小无关），按表头对应到表单字段，校验后按批次提交。
+每批提交后写入进度文件，中断后重新运行同一命令会从上次停下的位置继续。
+校验或提交失败的行写入 <文件名>.rejects.csv。
+
+表头可以是模型字段名（如 name）、widget ID 或表单中的字段标题（如 姓名），
+其他列名用 --map 指定。复选框列的多个选项用逗号或顿号分隔。
+
+用法:
+    python scripts/import_data.py volunteer roster.xlsx
+    python scripts/import_data.py volunteer roster.csv --map 手机=phone --map 特长=skills
+    python scripts/import_data.py event events.csv --dry-run        # 只校验，不提交
+    python scripts/import_data.py volunteer roster.csv --restart     # 忽略进度文件，从头导入
+"""
+import sys
+import os
+import time
+import argparse
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from models.importer import RowImporter
+from models.volunteer import VolunteerModel
+from models.event import EventModel
+from models.schedule import ScheduleModel
+
+MODELS = {
+    "volunteer": VolunteerModel,
+    "event": EventModel,
+    "schedule": ScheduleModel,
+}
+
+def parse_mapping(items):
+    """--map 表头=字段 参数 -> 字典"""
+    mapping = {}
+    for item in items or []:
+        if '=' not in item:
+            raise SystemExit(f"--map 格式应为 表头=字段: {item}")
+        title, target = item.split('=', 1)
+        mapping[title.strip()] = target.strip()
+    return mapping
+
+def main():
+    parser = argparse.ArgumentParser(description="从 CSV / Excel 批量导入数据")
+    parser.add_argument('form', choices=sorted(MODELS), help='目标表单')
+    parser.add_argument('path', help='CSV 或 .xlsx 文件')
+    parser.add_argument('--map', action='append', metavar='表头=字段', help='指定列与字段的对应关系（可重复）')
+    parser.add_argument('--sheet', help='Excel 工作表名称（默认第一个）')
+    parser.add_argument('--batch-rows', type=int, default=1000, help='每批提交的行数（写一次进度）')
+    parser.add_argument('--concurrency', type=int, help='同时提交的批量请求数')
+    parser.add_argument('--checkpoint', help='进度文件路径（默认 <文件名>.checkpoint.json）')
+    parser.add_argument('--restart', action='store_true', help='忽略已有进度，从头导入')
+    parser.add_argument('--dry-run', action='store_true', help='只读取和校验，不提交')
+    args = parser.parse_args()
+
+    model = MODELS[args.form]
+    options = {"concurrency": args.concurrency} if args.concurrency else {}
+    importer = RowImporter(
+        model, args.path, mapping=parse_mapping(args.map), checkpoint_path=args.checkpoint,
+        batch_rows=args.batch_rows, sheet=args.sheet, **options
+    )
+
+    started = time.time()
+
+    def progress(state):
+        elapsed = time.time() - started
+        print(f"  第 {state['batches']} 批: 已读取 {state['rows_read']} 行，"
+              f"成功 {state['created']}，失败 {state['rejected']} ({elapsed:.1f}s)")
+
+    print(f"📥 导入 {args.path} -> {model.FORM_NAME}{'（只校验）' if args.dry_run else ''}")
+    print("=" * 60)
+    try:
+        state = importer.run(restart=args.restart, dry_run=args.dry_run, progress=progress)
+    except (ValueError, ImportError, OSError) as e:
+        print(f"❌ {e}")
+        sys.exit(1)
+    print("=" * 60)
+    print(f"✅ 完成: 读取 {state['rows_read']} 行，成功 {state['created']}，失败 {state['rejected']}")
+    if state['rejected']:
+        print(f"   失败的行见 {importer.rejects_path}")
+    sys.exit(0 if not state['rejected'] else 2)
+
+if __name__ == "__main__":
+    main()
@@ -1,47 +1,53 @@
 #!/usr/bin/env python3
 """
 表单配置验证脚本
-验证简道云表单是否正确配置
+验证简道云表单是否正确配置，并检查模型的字段映射与表单是否一致
+
+字段列表缓存在本地（见 JDY_SCHEMA_CACHE_PATH），加 --refresh 忽略缓存重新获取
 """
 import sys
 import os
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from core.api_client import JDYClient
-from config.settings import (
-    API_KEY, APP_ID,
-    VOLUNTEER_ENTRY_ID, EVENT_ENTRY_ID, SCHEDULE_ENTRY_ID
-)
+from core.schema import get_schema_registry
+from config.settings import require
+from models.volunteer import VolunteerModel
+from models.event import EventModel
+from models.schedule import ScheduleModel
 
 def verify_forms():
     """验证三个核心表单是否存在且配置正确"""
     print("🔧 简道云表单配置验证")
     print("=" * 60)
     
-    print(f"✅ API_KEY: {API_KEY[:12]}...")
-    print(f"✅ APP_ID: {APP_ID}")
-    
-    client = JDYClient()
-    
-    forms_config = [
-        ("义工档案表", VOLUNTEER_ENTRY_ID),
-        ("活动库表", EVENT_ENTRY_ID),
-        ("排班签到表", SCHEDULE_ENTRY_ID),
-    ]
+    print(f"✅ API_KEY: {require('API_KEY')[:12]}...")
+    print(f"✅ APP_ID: {require('APP_ID')}")
     
+    # 三个表单的字段并行获取（或读本地缓存），并与模型的 FIELD_* 映射比对
     print("\n📋 验证表单配置...")
+    refresh = '--refresh' in sys.argv
+    reports = get_schema_registry().check_models([VolunteerModel, EventModel, ScheduleModel], refresh=refresh)
     all_ok = True
     
-    for form_name, entry_id in forms_config:
-        try:
-            result = client.get_form_widgets(entry_id)
-            widgets = result.get('widgets', [])
-            field_count = len(widgets)
-            
-            print(f"✅ {form_name} (ENTRY_ID: {entry_id[:8]}...) - 找到 {field_count} 个字段")
-                
-        except Exception as e:
-            print(f"❌ {form_name} (ENTRY_ID: {entry_id[:8]}...) - 验证失败: {str(e)[:50]}")
+    for report in reports:
+        entry_id = report.entry_id
+        if report.error:
+            print(f"❌ {report.form_name} (ENTRY_ID: {entry_id[:8]}...) - 验证失败: {report.error}")
+            all_ok = False
+            continue
+        
+        mark = "❌" if report else "✅"
+        print(f"{mark} {report.form_name} (ENTRY_ID: {entry_id[:8]}...) - 找到 {report.widget_count} 个字段 "
+              f"(版本 {report.version})")
+        if report.changed:
+            print(f"   ⚠️  表单字段自上次检查后有变化: {report.previous_version} -> {report.version}")
+        for name, widget_id in report.missing.items():
+            print(f"   ❌ 模型字段 {name} ({widget_id}) 在表单中不存在")
+        for name, (expected, actual) in report.type_mismatch.items():
+            print(f"   ❌ 模型字段 {name} 类型为 {expected}，表单控件类型为 {actual}")
+        for widget_id, label in report.unmapped.items():
+            print(f"   ℹ️  表单字段 {label} ({widget_id}) 未在模型中映射")
+        if report:
             all_ok = False
     
     print("\n" + "=" * 60)
@@ -0,0 +1,407 @@
+#!/usr/bin/env python3
+"""
+简道云 API 本地模拟服务 - 用于离线测试和压测
+
+实现 /app/entry/widget/list 以及 /app/entry/data/{create,get,list,update,delete}、
+batch_create / batch_update / batch_delete 接口，数据保存在内存中。
+支持游标分页、过滤条件、字段投影、transaction_id 去重，
+以及可配置的响应延迟、错误注入和接口限流。
+
+用法:
+    python scripts/mock_server.py --port 8900 --latency 0.02 --error-rate 0.01 --qps 30
+    # 然后在 .env 中设置 JDY_BASE_URL=http://127.0.0.1:8900/api/v5
+"""
+import sys
+import os
+import json
+import socket
+import random
+import threading
+import time
+import bisect
+import itertools
+import argparse
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Any, Optional, List, Tuple
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+API_PREFIX = "/api/v5"
+MAX_LIMIT = 100
+RATE_LIMIT_CODE = 8303
+
+class MockAPIError(Exception):
+    """模拟服务返回的业务错误"""
+    
+    def __init__(self, status: int, code: int, msg: str):
+        super().__init__(msg)
+        self.status = status
+        self.code = code
+        self.msg = msg
+
+def _now() -> str:
+    """与简道云一致的 UTC 时间格式"""
+    now = datetime.now(timezone.utc)
+    return now.strftime('%Y-%m-%dT%H:%M:%S.') + f"{now.microsecond // 1000:03d}Z"
+
+def _unwrap(data: Dict[str, Any]) -> Dict[str, Any]:
+    return {k: (v['value'] if isinstance(v, dict) and 'value' in v else v) for k, v in data.items()}
+
+def _match(row: Dict[str, Any], cond: Dict[str, Any]) -> bool:
+    """判断单条数据是否满足一个过滤条件"""
+    value = row.get(cond.get('field'))
+    method = cond.get('method', 'eq')
+    expected = cond.get('value') or []
+    if method == 'empty':
+        return value in (None, '', [])
+    if method == 'not_empty':
+        return value not in (None, '', [])
+    if method == 'eq':
+        return bool(expected) and (value == expected[0]
+                                   or (isinstance(value, list) and expected[0] in value))
+    if method == 'ne':
+        return not expected or value != expected[0]
+    if method == 'in':
+        return value in expected or (isinstance(value, list) and any(v in value for v in expected))
+    if method == 'nin':
+        return value not in expected
+    if method == 'like':
+        return bool(expected) and isinstance(value, str) and str(expected[0]) in value
+    if method == 'range':
+        low = expected[0] if len(expected) > 0 else None
+        high = expected[1] if len(expected) > 1 else None
+        if value is None:
+            return False
+        try:
+            return (low is None or value >= low) and (high is None or value <= high)
+        except TypeError:
+            return False
+    raise MockAPIError(400, 4000, f"不支持的过滤方法: {method}")
+
+def _match_filter(row: Dict[str, Any], filters: Optional[Dict[str, Any]]) -> bool:
+    if not filters or not filters.get('cond'):
+        return True
+    results = (_match(row, cond) for cond in filters['cond'])
+    return any(results) if filters.get('rel') == 'or' else all(results)
+
+class MockStore:
+    """内存数据存储，按 entry_id 分表，_id 按创建顺序递增"""
+    
+    def __init__(self):
+        self.forms: Dict[str, Dict[str, Dict[str, Any]]] = {}
+        # 每个表单按创建顺序记录的 _id（即有序列表），用于游标分页时二分定位
+        self.order: Dict[str, List[str]] = {}
+        self.widgets: Dict[str, List[Dict[str, Any]]] = {}
+        self.transactions: Dict[str, Dict[str, Any]] = {}
+        self.lock = threading.Lock()
+        self._sequence = itertools.count(1)
+    
+    def new_id(self) -> str:
+        """生成 24 位十六进制 ID（类似 MongoDB ObjectId，严格递增）"""
+        return f"{int(time.time()):08x}{next(self._sequence):016x}"
+    
+    def register_form(self, entry_id: str, fields: Dict[str, str],
+                      types: Optional[Dict[str, str]] = None) -> None:
+        """登记表单字段（字段名 -> widget ID，字段名 -> 控件类型），用于 widget/list 接口"""
+        types = types or {}
+        with self.lock:
+            self.forms.setdefault(entry_id, {})
+            self.widgets[entry_id] = [
+                {"name": widget_id, "label": label, "type": types.get(label, "text")}
+                for label, widget_id in fields.items()
+            ]
+    
+    def form(self, entry_id: str) -> Dict[str, Dict[str, Any]]:
+        if not entry_id:
+            raise MockAPIError(400, 4001, "缺少 entry_id")
+        return self.forms.setdefault(entry_id, {})
+    
+    def row(self, entry_id: str, data_id: str) -> Dict[str, Any]:
+        row = self.form(entry_id).get(data_id)
+        if row is None:
+            raise MockAPIError(400, 3005, f"数据不存在: {data_id}")
+        return row
+    
+    def insert(self, entry_id: str, data: Dict[str, Any]) -> Dict[str, Any]:
+        now = _now()
+        row = dict(_unwrap(data), _id=self.new_id(), createTime=now, updateTime=now)
+        self.form(entry_id)[row['_id']] = row
+        self.order.setdefault(entry_id, []).append(row['_id'])
+        return row
+    
+    def ids_after(self, entry_id: str, cursor: str) -> List[str]:
+        """游标之后的 _id（已删除的由调用方跳过）"""
+        order = self.order.get(entry_id, [])
+        return order[bisect.bisect_right(order, cursor):]
+    
+    def update(self, entry_id: str, data_id: str, data: Dict[str, Any]) -> Dict[str, Any]:
+        row = self.row(entry_id, data_id)
+        row.update(_unwrap(data))
+        row['updateTime'] = _now()
+        return row
+
+class MockJDYServer:
+    """简道云 API 模拟服务，可在后台线程中启动
+    
+    latency: 每个请求的固定延迟（秒）；jitter: 额外的随机延迟上限（秒）；
+    error_rate: 随机返回 503 的比例；qps: 每个接口每秒允许的请求数（None 表示不限流）。
+    """
+    
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, latency: float = 0.0,
+                 jitter: float = 0.0, error_rate: float = 0.0, qps: Optional[float] = None,
+                 api_key: Optional[str] = None):
+        self.store = MockStore()
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.qps = qps
+        self.api_key = api_key
+        self.request_counts: Dict[str, int] = {}
+        self._windows: Dict[str, Tuple[int, int]] = {}
+        self._stats_lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        
+        server = self
+        
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            
+            def setup(self):
+                super().setup()
+                # 响应头和响应体分两次写出，关闭 Nagle 避免与延迟确认叠加出 40ms 等待
+                self.connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            
+            def do_POST(self):
+                server._handle(self)
+            
+            def log_message(self, format, *args):
+                pass
+        
+        self.httpd = ThreadingHTTPServer((host, port), Handler)
+        self.httpd.daemon_threads = True
+    
+    @property
+    def base_url(self) -> str:
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}{API_PREFIX}"
+    
+    def start(self) -> "MockJDYServer":
+        """在后台线程中启动服务"""
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+    
+    def stop(self) -> None:
+        self.httpd.shutdown()
+        self.httpd.server_close()
+    
+    def __enter__(self) -> "MockJDYServer":
+        return self.start()
+    
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.stop()
+    
+    def _rate_limited(self, endpoint: str) -> bool:
+        """按接口做每秒固定窗口计数"""
+        if not self.qps:
+            return False
+        with self._stats_lock:
+            second = int(time.time())
+            window, count = self._windows.get(endpoint, (second, 0))
+            if window != second:
+                window, count = second, 0
+            count += 1
+            self._windows[endpoint] = (window, count)
+            return count > self.qps
+    
+    def _handle(self, handler: BaseHTTPRequestHandler) -> None:
+        length = int(handler.headers.get('Content-Length') or 0)
+        raw = handler.rfile.read(length) if length else b''
+        endpoint = handler.path[len(API_PREFIX):] if handler.path.startswith(API_PREFIX) else handler.path
+        with self._stats_lock:
+            self.request_counts[endpoint] = self.request_counts.get(endpoint, 0) + 1
+        
+        delay = self.latency + (random.uniform(0, self.jitter) if self.jitter else 0)
+        if delay:
+            time.sleep(delay)
+        
+        headers = {}
+        try:
+            if self.api_key and handler.headers.get('Authorization') != f"Bearer {self.api_key}":
+                raise MockAPIError(401, 1001, "API Key 无效")
+            if self._rate_limited(endpoint):
+                headers['Retry-After'] = '1'
+                raise MockAPIError(429, RATE_LIMIT_CODE, "请求过于频繁")
+            if self.error_rate and random.random() < self.error_rate:
+                raise MockAPIError(503, 5000, "服务暂不可用（模拟故障）")
+            payload = json.loads(raw or b'{}')
+            route = self.ROUTES.get(endpoint)
+            if route is None:
+                raise MockAPIError(404, 4004, f"接口不存在: {endpoint}")
+            status, body = 200, route(self, payload)
+        except MockAPIError as e:
+            status, body = e.status, {"code": e.code, "msg": e.msg}
+        except ValueError:
+            status, body = 400, {"code": 4000, "msg": "请求体不是合法的 JSON"}
+        
+        data = json.dumps(body, ensure_ascii=False).encode('utf-8')
+        handler.send_response(status)
+        handler.send_header('Content-Type', 'application/json; charset=utf-8')
+        handler.send_header('Content-Length', str(len(data)))
+        for key, value in headers.items():
+            handler.send_header(key, value)
+        handler.end_headers()
+        handler.wfile.write(data)
+    
+    def _idempotent(self, payload: Dict[str, Any], action) -> Dict[str, Any]:
+        """同一 transaction_id 的重复请求直接返回首次结果"""
+        transaction_id = payload.get('transaction_id')
+        with self.store.lock:
+            if transaction_id and transaction_id in self.store.transactions:
+                return self.store.transactions[transaction_id]
+            result = action()
+            if transaction_id:
+                self.store.transactions[transaction_id] = result
+            return result
+    
+    def widget_list(self, payload: Dict[str, Any]) -> Dict[str, Any]:
+        with self.store.lock:
+            self.store.form(payload.get('entry_id'))
+            return {"widgets": self.store.widgets.get(payload['entry_id'], [])}
+    
+    def data_create(self, payload: Dict[str, Any]) -> Dict[str, Any]:
+        return self._idempotent(payload, lambda: {
+            "data": dict(self.store.insert(payload.get('entry_id'), payload.get('data') or {}))
+        })
+    
+    def data_get(self, payload: Dict[str, Any]) -> Dict[str, Any]:
+        with self.store.lock:
+            return {"data": dict(self.store.row(payload.get('entry_id'), payload.get('data_id')))}
+    
+    def data_list(self, payload: Dict[str, Any]) -> Dict[str, Any]:
+        limit = min(int(payload.get('limit') or MAX_LIMIT), MAX_LIMIT)
+        cursor = payload.get('data_id') or ''
+        filters = payload.get('filter')
+        fields = payload.get('fields')
+        with self.store.lock:
+            form = self.store.form(payload.get('entry_id'))
+            rows = []
+            for data_id in self.store.ids_after(payload['entry_id'], cursor):
+                row = form.get(data_id)
+                if row is not None and _match_filter(row, filters):
+                    rows.append(dict(row) if not fields else
+                                {k: v for k, v in row.items() if k in fields or k == '_id'})
+                    if len(rows) >= limit:
+                        break
+        return {"data": rows}
+    
+    def data_update(self, payload: Dict[str, Any]) -> Dict[str, Any]:
+        return self._idempotent(payload, lambda: {
+            "data": dict(self.store.update(payload.get('entry_id'), payload.get('data_id'),
+                                           payload.get('data') or {}))
+        })
+    
+    def data_delete(self, payload: Dict[str, Any]) -> Dict[str, Any]:
+        with self.store.lock:
+            self.store.row(payload.get('entry_id'), payload.get('data_id'))
+            del self.store.form(payload['entry_id'])[payload['data_id']]
+        return {"status": "success"}
+    
+    def batch_create(self, payload: Dict[str, Any]) -> Dict[str, Any]:
+        data_list = payload.get('data_list') or []
+        if len(data_list) > MAX_LIMIT:
+            raise MockAPIError(400, 4002, f"单次最多创建 {MAX_LIMIT} 条")
+        
+        def action():
+            ids = [self.store.insert(payload.get('entry_id'), data)['_id'] for data in data_list]
+            return {"status": "success", "success_count": len(ids), "success_ids": ids}
+        return self._idempotent(payload, action)
+    
+    def batch_update(self, payload: Dict[str, Any]) -> Dict[str, Any]:
+        data_ids = payload.get('data_ids') or []
+        if len(data_ids) > MAX_LIMIT:
+            raise MockAPIError(400, 4002, f"单次最多更新 {MAX_LIMIT} 条")
+        
+        def action():
+            for data_id in data_ids:
+                self.store.update(payload.get('entry_id'), data_id, payload.get('data') or {})
+            return {"status": "success", "success_count": len(data_ids)}
+        return self._idempotent(payload, action)
+    
+    def batch_delete(self, payload: Dict[str, Any]) -> Dict[str, Any]:
+        data_ids = payload.get('data_ids') or []
+        if len(data_ids) > MAX_LIMIT:
+            raise MockAPIError(400, 4002, f"单次最多删除 {MAX_LIMIT} 条")
+        with self.store.lock:
+            form = self.store.form(payload.get('entry_id'))
+            deleted = sum(1 for data_id in data_ids if form.pop(data_id, None) is not None)
+        return {"status": "success", "success_count": deleted}
+    
+    ROUTES = {
+        "/app/entry/widget/list": widget_list,
+        "/app/entry/data/create": data_create,
+        "/app/entry/data/get": data_get,
+        "/app/entry/data/list": data_list,
+        "/app/entry/data/update": data_update,
+        "/app/entry/data/delete": data_delete,
+        "/app/entry/data/batch_create": batch_create,
+        "/app/entry/data/batch_update": batch_update,
+        "/app/entry/data/batch_delete": batch_delete,
+    }
+
+# 模型字段类型 -> 简道云控件类型
+WIDGET_TYPES = {
+    "number": "number",
+    "int": "number",
+    "date": "datetime",
+    "datetime": "datetime",
+    "list": "checkboxgroup",
+    "category": "combo",
+}
+
+def register_models(server: MockJDYServer) -> bool:
+    """按三个模型的 FIELD_* 映射登记表单字段；未配置 ENTRY_ID 时跳过"""
+    from config.settings import SettingsError
+    from models.volunteer import VolunteerModel
+    from models.event import EventModel
+    from models.schedule import ScheduleModel
+    try:
+        entry_ids = [model.ENTRY_ID for model in (VolunteerModel, EventModel, ScheduleModel)]
+    except SettingsError:
+        return False
+    for model, entry_id in zip((VolunteerModel, EventModel, ScheduleModel), entry_ids):
+        types = {name: WIDGET_TYPES.get(kind, "text") for name, kind in model.FIELD_TYPES.items()}
+        server.store.register_form(entry_id, model.field_map(), types)
+    return True
+
+def main():
+    parser = argparse.ArgumentParser(description="简道云 API 本地模拟服务")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8900)
+    parser.add_argument('--latency', type=float, default=0.0, help="每个请求的固定延迟（秒）")
+    parser.add_argument('--jitter', type=float, default=0.0, help="随机附加延迟上限（秒）")
+    parser.add_argument('--error-rate', type=float, default=0.0, help="随机返回 503 的比例（0-1）")
+    parser.add_argument('--qps', type=float, default=None, help="每个接口每秒允许的请求数")
+    parser.add_argument('--api-key', default=None, help="要求请求携带的 API Key（默认不校验）")
+    args = parser.parse_args()
+    
+    server = MockJDYServer(args.host, args.port, latency=args.latency, jitter=args.jitter,
+                           error_rate=args.error_rate, qps=args.qps, api_key=args.api_key)
+    registered = register_models(server)
+    
+    print("🧪 简道云 API 模拟服务")
+    print("=" * 60)
+    print(f"地址: {server.base_url}")
+    print(f"表单字段: {'已按模型登记' if registered else '未配置 ENTRY_ID，表单将按需创建'}")
+    print(f"延迟: {args.latency}s (+{args.jitter}s)  错误率: {args.error_rate}  限流: {args.qps or '无'}")
+    print(f"\n在 .env 中设置 JDY_BASE_URL={server.base_url} 即可连接")
+    
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        print("\n\n⚠️  用户中断")
+    finally:
+        server.httpd.server_close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,39 @@
+#!/usr/bin/env python3
+"""
+同步本地 SQLite 镜像（义工档案 / 活动库 / 排班签到）
+
+用法:
+    python scripts/sync_mirror.py          # 增量同步（按 updateTime 水位线）
+    python scripts/sync_mirror.py --full   # 全量同步（同时清理远端已删除的记录）
+"""
+import sys
+import os
+import time
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from models.volunteer import VolunteerModel
+from models.event import EventModel
+from models.schedule import ScheduleModel
+
+def sync_all(full=False):
+    """同步三个表单的镜像"""
+    print(f"🔄 开始{'全量' if full else '增量'}同步本地镜像")
+    print("=" * 60)
+    
+    all_ok = True
+    for model in (VolunteerModel, EventModel, ScheduleModel):
+        started = time.time()
+        try:
+            fetched = model.sync_mirror(full=full)
+            total = model.mirror().count()
+            print(f"✅ {model.FORM_NAME}: 拉取 {fetched} 条，镜像共 {total} 条 ({time.time() - started:.1f}s)")
+        except Exception as e:
+            all_ok = False
+            print(f"❌ {model.FORM_NAME}: 同步失败: {str(e)[:80]}")
+    
+    print("=" * 60)
+    return all_ok
+
+if __name__ == "__main__":
+    success = sync_all(full='--full' in sys.argv[1:])
+    sys.exit(0 if success else 1)
@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+简道云数据推送接收服务
+
+在简道云表单的「数据推送」中填写 http://<本机地址>:8901/webhook，
+新增/修改/删除数据时写入本地 SQLite 镜像（JDY_MIRROR_DB_PATH），
+其他进程的模型查询需开启 JDY_MIRROR_ENABLED=true 才会读到推送的数据。
+签名密钥配置在 .env 的 JDY_WEBHOOK_SECRET 中。
+
+用法:
+    python scripts/webhook_server.py                           # 启动接收服务
+    python scripts/webhook_server.py --record pushes.jsonl     # 同时记录收到的推送
+    python scripts/webhook_server.py --replay pushes.jsonl --url http://127.0.0.1:8901/webhook
+
+回放文件每行一个 JSON：可以是 --record 记录的 {"body", "headers", "query"}，
+也可以直接是推送报文 {"op": "data_update", "data": {...}}（此时按当前密钥重新签名）。
+"""
+import sys
+import os
+import json
+import time
+import uuid
+import argparse
+import urllib.error
+import urllib.request
+from urllib.parse import urlencode
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config.settings import WEBHOOK_SECRET, WEBHOOK_HOST, WEBHOOK_PORT, MIRROR_ENABLED, MIRROR_DB_PATH
+from core.webhook import WebhookHandler, start_webhook_server, sign
+from models.volunteer import VolunteerModel
+from models.event import EventModel
+from models.schedule import ScheduleModel
+
+def replay(path, url, secret=WEBHOOK_SECRET):
+    """把记录的推送逐条 POST 到接收服务，返回各状态码的次数"""
+    results = {}
+    with open(path, encoding='utf-8') as f:
+        for line in f:
+            if not line.strip():
+                continue
+            item = json.loads(line)
+            if 'body' in item:
+                body = item['body'].encode('utf-8')
+                headers = {k: v for k, v in item.get('headers', {}).items()
+                           if k.lower() in ('x-jdy-signature', 'x-jdy-deliverid')}
+                query = item.get('query', {})
+            else:
+                body = json.dumps(item, ensure_ascii=False).encode('utf-8')
+                query = {"nonce": uuid.uuid4().hex[:6], "timestamp": str(int(time.time()))}
+                headers = {"X-JDY-DeliverId": uuid.uuid4().hex}
+                if secret:
+                    headers["X-JDY-Signature"] = sign(body, query["nonce"], query["timestamp"], secret)
+            headers["Content-Type"] = "application/json"
+            request = urllib.request.Request(f"{url}?{urlencode(query)}" if query else url,
+                                             data=body, headers=headers, method='POST')
+            try:
+                with urllib.request.urlopen(request) as response:
+                    status = response.status
+            except urllib.error.HTTPError as e:
+                status = e.code
+            results[status] = results.get(status, 0) + 1
+    return results
+
+def main():
+    parser = argparse.ArgumentParser(description="简道云数据推送接收服务")
+    parser.add_argument('--host', default=WEBHOOK_HOST)
+    parser.add_argument('--port', type=int, default=WEBHOOK_PORT)
+    parser.add_argument('--path', default='/webhook', help='接收推送的路径')
+    parser.add_argument('--record', help='把收到的推送追加记录到该 JSONL 文件')
+    parser.add_argument('--replay', help='回放 JSONL 文件中的推送（不启动服务）')
+    parser.add_argument('--url', help='回放的目标地址（默认本机 --port/--path）')
+    args = parser.parse_args()
+
+    if args.replay:
+        url = args.url or f"http://127.0.0.1:{args.port}{args.path}"
+        results = replay(args.replay, url)
+        print(f"📨 回放完成: " + "，".join(f"{status}: {count} 条" for status, count in sorted(results.items())))
+        sys.exit(0 if set(results) <= {200} else 1)
+
+    # 推送总是写入镜像：本进程的 get_data 缓存不会被其他进程读取
+    handler = WebhookHandler([VolunteerModel, EventModel, ScheduleModel], use_mirror=True)
+    httpd = start_webhook_server(handler, args.port, args.host, args.path, args.record)
+    print(f"📡 推送接收服务已启动: http://{args.host}:{httpd.server_address[1]}{args.path}")
+    if not WEBHOOK_SECRET:
+        print("⚠️  未配置 JDY_WEBHOOK_SECRET，不校验推送签名")
+    print(f"🗄️  推送写入镜像: {MIRROR_DB_PATH}")
+    if not MIRROR_ENABLED:
+        print("⚠️  JDY_MIRROR_ENABLED 未开启：模型查询不读镜像，推送的数据不会被其他进程看到，"
+              "请在使用模型的进程中设置 JDY_MIRROR_ENABLED=true")
+    try:
+        while True:
+            time.sleep(60)
+            print(f"  统计: {dict(handler.stats)}")
+    except KeyboardInterrupt:
+        httpd.shutdown()
+
+if __name__ == "__main__":
+    main()